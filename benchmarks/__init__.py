@@ -0,0 +1 @@
+"""Benchmarks del motor (no forman parte de la suite de pruebas)."""
@@ -0,0 +1,93 @@
+"""Requests por segundo en ``/api/game/state`` y ``/api/game/move``.
+
+Compara las rutas reales (estado pre-codificado, ``responses.py``) con
+variantes que retornan el mismo dict por el camino por defecto de FastAPI
+(``jsonable_encoder`` + ``JSONResponse``). Llama a la app ASGI en proceso con
+``httpx.AsyncClient`` (sin red ni hilos del ``TestClient``) y usa un
+repositorio temporal para no tocar ``data/saves.json``.
+
+Uso: ``python -m benchmarks.bench_api [--n 2000]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from solitaire.backend.api import routes_game
+from solitaire.backend.api.dependencias import Servicios
+from solitaire.backend.app import create_app
+from solitaire.backend.core.serializer import orjson
+
+
+async def _rate(fn: Callable[[], Awaitable[object]], n: int) -> float:
+    await fn()  # calentar
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await fn()
+    return n / (time.perf_counter() - t0)
+
+
+def _app_with_baselines(servicios: Servicios) -> Any:
+    app = create_app(servicios)
+
+    @app.get("/bench/state-dict")
+    def state_dict() -> Dict[str, Any]:
+        g = routes_game.holder.game
+        assert g
+        return g.serialized()
+
+    @app.post("/bench/move-dict")
+    def move_dict(payload: Dict[str, Any]) -> Dict[str, Any]:
+        g, p = routes_game.holder.game, routes_game.holder.partida
+        assert g and p
+        g.apply_move(payload["move"])
+        p.actualizar_desde_juego(g)
+        app.state.servicios.repo.actualizar(p)
+        return {"ok": True, "state": g.serialized()}
+
+    return app
+
+
+async def _run(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = await _cases(Path(tmp), n)
+    print(f"codificador: {'orjson' if orjson is not None else 'json (stdlib)'}")
+    for name, rate in rows:
+        print(f"{name:<20} {rate:>10,.0f} req/s")
+
+
+async def _cases(tmp: Path, n: int) -> List[Tuple[str, float]]:
+    app = _app_with_baselines(Servicios(tmp / "app", eventos_log="off", pool_tamano=0))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        draw = {"move": {"type": "draw"}}
+        cases = [
+            ("GET state (dict)", lambda: client.get("/bench/state-dict")),
+            ("GET state (bytes)", lambda: client.get("/api/game/state")),
+            ("POST move (dict)", lambda: client.post("/bench/move-dict", json=draw)),
+            ("POST move (bytes)", lambda: client.post("/api/game/move", json=draw)),
+        ]
+        rows = []
+        for i, (name, fn) in enumerate(cases):
+            # repositorio y partida nuevos por caso: el guardado crece con cada jugada
+            svc = app.state.servicios = Servicios(tmp / f"case{i}", eventos_log="off")
+            await client.post("/api/game/new", json={"mode": "standard", "draw": 1, "seed": 7})
+            rows.append((name, await _rate(fn, n)))
+            svc.cerrar()
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    asyncio.run(_run(ap.parse_args().n))
+
+
+if __name__ == "__main__":
+    main()
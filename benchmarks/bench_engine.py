@@ -0,0 +1,348 @@
+"""Suite de micro-benchmarks del motor con control de regresiones.
+
+Mide, con semillas fijas:
+
+- construcción de ``KlondikeGame()``;
+- ``apply_move`` por tipo de jugada (``draw``, reciclado, ``w2f``, ``w2t``,
+  ``t2f``, ``t2t``) sobre posiciones grabadas de partidas greedy;
+- ``undo``/``redo`` con historial ``serialized`` (el de la API);
+- ``hints.hints`` (estático y con búsqueda ``depth=2``);
+- ``serialize_state``/``deserialize_state``;
+- ``ScoreboardService.sorted_entries`` con 10k y 100k filas (orden completo:
+  la caché del orden se invalida antes de cada ronda);
+- ``RepositorioPartidasJSON.actualizar`` con 1k y 10k partidas guardadas;
+- ``ServicioPerfiles.get_prefs``/``set_preferencia`` con 100k usuarios.
+
+Cada caso se calienta y luego se mide en ``--rounds`` rondas de ``number``
+llamadas; se informa mediana, media, desvío y mínimo en µs por operación. La
+preparación de cada ronda (p. ej. clonar el tablero antes de mover) queda
+fuera del tiempo medido.
+
+Con ``--alloc`` se agrega una ronda más bajo ``tracemalloc`` (fuera del
+tiempo medido): bytes pedidos como máximo durante cada llamada (``peak``,
+incluye copias temporales como ``cartas()``) y bytes que quedan vivos al
+terminar (``net``), medianas por operación. Los casos ``PilaTableau.cartas``
+y ``PilaTableau.vista`` comparan la copia con la vista sin copia.
+
+Los resultados se guardan en JSON (``--out``) y se comparan con una línea
+base (``--baseline``, por defecto ``benchmarks/baseline.json``): si la
+mediana de algún caso supera la de la base en más de ``--threshold`` (0.25 =
+25 %), o su ``peak`` si ambas corridas usaron ``--alloc``, el proceso
+termina con código 1. ``--save-baseline`` reemplaza la base
+con la corrida actual. Las bases sólo son comparables en la misma máquina.
+
+Uso: ``python -m benchmarks.bench_engine [--filter hints] [--rounds 7]``
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solitaire.backend.core.hints import game_hints, hints
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.serializer import deserialize_state, serialize_state
+from solitaire.backend.domain.partida import Partida
+from solitaire.backend.domain.repositorio import RepositorioPartidasJSON
+from solitaire.backend.services.perfiles import ServicioPerfiles
+from solitaire.backend.services.scoreboard import ScoreboardService
+
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+@dataclass
+class Case:
+    """Caso medido: ``fn(x)`` para cada ``x`` de ``setup(number)``."""
+
+    name: str
+    setup: Callable[[int], List[Any]]
+    fn: Callable[[Any], object]
+    number: int
+    teardown: Optional[Callable[[], object]] = None
+
+
+def measure(case: Case, rounds: int, warmup: int = 1, alloc: bool = False) -> Dict[str, Any]:
+    """Segundos por operación de cada ronda, resumidos en µs (y bytes con ``alloc``)."""
+
+    per_op: List[float] = []
+    for r in range(warmup + rounds):
+        items = case.setup(case.number)
+        fn = case.fn
+        t0 = time.perf_counter()
+        for x in items:
+            fn(x)
+        dt = (time.perf_counter() - t0) / len(items)
+        if r >= warmup:
+            per_op.append(dt * 1e6)
+    row: Dict[str, Any] = {
+        "median_us": statistics.median(per_op),
+        "mean_us": statistics.fmean(per_op),
+        "stdev_us": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "min_us": min(per_op),
+        "rounds": rounds,
+        "number": case.number,
+    }
+    if alloc:
+        row.update(measure_alloc(case))
+    if case.teardown is not None:
+        case.teardown()
+    return row
+
+
+def measure_alloc(case: Case) -> Dict[str, float]:
+    """Bytes pedidos (pico) y retenidos por llamada, medianas con ``tracemalloc``."""
+
+    items = case.setup(case.number)
+    fn = case.fn
+    peaks: List[int] = []
+    nets: List[int] = []
+    tracemalloc.start()
+    try:
+        for x in items:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn(x)
+            now, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            nets.append(now - before)
+    finally:
+        tracemalloc.stop()
+    return {"peak_b": statistics.median(peaks), "net_b": statistics.median(nets)}
+
+
+# -------------------- Posiciones --------------------
+def _positions(seeds: range = range(1, 40)) -> Dict[str, Tuple[KlondikeGame, Dict[str, Any]]]:
+    """Primera posición de partidas greedy en que aparece cada tipo de jugada."""
+
+    found: Dict[str, Tuple[KlondikeGame, Dict[str, Any]]] = {}
+    for seed in seeds:
+        g = KlondikeGame.fast(seed)
+        for _ in range(300):
+            cands = game_hints(g)
+            if not cands:
+                break
+            kind = cands[0]["type"]
+            m = {"type": "draw"} if kind == "recycle" else cands[0]
+            found.setdefault(kind, (g.clone(), m))
+            g.apply_move(m)
+        if len(found) == 6:
+            break
+    return found
+
+
+def _with_history(g: KlondikeGame) -> KlondikeGame:
+    c = g.clone()
+    c.history_mode = "serialized"
+    return c
+
+
+def _engine_cases() -> List[Case]:
+    cases = [
+        Case("KlondikeGame()", lambda n: list(range(1, n + 1)), lambda s: KlondikeGame(seed=s), 200),
+    ]
+    for kind, (g, m) in sorted(_positions().items()):
+        cases.append(Case(
+            f"apply_move[{kind}]",
+            lambda n, g=g: [_with_history(g) for _ in range(n)],
+            lambda c, m=m: c.apply_move(m),
+            200,
+        ))
+
+    base = KlondikeGame(seed=7)
+    for m in game_hints(base)[:1] or [{"type": "draw"}]:
+        base.apply_move(m)
+
+    def undone(n: int) -> List[KlondikeGame]:
+        out = []
+        for _ in range(n):
+            c = KlondikeGame(seed=7)
+            c.apply_move(base.move_log[0])
+            c.undo()
+            out.append(c)
+        return out
+
+    cases += [
+        Case("undo", lambda n: [_played(base) for _ in range(n)], lambda c: c.undo(), 200),
+        Case("redo", undone, lambda c: c.redo(), 200),
+    ]
+
+    mid = KlondikeGame.fast(3)
+    for _ in range(40):
+        cands = game_hints(mid)
+        if not cands:
+            break
+        mid.apply_move(cands[0])
+    state = serialize_state(mid.to_state())
+    cases += [
+        Case("hints.hints", lambda n: [state] * n, lambda s: hints(s), 200),
+        Case("hints.hints(depth=2)", lambda n: [state] * n, lambda s: hints(s, depth=2), 20),
+        Case("serialize_state", lambda n: [mid] * n, lambda g: serialize_state(g.to_state()), 500),
+        Case("deserialize_state", lambda n: [state] * n, deserialize_state, 500),
+    ]
+
+    # la columna más larga del reparto: copia completa frente a vista
+    col = max(KlondikeGame(seed=7).tableau, key=len)
+    cases += [
+        Case("PilaTableau.cartas", lambda n: [col] * n, lambda p: p.cartas(), 1000),
+        Case("PilaTableau.vista", lambda n: [col] * n, lambda p: p.vista(), 1000),
+    ]
+    return cases
+
+
+def _played(base: KlondikeGame) -> KlondikeGame:
+    c = KlondikeGame(seed=base.seed)
+    for m in base.move_log:
+        c.apply_move(m)
+    return c
+
+
+# -------------------- Persistencia --------------------
+def _scoreboard_case(tmp: Path, rows: int) -> Case:
+    rng = random.Random(rows)
+    data = [
+        {"name": f"p{i}", "score": rng.randrange(2000), "moves": rng.randrange(80, 400),
+         "seconds": rng.randrange(60, 1800), "draw": rng.choice((1, 3)), "ts": 1.7e9 + i}
+        for i in range(rows)
+    ]
+    path = tmp / f"scores{rows}.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    svc = ScoreboardService(path)
+    svc.cargar()
+
+    def setup(n: int) -> List[ScoreboardService]:
+        # sin invalidar la caché sólo se mediría la copia de la lista ya ordenada
+        svc._sorted = None
+        return [svc] * n
+
+    return Case(f"sorted_entries[{rows // 1000}k]", setup, lambda s: s.sorted_entries(), 1)
+
+
+def _repo_case(tmp: Path, saves: int) -> Case:
+    p = Partida.nueva(id="bench", seed=11)
+    row = RepositorioPartidasJSON._to_dict(p)
+    path = tmp / f"saves{saves}.json"
+    path.write_text(
+        json.dumps({f"{i:06d}": {**row, "id": f"{i:06d}"} for i in range(saves)}),
+        encoding="utf-8",
+    )
+    repo = RepositorioPartidasJSON(path)
+    target = RepositorioPartidasJSON._from_dict({**row, "id": f"{saves // 2:06d}"})
+    assert target
+    return Case(f"actualizar[{saves // 1000}k]", lambda n: [target] * n, repo.actualizar, 1)
+
+
+def _perfiles_cases(tmp: Path, users: int) -> List[Case]:
+    path = tmp / f"perfiles{users}.json"
+    path.write_text(json.dumps({f"u{i}": {"idioma": "es", "alto_contraste": i % 2 == 0} for i in range(users)}), encoding="utf-8")
+    # demora larga: las escrituras agrupadas quedan fuera de la medición
+    svc = ServicioPerfiles(path, demora=3600)
+    svc.cargar()
+    rng = random.Random(users)
+    k = users // 1000
+    return [
+        Case(f"get_prefs[{k}k]", lambda n: [f"u{rng.randrange(users)}" for _ in range(n)], svc.get_prefs, 1000),
+        Case(
+            f"set_preferencia[{k}k]",
+            lambda n: [f"u{rng.randrange(users)}" for _ in range(n)],
+            lambda u: svc.set_preferencia(u, "nombre", "Jugador Uno"),
+            1000,
+            svc.cerrar,
+        ),
+    ]
+
+
+def build_cases(tmp: Path) -> List[Case]:
+    return [
+        *_engine_cases(),
+        _scoreboard_case(tmp, 10_000),
+        _scoreboard_case(tmp, 100_000),
+        _repo_case(tmp, 1_000),
+        _repo_case(tmp, 10_000),
+        *_perfiles_cases(tmp, 100_000),
+    ]
+
+
+# -------------------- Comparación --------------------
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Tuple[str, float]]:
+    """Casos cuya mediana (o pico de memoria) empeoró más que ``threshold``."""
+
+    out = []
+    for name, row in results.items():
+        ref = baseline.get(name)
+        if not ref:
+            continue
+        for key, label in (("median_us", name), ("peak_b", f"{name} (memoria)")):
+            if key not in row or ref.get(key, 0) <= 0:
+                continue
+            ratio = row[key] / ref[key]
+            if ratio > 1 + threshold:
+                out.append((label, ratio))
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rounds", type=int, default=7)
+    ap.add_argument("--filter", default="", help="sólo casos cuyo nombre contenga este texto")
+    ap.add_argument("--out", type=Path, help="archivo JSON de resultados")
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--threshold", type=float, default=0.25)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--alloc", action="store_true", help="medir también memoria con tracemalloc")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [c for c in build_cases(Path(tmp)) if args.filter in c.name]
+        results: Dict[str, Dict[str, Any]] = {}
+        for case in cases:
+            results[case.name] = row = measure(case, args.rounds, alloc=args.alloc)
+            mem = f"  pico {row['peak_b']:,.0f} B, neto {row['net_b']:,.0f} B" if args.alloc else ""
+            print(
+                f"{case.name:<26} {row['median_us']:>12,.1f} µs  "
+                f"(media {row['mean_us']:,.1f} ± {row['stdev_us']:,.1f}, mín {row['min_us']:,.1f})"
+                + mem
+            )
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        prev = json.loads(args.baseline.read_text("utf-8")) if args.baseline.exists() else {"results": {}}
+        report["results"] = {**prev.get("results", {}), **results}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"línea base guardada en {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    base = json.loads(args.baseline.read_text("utf-8")).get("results", {})
+    regressions = compare(results, base, args.threshold)
+    for name, ratio in regressions:
+        print(f"REGRESIÓN {name}: {ratio:.2f}x la línea base", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
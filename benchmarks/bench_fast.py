@@ -0,0 +1,68 @@
+"""Partidas por segundo: constructor completo vs. ``fast`` vs. ``clone``.
+
+También mide jugadas por segundo (``apply_move`` y ``apply_move`` +
+``to_state``) repitiendo una partida greedy grabada.
+
+Uso: ``python -m benchmarks.bench_fast [--n 20000]``
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.sim import candidates
+
+
+def _rate(fn: Callable[[int], object], n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i + 1)
+    return n / (time.perf_counter() - t0)
+
+
+def _greedy_moves(seed: int, limit: int = 300) -> List[Dict[str, Any]]:
+    g = KlondikeGame.fast(seed)
+    moves: List[Dict[str, Any]] = []
+    while len(moves) < limit:
+        cands = candidates(g)
+        if not cands:
+            break
+        g.apply_move(cands[0])
+        moves.append(cands[0])
+    return moves
+
+
+def _move_rate(seed: int, moves: List[Dict[str, Any]], games: int, with_state: bool) -> float:
+    t0 = time.perf_counter()
+    for _ in range(games):
+        g = KlondikeGame.fast(seed)
+        for m in moves:
+            g.apply_move(m)
+            if with_state:
+                g.to_state()
+    return games * len(moves) / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    n = ap.parse_args().n
+    base = KlondikeGame.fast(1)
+    base.apply_move({"type": "draw"})
+    rows = [
+        ("KlondikeGame()", _rate(lambda s: KlondikeGame(seed=s), n)),
+        ("KlondikeGame.fast()", _rate(lambda s: KlondikeGame.fast(s), n)),
+        ("game.clone()", _rate(lambda s: base.clone(), n)),
+    ]
+    for name, rate in rows:
+        print(f"{name:<22} {rate:>12,.0f} partidas/s")
+    moves = _greedy_moves(7)
+    games = max(1, n // 1000)
+    for name, with_state in (("apply_move()", False), ("apply_move()+to_state", True)):
+        print(f"{name:<22} {_move_rate(7, moves, games, with_state):>12,.0f} jugadas/s")
+
+
+if __name__ == "__main__":
+    main()
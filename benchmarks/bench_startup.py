@@ -0,0 +1,118 @@
+"""Arranque en frío: tiempo de import y hasta la primera respuesta.
+
+Lanza procesos nuevos de Python (caché de bytecode ya compilada) y mide:
+
+- ``import``: ``import solitaire.backend.app`` medido dentro del proceso;
+- ``create_app``: construcción de la app;
+- ``primera``: primer ``GET /api/game/state`` por ``httpx.ASGITransport``;
+- ``total``: reloj de pared desde lanzar el proceso hasta esa respuesta,
+  incluido el arranque del intérprete.
+
+``solitaire_import_ms`` suma el tiempo propio de los módulos ``solitaire.*``
+según ``python -X importtime`` (sin FastAPI ni dependencias), y
+``solitaire.backend.app.LAZY_MODULES`` lista los módulos que deben quedar sin
+cargar al arrancar (lo verifica también ``tests/test_startup.py``). Si se excede algún
+presupuesto (``*_BUDGET``) o se carga un módulo perezoso el proceso termina
+con código 1; los tiempos dependen de la máquina, por eso no son parte de las
+pruebas.
+
+Uso: ``python -m benchmarks.bench_startup [--runs 5]``
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from solitaire.backend.app import LAZY_MODULES
+
+# Presupuestos (holgados respecto de lo medido en desarrollo)
+FIRST_RESPONSE_BUDGET_S = 3.0
+SOLITAIRE_IMPORT_BUDGET_MS = 60.0
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from solitaire.backend.app import create_app
+t1 = time.perf_counter()
+app = create_app()
+t2 = time.perf_counter()
+loaded = [m for m in %r if m in sys.modules]
+import asyncio, httpx
+
+async def first():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as c:
+        r = await c.get("/api/game/state")
+        r.raise_for_status()
+
+asyncio.run(first())
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "first": t3 - t2, "loaded": loaded}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["SOLITAIRE_EVENTS_LOG"] = "off"
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure_first_response() -> Dict[str, float]:
+    """Un proceso nuevo: segundos por etapa y ``total`` de pared."""
+
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD % (LAZY_MODULES,)],
+        capture_output=True, text=True, check=True, env=_env(),
+    )
+    total = time.perf_counter() - t0
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    res["total"] = total
+    return res
+
+
+def solitaire_import_ms() -> float:
+    """Suma del tiempo propio (ms) de los módulos ``solitaire.*`` al importar la app."""
+
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import solitaire.backend.app"],
+        capture_output=True, text=True, check=True, env=_env(),
+    )
+    total_us = 0
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip().startswith("solitaire"):
+            total_us += int(parts[0].split(":")[1])
+    return total_us / 1e3
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    runs = ap.parse_args().runs
+    solitaire_import_ms()  # compila el bytecode si hace falta
+    rows: List[Dict[str, float]] = [measure_first_response() for _ in range(runs)]
+    for key in ("import", "create_app", "first", "total"):
+        vals = [r[key] * 1e3 for r in rows]
+        print(f"{key:<12} mediana {statistics.median(vals):>8.1f} ms  (mín {min(vals):.1f})")
+    own = statistics.median(solitaire_import_ms() for _ in range(runs))
+    total = statistics.median(r["total"] for r in rows)
+    print(f"solitaire.* import {own:.1f} ms (presupuesto {SOLITAIRE_IMPORT_BUDGET_MS:.0f} ms)")
+    print(f"primera respuesta  {total * 1e3:.1f} ms (presupuesto {FIRST_RESPONSE_BUDGET_S:.1f} s)")
+    loaded = rows[-1]["loaded"]
+    print(f"cargados al arrancar (deberían ser perezosos): {', '.join(loaded) or 'ninguno'}")  # type: ignore[arg-type]
+    ok = own < SOLITAIRE_IMPORT_BUDGET_MS and total < FIRST_RESPONSE_BUDGET_S and not loaded
+    if not ok:
+        print("FUERA DE PRESUPUESTO", file=sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+"""Prueba de carga de la API con jugadores concurrentes simulados.
+
+Construye la app con ``create_app()`` y la llama en proceso mediante
+``httpx.AsyncClient`` + ``ASGITransport`` (sin red). Cada jugador es una
+tarea ``asyncio`` que crea su partida (``/api/game/new`` con semilla propia)
+y luego ejecuta ``--actions`` acciones de una mezcla realista:
+
+- ``move`` (60 %): una jugada legal elegida al azar según el último estado
+  que recibió el jugador (o robar del mazo);
+- ``hint`` (15 %), ``state`` (10 %), ``undo`` (10 %), ``autoplay`` (5 %).
+
+Informa por endpoint la cantidad de requests, errores, latencias p50/p95/p99
+y throughput, y además dos señales de interferencia entre jugadores:
+
+- ``rechazadas``: jugadas legales según la vista del jugador que el servidor
+  rechazó con 400 (otro jugador cambió la partida activa);
+- ``desincronizadas``: respuestas a ``move`` cuyo contador de movimientos no
+  es el esperado (el estado devuelto no es el de la partida del jugador).
+
+Con el ``holder`` global de ``routes_game`` ambas crecen con ``--players``;
+sirven para validar cambios de sesión/persistencia. Las rutas síncronas corren
+en el pool de hilos de Starlette, así que la persistencia en JSON también se
+ejercita concurrentemente. Usa archivos temporales: no toca ``data/``.
+
+Uso: ``python -m benchmarks.load_api [--players 8] [--actions 50] [--json out.json]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from solitaire.backend.api.dependencias import Servicios
+from solitaire.backend.app import create_app
+from solitaire.backend.core.hints import _static_hints
+
+
+MIX = [("move", 60), ("hint", 15), ("state", 10), ("undo", 10), ("autoplay", 5)]
+
+
+@dataclass
+class Stats:
+    """Latencias (s) y contadores por endpoint."""
+
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    details: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    rejected: int = 0
+    desynced: int = 0
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentil ``q`` (0..100) por rango más cercano sobre una lista ordenada."""
+
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+async def _call(
+    client: httpx.AsyncClient,
+    stats: Stats,
+    name: str,
+    method: str,
+    url: str,
+    body: Optional[dict] = None,
+) -> httpx.Response:
+    t0 = time.perf_counter()
+    r = await client.request(method, url, json=body)
+    stats.latencies[name].append(time.perf_counter() - t0)
+    if r.status_code >= 400:
+        stats.errors[name] += 1
+        try:
+            detail = r.json().get("detail", "")
+        except ValueError:
+            detail = r.text[:60]
+        stats.details[f"{name} {r.status_code}: {detail}"] += 1
+    return r
+
+
+async def _player(
+    client: httpx.AsyncClient, stats: Stats, idx: int, actions: int, seed: int, think_ms: float
+) -> None:
+    rng = random.Random(seed * 1000 + idx)
+    body = {"mode": "standard", "draw": 1, "seed": seed * 1000 + idx}
+    r = await _call(client, stats, "new", "POST", "/api/game/new", body)
+    if r.status_code != 200:
+        return
+    state: Dict[str, Any] = r.json()["state"]
+    kinds, weights = zip(*MIX)
+    for _ in range(actions):
+        if think_ms:
+            await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "move":
+            legal = [m for m in _static_hints(state) if m["type"] != "recycle"]
+            mv = rng.choice(legal + [{"type": "draw"}])
+            r = await _call(client, stats, "move", "POST", "/api/game/move", {"move": mv})
+            if r.status_code == 400:
+                stats.rejected += 1
+            if r.status_code != 200:
+                continue
+            new = r.json()["state"]
+            if new["moves"] != state["moves"] + 1:
+                stats.desynced += 1
+            state = new
+        elif kind == "hint":
+            await _call(client, stats, "hint", "POST", "/api/game/hint", {})
+        elif kind == "state":
+            r = await _call(client, stats, "state", "GET", "/api/game/state")
+            if r.status_code == 200:
+                state = r.json()
+        elif kind == "undo":
+            r = await _call(client, stats, "undo", "POST", "/api/game/undo")
+            if r.status_code == 200:
+                state = r.json()["state"]
+        else:
+            r = await _call(client, stats, "autoplay", "POST", "/api/game/autoplay", {"limit": 20})
+            if r.status_code == 200:
+                state = r.json()["state"]
+
+
+async def run(players: int, actions: int, seed: int = 1, think_ms: float = 0.0) -> Dict[str, Any]:
+    """Ejecuta la carga y retorna el resumen (ver ``report``)."""
+
+    tmp = Path(tempfile.mkdtemp())
+    servicios = Servicios(tmp, eventos_log="off")
+    servicios.calentar()
+    stats = Stats()
+    try:
+        # errores 500 se cuentan como respuestas en vez de propagarse
+        transport = httpx.ASGITransport(app=create_app(servicios), raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+            t0 = time.perf_counter()
+            await asyncio.gather(
+                *(_player(client, stats, i, actions, seed, think_ms) for i in range(players))
+            )
+            elapsed = time.perf_counter() - t0
+    finally:
+        servicios.cerrar()
+    return report(stats, elapsed, players)
+
+
+def report(stats: Stats, elapsed: float, players: int) -> Dict[str, Any]:
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for name, lat in sorted(stats.latencies.items()):
+        lat = sorted(lat)
+        endpoints[name] = {
+            "requests": len(lat),
+            "errors": stats.errors[name],
+            "p50_ms": percentile(lat, 50) * 1e3,
+            "p95_ms": percentile(lat, 95) * 1e3,
+            "p99_ms": percentile(lat, 99) * 1e3,
+            "rps": len(lat) / elapsed if elapsed else 0.0,
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "players": players,
+        "elapsed_s": elapsed,
+        "requests": total,
+        "rps": total / elapsed if elapsed else 0.0,
+        "rejected": stats.rejected,
+        "desynced": stats.desynced,
+        "endpoints": endpoints,
+        "error_details": dict(sorted(stats.details.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    ap.add_argument("--players", type=int, default=8)
+    ap.add_argument("--actions", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument(
+        "--think-ms", type=float, default=0.0, help="pausa media entre acciones de un jugador"
+    )
+    ap.add_argument("--json", type=Path, help="guardar el resumen en este archivo")
+    args = ap.parse_args()
+    res = asyncio.run(run(args.players, args.actions, args.seed, args.think_ms))
+    print(
+        f"{'endpoint':<10} {'reqs':>6} {'err':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'req/s':>8}"
+    )
+    for name, e in res["endpoints"].items():
+        print(
+            f"{name:<10} {e['requests']:>6} {e['errors']:>5} {e['p50_ms']:>8.2f} "
+            f"{e['p95_ms']:>8.2f} {e['p99_ms']:>8.2f} {e['rps']:>8.1f}"
+        )
+    print(
+        f"total: {res['requests']} requests en {res['elapsed_s']:.2f} s ({res['rps']:,.0f} req/s); "
+        f"jugadas rechazadas {res['rejected']}, respuestas desincronizadas {res['desynced']}"
+    )
+    for detail, n in list(res["error_details"].items())[:5]:
+        print(f"  {n:>5} x {detail}")
+    if args.json:
+        args.json.write_text(json.dumps(res, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
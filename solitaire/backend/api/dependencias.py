@@ -0,0 +1,137 @@
+"""Servicios compartidos por la app e inyección en las rutas.
+
+``Servicios`` agrupa el repositorio de partidas, el scoreboard, los desafíos
+(``services/desafios.py``), el bus de eventos y el pool de partidas
+pre-repartidas (``SOLITAIRE_POOL_SIZE`` por ``(modo, draw)``, 4 por defecto;
+0 lo desactiva) de una app, más el pool de verificación de victorias
+(``SOLITAIRE_VERIFY_WORKERS`` procesos, uno por CPU por defecto; 0 verifica en
+el hilo del request). Cada uno se construye una sola vez (en el primer uso) y
+conserva su caché en memoria entre requests:
+
+- ``create_app`` guarda una instancia en ``app.state.servicios``;
+- el ``lifespan`` de la app llama a ``calentar()`` al arrancar (lee los
+  archivos, arma los índices y llena el pool antes del primer request) y a
+  ``cerrar()`` al apagar (escribe lo pendiente, vacía el bus de eventos,
+  detiene la reposición del pool y espera las verificaciones en curso);
+- las rutas los reciben con ``Depends(servicios)``.
+
+Sin lifespan (p. ej. ``TestClient`` fuera de un ``with``) todo funciona igual:
+cada servicio se carga en su primer uso.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import Request
+
+from ..domain.repositorio import RepositorioPartidasJSON
+from ..services.eventos import BusEventos
+from ..services.pool import PoolPartidas
+
+if TYPE_CHECKING:
+    from ..services.desafios import ServicioDesafios
+    from ..services.scoreboard import ScoreboardService
+    from ..services.verificacion import ServicioVerificacion
+
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+class Servicios:
+    """Repositorio, scoreboard, desafíos, eventos y pools de una app (uno de cada uno)."""
+
+    def __init__(
+        self,
+        data_dir: Path = DATA_DIR,
+        eventos_log: Optional[str] = None,
+        pool_tamano: Optional[int] = None,
+        verificadores: Optional[int] = None,
+    ) -> None:
+        self.data_dir = data_dir
+        defecto = data_dir / "events" / "moves.jsonl"
+        ruta = eventos_log or os.environ.get("SOLITAIRE_EVENTS_LOG") or str(defecto)
+        self.eventos: Optional[BusEventos] = None if ruta == "off" else BusEventos(Path(ruta))
+        if pool_tamano is None:
+            pool_tamano = int(os.environ.get("SOLITAIRE_POOL_SIZE", 4))
+        self.pool = PoolPartidas(pool_tamano)
+        if verificadores is None and os.environ.get("SOLITAIRE_VERIFY_WORKERS"):
+            verificadores = int(os.environ["SOLITAIRE_VERIFY_WORKERS"])
+        self.verificadores = verificadores
+        self._verificacion: Optional["ServicioVerificacion"] = None
+        self._repo: Optional[RepositorioPartidasJSON] = None
+        self._scoreboard: Optional["ScoreboardService"] = None
+        self._desafios: Optional["ServicioDesafios"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def repo(self) -> RepositorioPartidasJSON:
+        if self._repo is None:
+            with self._lock:
+                if self._repo is None:
+                    self._repo = RepositorioPartidasJSON(self.data_dir / "saves.json")
+        return self._repo
+
+    @property
+    def scoreboard(self) -> "ScoreboardService":
+        if self._scoreboard is None:
+            # import perezoso: sólo se usa al ganar o al consultar el ranking
+            from ..services.scoreboard import ScoreboardService
+
+            with self._lock:
+                if self._scoreboard is None:
+                    self._scoreboard = ScoreboardService(self.data_dir / "scoreboard.json")
+        return self._scoreboard
+
+    @property
+    def desafios(self) -> "ServicioDesafios":
+        if self._desafios is None:
+            # import perezoso: sólo se usa en los desafíos
+            from ..services.desafios import ServicioDesafios
+
+            with self._lock:
+                if self._desafios is None:
+                    self._desafios = ServicioDesafios(self.data_dir)
+        return self._desafios
+
+    @property
+    def verificacion(self) -> "ServicioVerificacion":
+        if self._verificacion is None:
+            # import perezoso: sólo se usa al ganar
+            from ..services.verificacion import ServicioVerificacion
+
+            with self._lock:
+                if self._verificacion is None:
+                    self._verificacion = ServicioVerificacion(self.verificadores)
+        return self._verificacion
+
+    def calentar(self) -> None:
+        """Carga partidas y ranking a memoria y llena el pool (arranque de la app)."""
+
+        self.repo.cargar()
+        self.scoreboard.cargar()
+        self.pool.llenar()
+
+    def cerrar(self) -> None:
+        """Persiste lo pendiente y detiene el bus de eventos y los pools (apagado)."""
+
+        if self._verificacion is not None:
+            # las victorias pendientes escriben en el scoreboard
+            self._verificacion.cerrar()
+        if self._repo is not None:
+            self._repo.guardar()
+        if self.eventos is not None:
+            self.eventos.cerrar()
+        self.pool.cerrar()
+
+
+async def servicios(request: Request) -> Servicios:
+    """Dependencia: los ``Servicios`` de la app del request.
+
+    Es ``async`` a propósito: FastAPI corre las dependencias síncronas en el
+    pool de hilos y ésta sólo lee un atributo.
+    """
+
+    return request.app.state.servicios
@@ -0,0 +1,41 @@
+"""Respuestas JSON rápidas para las rutas del juego.
+
+FastAPI pasa por ``jsonable_encoder`` todo lo que retorna una ruta como dict
+antes de codificarlo, lo que recorre el estado anidado carta por carta. Las
+rutas del juego retornan en cambio un ``Response`` ya armado:
+
+- ``FastJSONResponse``: codifica con ``serializer.to_json_bytes`` (``orjson``
+  si está instalado, si no ``json`` de la stdlib).
+- ``state_response``: empalma los bytes del estado ya codificados y
+  memoizados por el motor (``KlondikeGame.serialized_json``) dentro del
+  sobre ``{..., "state": ...}``, sin volver a codificarlo.
+
+Ambas cuentan como fase ``encode`` en ``Server-Timing`` (``profiling.py``).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+
+from ..core.klondike import KlondikeGame
+from ..core.serializer import to_json_bytes
+from ..profiling import fase
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` con el codificador rápido (sin ``jsonable_encoder``)."""
+
+    def render(self, content: Any) -> bytes:
+        with fase("encode"):
+            return to_json_bytes(content)
+
+
+def state_response(g: KlondikeGame, **fields: Any) -> Response:
+    """``{**fields, "state": estado}`` con el estado pre-codificado del motor."""
+
+    with fase("encode"):
+        head = to_json_bytes(fields)[:-1] if fields else b"{"
+        sep = b"," if fields else b""
+        body = head + sep + b'"state":' + g.serialized_json() + b"}"
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,128 @@
+"""Rutas REST del desafío diario y de los torneos (FastAPI).
+
+Endpoints y contratos:
+  - GET  /api/challenge/daily?draw=1&date=AAAA-MM-DD -> {challenge, state}
+  - POST /api/challenge {draw?, seed?, mode?} -> {challenge}
+  - POST /api/challenge/{cid}/start {player_name} -> {session, challenge, state}
+  - POST /api/challenge/session/{sid}/move {move} -> {ok, finished, rank?, state}
+  - POST /api/challenge/session/{sid}/undo -> {ok, state}
+  - GET  /api/challenge/{cid}/ranking?limit=50&offset=0 -> {challenge, items}
+
+Notas:
+- Todos los jugadores de un desafío reciben el mismo reparto; ``state`` es
+  el estado inicial compartido, ya codificado (ver ``services/desafios.py``).
+- Las sesiones no se guardan en ``data/saves.json`` ni cambian la partida
+  activa de ``routes_game``; sus jugadas se publican en el bus de eventos
+  con el id de la sesión.
+- Un desafío o sesión inexistente responde 404.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+
+from ..profiling import RutaPerfilable, fase
+from .dependencias import Servicios, servicios
+from .responses import FastJSONResponse, state_response
+
+if TYPE_CHECKING:
+    from ..services.desafios import Desafio, SesionDesafio
+
+
+router = APIRouter(prefix="/api/challenge", route_class=RutaPerfilable)
+
+
+def _desafio(s: Servicios, cid: str) -> "Desafio":
+    try:
+        return s.desafios.obtener(cid)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Desafío inexistente")
+
+
+def _sesion(s: Servicios, sid: str) -> "SesionDesafio":
+    try:
+        return s.desafios.sesion(sid)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Sesión inexistente")
+
+
+@router.get("/daily")
+def get_daily(
+    draw: int = 1,
+    fecha: Optional[str] = Query(None, alias="date"),
+    s: Servicios = Depends(servicios),
+) -> Response:
+    d = s.desafios.diario(draw, date.fromisoformat(fecha) if fecha else None)
+    return state_response(s.desafios.plantilla(d), challenge=d.info())
+
+
+@router.post("")
+def create_challenge(
+    payload: Dict[str, Any] | None = None, s: Servicios = Depends(servicios)
+) -> Dict[str, Any]:
+    payload = payload or {}
+    seed = payload.get("seed")
+    d = s.desafios.crear(
+        draw=int(payload.get("draw", 1)),
+        seed=int(seed) if seed is not None else None,
+        modo=str(payload.get("mode", "standard")),
+    )
+    return {"challenge": d.info()}
+
+
+@router.post("/{cid}/start")
+def start_challenge(
+    cid: str, payload: Dict[str, Any], s: Servicios = Depends(servicios)
+) -> Response:
+    jugador = str(payload.get("player_name") or "").strip()
+    if not jugador:
+        raise HTTPException(status_code=400, detail="Se requiere player_name")
+    d = _desafio(s, cid)
+    with fase("engine"):
+        ses = s.desafios.iniciar(d.id, jugador)
+    if s.eventos is not None:
+        ses.juego.oyente = s.eventos.oyente(ses.id)
+    return state_response(ses.juego, session=ses.id, challenge=d.info())
+
+
+@router.post("/session/{sid}/move")
+def post_challenge_move(
+    sid: str, payload: Dict[str, Any], s: Servicios = Depends(servicios)
+) -> Response:
+    ses = _sesion(s, sid)
+    mv = payload.get("move")
+    if not isinstance(mv, dict):
+        raise HTTPException(status_code=400, detail="move inválido")
+    if ses.terminada:
+        raise HTTPException(status_code=400, detail="El desafío ya terminó")
+    with fase("engine"):
+        ok = ses.juego.apply_move(mv)
+    if not ok:
+        raise HTTPException(status_code=400, detail="Movimiento ilegal")
+    finished = s.desafios.terminar_si_gano(ses)
+    rank = ses.desafio.posicion(ses.jugador) if finished else None
+    return state_response(ses.juego, ok=True, finished=finished, rank=rank)
+
+
+@router.post("/session/{sid}/undo")
+def post_challenge_undo(sid: str, s: Servicios = Depends(servicios)) -> Response:
+    ses = _sesion(s, sid)
+    if ses.terminada:
+        raise HTTPException(status_code=400, detail="El desafío ya terminó")
+    with fase("engine"):
+        ok = ses.juego.undo()
+    if not ok:
+        raise HTTPException(status_code=400, detail="No hay más para deshacer")
+    return state_response(ses.juego, ok=True)
+
+
+@router.get("/{cid}/ranking")
+def get_challenge_ranking(
+    cid: str, limit: int = 50, offset: int = 0, s: Servicios = Depends(servicios)
+) -> Response:
+    d = _desafio(s, cid)
+    limit = max(1, min(500, limit))
+    return FastJSONResponse({"challenge": d.info(), "items": d.ranking(limit, max(0, offset))})
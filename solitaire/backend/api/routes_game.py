@@ -1,48 +1,68 @@
 """Rutas REST para el juego Klondike (FastAPI).
 
 Endpoints principales y contratos:
-  - POST /api/game/new {mode, draw, seed?, player_name?} -> {id,state}
+  - POST /api/game/new {mode, draw, seed?, player_name?, difficulty?}
+    -> {id,state,difficulty}
   - POST /api/game/move {move} -> {ok,state} (400 si ilegal)
-  - POST /api/game/hint -> {hint}
+  - POST /api/game/hint {depth?, budget_ms?} -> {hint}
   - POST /api/game/undo -> {ok,state}
   - POST /api/game/redo -> {ok,state}
   - POST /api/game/autoplay {limit?} -> {moved,state}
+  - POST /api/game/autocomplete {name?} -> {moves,state} (400 si no se puede)
   - GET  /api/game/state -> state
   - CRUD /api/saves ... (JSON en data/saves.json)
 
 Notas:
 - El manejo de errores se unifica en app.py para devolver {"detail": msg}.
 - Se guarda en memoria un juego activo (GameHolder) y se persiste tras cada
-  acción.
-- En victoria se registra una entrada en el scoreboard (si es posible).
+  acción. Repositorio, scoreboard y bus de eventos son únicos por app y se
+  inyectan con ``Depends(servicios)`` (ver ``dependencias.py``). El estado
+  serializado se memoiza en el motor por versión (``KlondikeGame.serialized``):
+  persistir y responder comparten un solo dict.
+- Las rutas del juego retornan ``Response`` ya codificados (``responses.py``)
+  para evitar ``jsonable_encoder`` sobre el estado anidado.
+- Las rutas marcan sus fases (``engine``, ``serialize``, ``persist``; la
+  codificación la marca ``responses.py``) para ``Server-Timing`` y pueden
+  correr bajo ``cProfile`` (``RutaPerfilable``, ver ``profiling.py``).
+- Cada acción aceptada del juego activo se publica como evento
+  (``services/eventos.py``) en ``data/events/moves.jsonl`` sin bloquear la
+  jugada; ``SOLITAIRE_EVENTS_LOG`` cambia la ruta (``off`` lo desactiva).
+- En victoria se registra una entrada en el scoreboard con el puntaje
+  recalculado al reproducir el registro de movimientos; la reproducción corre
+  en el pool de verificación (``services/verificacion.py``), fuera del hilo
+  del request, y la entrada aparece cuando termina.
+- ``PUT /api/saves/{id}`` sólo acepta un ``state`` acompañado de su ``log``;
+  el estado se verifica reproduciendo la partida desde la semilla.
 """
 from __future__ import annotations
 
+import functools
+import logging
 import uuid
-from pathlib import Path
+from concurrent.futures import Future
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 
 from ..core.klondike import KlondikeGame
-from ..core.hints import hint as compute_hint, hints as compute_hints
-from ..core.serializer import serialize_state
+from ..core.difficulty import level as difficulty_level, pick_seed
+from ..core.replay import VerificationResult, verify
 from ..domain.partida import Partida
-from ..domain.repositorio import RepositorioPartidasJSON
-from ..services.scoreboard import ScoreboardService
+from ..profiling import RutaPerfilable, fase
+from ..services.eventos import BusEventos
+from .dependencias import Servicios, servicios
+from .responses import FastJSONResponse, state_response
 
+log = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api")
 
+router = APIRouter(prefix="/api", route_class=RutaPerfilable)
 
-def _repo() -> RepositorioPartidasJSON:
-    data_path = Path(__file__).resolve().parents[2] / "data" / "saves.json"
-    return RepositorioPartidasJSON(data_path)
 
-
-def _scoreboard() -> ScoreboardService:
-    data_path = Path(__file__).resolve().parents[2] / "data" / "scoreboard.json"
-    return ScoreboardService(data_path)
+def _observar(g: KlondikeGame, p: Partida, eventos: Optional[BusEventos]) -> None:
+    if eventos is not None:
+        g.oyente = eventos.oyente(p.id)
 
 
 class GameHolder:
@@ -57,177 +77,260 @@ class GameHolder:
         self.game: Optional[KlondikeGame] = None
         self.partida: Optional[Partida] = None
 
-    def ensure(self) -> None:
+    def ensure(self, eventos: Optional[BusEventos] = None) -> None:
         if not self.game or not self.partida:
-            p = Partida.nueva(id=str(uuid.uuid4()))
-            self.game = KlondikeGame(mode=p.modo, draw_count=p.draw_count, seed=p.semilla)
-            self.partida = p
+            self.game = KlondikeGame()
+            self.partida = p = Partida.desde_juego(str(uuid.uuid4()), self.game)
+            _observar(self.game, p, eventos)
 
 
 holder = GameHolder()
 
 
 @router.post("/game/new")
-def new_game(payload: Dict[str, Any]) -> Dict[str, Any]:
+def new_game(payload: Dict[str, Any], s: Servicios = Depends(servicios)) -> Response:
     mode = str(payload.get("mode", "standard"))
     draw = int(payload.get("draw", 1))
     seed = payload.get("seed")
     player_name = payload.get("player_name")
-    pid = str(uuid.uuid4())
-    p = Partida.nueva(
-        id=pid,
-        modo=mode,
-        draw_count=draw,
-        seed=int(seed) if seed is not None else None,
-        jugador=str(player_name) if player_name else None,
-    )
-    g = KlondikeGame(mode=mode, draw_count=draw, seed=p.semilla)
+    wanted = payload.get("difficulty")
+    if seed is None and wanted:
+        # elegir un reparto del nivel pedido (easy/medium/hard)
+        seed = pick_seed(str(wanted), draw)
+    with fase("engine"):
+        # reparto aleatorio: partida ya repartida y serializada del pool
+        if seed is None:
+            g = s.pool.tomar(mode, draw)
+        else:
+            g = KlondikeGame(mode=mode, draw_count=draw, seed=int(seed))
+        jugador = str(player_name) if player_name else None
+        p = Partida.desde_juego(str(uuid.uuid4()), g, jugador=jugador)
+    _observar(g, p, s.eventos)
     holder.game, holder.partida = g, p
-    _repo().crear(p)
-    return {"id": p.id, "state": serialize_state(g.to_state())}
+    with fase("persist"):
+        s.repo.crear(p)
+    return state_response(g, id=p.id, difficulty=difficulty_level(p.semilla, draw))
 
 
 @router.post("/game/move")
-def post_move(payload: Dict[str, Any]) -> Dict[str, Any]:
-    holder.ensure()
+def post_move(payload: Dict[str, Any], s: Servicios = Depends(servicios)) -> Response:
+    holder.ensure(s.eventos)
     g, p = holder.game, holder.partida
     assert g and p
     mv = payload.get("move")
     if not isinstance(mv, dict):
         raise HTTPException(status_code=400, detail="move inválido")
-    ok = g.apply_move(mv)
+    with fase("engine"):
+        ok = g.apply_move(mv)
     if not ok:
         raise HTTPException(status_code=400, detail="Movimiento ilegal")
-    p.actualizar_desde_juego(g)
-    _repo().actualizar(p)
-    # si ganó, registrar en scoreboard con nombre anónimo (placeholder)
+    _persistir(s, g, p)
+    _registrar_victoria(s, g, p, payload.get("name"))
+    return state_response(g, ok=True)
+
+
+def _persistir(s: Servicios, g: KlondikeGame, p: Partida) -> None:
+    with fase("serialize"):
+        p.actualizar_desde_juego(g)
+    with fase("persist"):
+        s.repo.actualizar(p)
+
+
+def _registrar_victoria(s: Servicios, g: KlondikeGame, p: Partida, name: Optional[str]) -> None:
+    # si ganó, verificar fuera del request y anotar en el scoreboard al terminar
+    if not g.is_won():
+        return
+    trabajo = {"seed": g.seed, "draw_count": g.draw_count, "mode": g.mode, "log": list(g.move_log)}
+    fut = s.verificacion.enviar(trabajo)
+    fila = {"name": name or "Anónimo", "seconds": p.tiempo_segundos, "draw": p.draw_count}
+    fut.add_done_callback(functools.partial(_anotar_victoria, s, p.id, fila))
+
+
+def _anotar_victoria(
+    s: Servicios, pid: str, fila: Dict[str, Any], fut: "Future[VerificationResult]"
+) -> None:
+    exc = fut.exception()
+    if exc is not None:
+        log.error("Falló la verificación de la partida %s", pid, exc_info=exc)
+        return
+    res = fut.result()
+    if not (res.ok and res.won):
+        log.warning("Victoria no verificada en la partida %s: %s", pid, res.reason)
+        return
     try:
-        if g.is_won():
-            _scoreboard().add(name=payload.get("name") or "Anónimo", score=p.puntaje, moves=p.movimientos, seconds=p.tiempo_segundos, draw=p.draw_count)
-    except Exception:
-        pass
-    return {"ok": True, "state": serialize_state(g.to_state())}
+        s.scoreboard.add(score=res.score, moves=res.moves, **fila)
+    except OSError:
+        log.exception("No se pudo registrar la victoria de la partida %s en el scoreboard", pid)
 
 
 @router.post("/game/hint")
-def post_hint() -> Dict[str, Any]:
-    holder.ensure()
+def post_hint(payload: Dict[str, Any] | None = None, s: Servicios = Depends(servicios)) -> Response:
+    holder.ensure(s.eventos)
     g = holder.game
     assert g
     # Usar versiones puras basadas en el estado serializado
-    state = serialize_state(g.to_state())
-    h = compute_hint(state)
-    return {"hint": h}
+    with fase("serialize"):
+        state = g.serialized()
+    # búsqueda opcional acotada: hasta 6 jugadas y 200 ms por request
+    depth = max(0, min(6, int((payload or {}).get("depth", 0))))
+    budget_ms = max(1.0, min(200.0, float((payload or {}).get("budget_ms", 50))))
+    # import perezoso: las pistas no se cargan hasta el primer pedido
+    from ..core.hints import hints as compute_hints
+
+    with fase("engine"):
+        lst = compute_hints(state, limit=1, depth=depth, budget_ms=budget_ms)
+    return FastJSONResponse({"hint": lst[0] if lst else None})
 
 
 @router.post("/game/autoplay")
-def post_autoplay(payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    holder.ensure()
+def post_autoplay(
+    payload: Dict[str, Any] | None = None, s: Servicios = Depends(servicios)
+) -> Response:
+    holder.ensure(s.eventos)
     g, p = holder.game, holder.partida
     assert g and p
     limit = int((payload or {}).get("limit", 200))
-    count = g.autoplay(limit=limit)
-    p.actualizar_desde_juego(g)
-    _repo().actualizar(p)
-    return {"moved": count, "state": serialize_state(g.to_state())}
+    with fase("engine"):
+        count = g.autoplay(limit=limit)
+    _persistir(s, g, p)
+    return state_response(g, moved=count)
+
+
+@router.post("/game/autocomplete")
+def post_autocomplete(
+    payload: Dict[str, Any] | None = None, s: Servicios = Depends(servicios)
+) -> Response:
+    holder.ensure(s.eventos)
+    g, p = holder.game, holder.partida
+    assert g and p
+    with fase("engine"):
+        moves = g.autocomplete()
+    if not moves:
+        raise HTTPException(status_code=400, detail="No se puede completar automáticamente")
+    # todo el lote se persiste con una sola escritura
+    _persistir(s, g, p)
+    _registrar_victoria(s, g, p, (payload or {}).get("name"))
+    return state_response(g, moves=moves)
 
 
 @router.post("/game/undo")
-def post_undo() -> Dict[str, Any]:
-    holder.ensure()
+def post_undo(s: Servicios = Depends(servicios)) -> Response:
+    holder.ensure(s.eventos)
     g, p = holder.game, holder.partida
     assert g and p
-    if not g.undo():
+    with fase("engine"):
+        ok = g.undo()
+    if not ok:
         raise HTTPException(status_code=400, detail="No hay más para deshacer")
-    p.actualizar_desde_juego(g)
-    _repo().actualizar(p)
-    return {"ok": True, "state": serialize_state(g.to_state())}
+    _persistir(s, g, p)
+    return state_response(g, ok=True)
 
 
 @router.post("/game/redo")
-def post_redo() -> Dict[str, Any]:
-    holder.ensure()
+def post_redo(s: Servicios = Depends(servicios)) -> Response:
+    holder.ensure(s.eventos)
     g, p = holder.game, holder.partida
     assert g and p
-    if not g.redo():
+    with fase("engine"):
+        ok = g.redo()
+    if not ok:
         raise HTTPException(status_code=400, detail="No hay más para rehacer")
-    p.actualizar_desde_juego(g)
-    _repo().actualizar(p)
-    return {"ok": True, "state": serialize_state(g.to_state())}
+    _persistir(s, g, p)
+    return state_response(g, ok=True)
 
 
 @router.get("/game/state")
-def get_state() -> Dict[str, Any]:
-    holder.ensure()
+def get_state(s: Servicios = Depends(servicios)) -> Response:
+    holder.ensure(s.eventos)
     g = holder.game
     assert g
-    return serialize_state(g.to_state())
+    # JSON ya codificado y memoizado por versión del motor (sondeos baratos)
+    with fase("encode"):
+        body = g.serialized_json()
+    return Response(content=body, media_type="application/json")
 
 
 # -------------------- CRUD de Partidas --------------------
 
 
+def _resumen(p: Partida) -> Dict[str, Any]:
+    d = {k: v for k, v in p.__dict__.items() if k != "registro"}
+    d["semilla"] = p.semilla
+    return d
+
+
 @router.get("/saves")
-def list_saves() -> Dict[str, Any]:
-    items = _repo().listar()
-    return {"items": [r.__dict__ | {"semilla": r.semilla} for r in items]}
+def list_saves(s: Servicios = Depends(servicios)) -> Dict[str, Any]:
+    items = s.repo.listar()
+    # el registro de movimientos sólo se entrega al pedir una partida
+    return {"items": [_resumen(r) for r in items]}
 
 
 @router.get("/scoreboard")
-def get_scoreboard() -> Dict[str, Any]:
-    items = _scoreboard().sorted_entries()
+def get_scoreboard(s: Servicios = Depends(servicios)) -> Dict[str, Any]:
+    items = s.scoreboard.sorted_entries()
     return {"items": items}
 
 
 @router.get("/saves/{pid}")
-def get_save(pid: str) -> Dict[str, Any]:
-    p = _repo().obtener(pid)
+def get_save(pid: str, s: Servicios = Depends(servicios)) -> Dict[str, Any]:
+    p = s.repo.obtener(pid)
     if not p:
         raise HTTPException(status_code=404, detail="No encontrado")
     return p.__dict__ | {"semilla": p.semilla}
 
 
 @router.post("/saves")
-def create_save(payload: Dict[str, Any]) -> Dict[str, Any]:
+def create_save(payload: Dict[str, Any], s: Servicios = Depends(servicios)) -> Dict[str, Any]:
     mode = str(payload.get("mode", "standard"))
     draw = int(payload.get("draw", 1))
     seed = payload.get("seed")
     pid = str(uuid.uuid4())
     p = Partida.nueva(id=pid, modo=mode, draw_count=draw, seed=int(seed) if seed is not None else None)
-    _repo().crear(p)
+    s.repo.crear(p)
     return {"id": p.id}
 
 
 @router.put("/saves/{pid}")
-def update_save(pid: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    p = _repo().obtener(pid)
+def update_save(
+    pid: str, payload: Dict[str, Any], s: Servicios = Depends(servicios)
+) -> Dict[str, Any]:
+    p = s.repo.obtener(pid)
     if not p:
         raise HTTPException(status_code=404, detail="No encontrado")
-    # permitir actualizar el estado serializado completo
+    # permitir actualizar el estado serializado completo, verificado por
+    # reproducción del registro de movimientos desde la semilla
     state = payload.get("state")
     if state:
-        p.estado_serializado = state
-        p.puntaje = int(state.get("score", 0))
-        p.movimientos = int(state.get("moves", 0))
+        log = payload.get("log")
+        if not isinstance(state, dict) or not isinstance(log, list):
+            raise HTTPException(status_code=400, detail="Se requiere state y log de movimientos")
+        res = verify(p.semilla, p.draw_count, p.modo, log, state)
+        if not res.ok:
+            raise HTTPException(status_code=400, detail=res.reason)
+        p.estado_serializado = res.state | {"seconds": int(state.get("seconds", 0))}
+        p.puntaje = res.score
+        p.movimientos = res.moves
         p.tiempo_segundos = int(state.get("seconds", 0))
-    _repo().actualizar(p)
+        p.registro = list(log)
+    s.repo.actualizar(p)
     return {"ok": True}
 
 
 @router.delete("/saves/{pid}")
-def delete_save(pid: str) -> Dict[str, Any]:
-    _repo().eliminar(pid)
+def delete_save(pid: str, s: Servicios = Depends(servicios)) -> Dict[str, Any]:
+    s.repo.eliminar(pid)
     return {"ok": True}
 
 
 @router.get("/leaderboard")
-def get_leaderboard(limit: int = 50) -> Dict[str, Any]:
+def get_leaderboard(limit: int = 50, s: Servicios = Depends(servicios)) -> Dict[str, Any]:
     """Retorna jugadores anteriores con su mejor puntuación.
 
     Se calcula a partir de partidas persistidas en ``data/saves.json``.
     """
 
-    items = _repo().listar()
+    items = s.repo.listar()
     best: Dict[str, Dict[str, Any]] = {}
     for p in items:
         if not p.jugador:
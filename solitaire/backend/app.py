@@ -1,8 +1,18 @@
 """Fábrica de aplicación FastAPI y montaje del frontend (SPA).
 
 Descripción general:
-- Expone la API REST bajo el prefijo ``/api`` (ver ``routes_game.py``).
-- Monta el frontend estático bajo ``/static`` y sirve ``/`` con ``index.html``.
+- Expone la API REST bajo el prefijo ``/api`` (ver ``routes_game.py`` y,
+  para el desafío diario y los torneos, ``routes_desafios.py``).
+- Crea los servicios compartidos (``api/dependencias.py``) una vez por app;
+  el ``lifespan`` los precarga al arrancar y persiste lo pendiente al apagar.
+- Monta el frontend estático bajo ``/static`` y sirve ``/`` con ``index.html``
+  (``ETag`` por contenido y recursos versionados, ver ``spa.py``).
+- Perfilado opcional por request (``SOLITAIRE_PROFILE``, ver ``profiling.py``)
+  con ``Server-Timing`` por fase.
+- Expone ``/metrics`` (formato de Prometheus, ver ``metrics.py``) con
+  requests y latencia por ruta y tiempos internos del motor y la persistencia.
+- Comprime respuestas mayores a ``COMPRESS_MIN_BYTES`` (Brotli si
+  ``brotli-asgi`` está instalado, si no GZip).
 - Habilita CORS amplio para facilitar ejecución local y despliegue simple.
 - Normaliza errores HTTP y ``ValueError`` devolviendo JSON ``{"detail": str}``.
 
@@ -10,19 +20,53 @@ Este módulo no contiene lógica de juego; solo integra FastAPI y el SPA.
 """
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.requests import Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 
+from .api.dependencias import Servicios
+from .api.routes_desafios import router as challenge_router
 from .api.routes_game import router as game_router
-
-
-def create_app() -> FastAPI:
-    app = FastAPI(title="Klondike Solitaire")
+from .metrics import REGISTRY, MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .spa import CachedStaticFiles, ContentHashes, SPAIndex
+
+try:  # opcional: Brotli con fallback a gzip para clientes que no lo aceptan
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # pragma: no cover - depende del entorno
+    BrotliMiddleware = None
+
+# Por debajo de este tamaño comprimir cuesta más de lo que ahorra
+COMPRESS_MIN_BYTES = 1024
+# Módulos que importar la app no carga (se cargan al primer uso); lo verifican
+# ``tests/test_startup.py`` y ``benchmarks/bench_startup.py``
+LAZY_MODULES = (
+    "numpy",
+    "solitaire.backend.core.hints",
+    "solitaire.backend.services.scoreboard",
+    "solitaire.backend.services.perfiles",
+    "solitaire.backend.services.verificacion",
+)
+
+
+def create_app(servicios: Optional[Servicios] = None) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        svc: Servicios = app.state.servicios
+        svc.calentar()
+        try:
+            yield
+        finally:
+            svc.cerrar()
+
+    app = FastAPI(title="Klondike Solitaire", lifespan=lifespan)
+    app.state.servicios = servicios or Servicios()
 
     app.add_middleware(
         CORSMiddleware,
@@ -31,6 +75,13 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if BrotliMiddleware is not None:
+        app.add_middleware(BrotliMiddleware, minimum_size=COMPRESS_MIN_BYTES, gzip_fallback=True)
+    else:
+        app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+    # perfilado y métricas por fuera de la compresión: sus totales la incluyen
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(MetricsMiddleware)
 
     # Unified error handling to ensure consistent JSON errors
     @app.exception_handler(HTTPException)
@@ -44,22 +95,28 @@ def create_app() -> FastAPI:
         return JSONResponse(status_code=400, content={"detail": str(exc) or "Bad Request"})
 
     app.include_router(game_router)
+    app.include_router(challenge_router)
 
     @app.get("/health")
     def health():  # type: ignore[unused-ignore]
         return {"ok": True}
 
+    @app.get("/metrics")
+    def metrics():  # type: ignore[unused-ignore]
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
     # mount frontend under /static and serve SPA at /
     # El frontend está dentro del paquete `solitaire/frontend`
     root = Path(__file__).resolve().parents[1]  # .../solitaire
     static_dir = root / "frontend"
     if static_dir.exists():
-        app.mount("/static", StaticFiles(directory=str(static_dir), html=False), name="frontend")
+        hashes = ContentHashes(static_dir)
+        app.mount("/static", CachedStaticFiles(directory=static_dir, hashes=hashes), name="frontend")
 
-        index_path = static_dir / "index.html"
+        index = SPAIndex(static_dir, hashes)
 
         @app.get("/")
-        def spa_index():  # type: ignore[unused-ignore]
-            return FileResponse(str(index_path))
+        def spa_index(request: Request):  # type: ignore[unused-ignore]
+            return index.response(request)
 
     return app
@@ -3,12 +3,27 @@
 Este paquete agrupa:
 - ``models``: tipos base (Suit, Rank, Card, Move).
 - ``abstracciones``: interfaz común de pilas.
+- ``rules``: núcleo de reglas sobre códigos de carta (compartido).
 - ``klondike``: implementación de reglas y estado.
 - ``serializer``: helpers para snapshots JSON-friendly.
 - ``scoring``: puntaje y temporizador.
 - ``hints``: heurística para sugerencias (sin mutar estado).
+- ``medicion``: gancho de tiempos al que se suscribe ``backend.metrics``.
+
+``hint``/``hints`` se re-exportan de forma perezosa (PEP 562): importar un
+submódulo del núcleo no carga ``hints``.
 """
+from __future__ import annotations
 
-from .hints import hint, hints  # re-export helpers
+import importlib
+from typing import Any
 
 __all__ = ["hint", "hints"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        value = getattr(importlib.import_module(f"{__name__}.hints"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,7 +6,8 @@ solitario (fundaciÃ³n, tableau, descarte, mazo).
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence
 
 from .models import Card
 
@@ -60,4 +61,25 @@ class PilaAbstracta(ABC):
 
         return list(self._cartas)
 
+    # Vistas sin copia: para el motor y la serialización, que sólo leen.
+    def __len__(self) -> int:
+        return len(self._cartas)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cartas)
+
+    def vista(self) -> Sequence[Card]:
+        """Cartas de abajo hacia arriba sin copiar (solo lectura).
+
+        Es válida hasta la próxima mutación de la pila; para conservarla
+        usar ``cartas()``.
+        """
+
+        return self._cartas
+
+    def desde(self, inicio: int) -> Iterator[Card]:
+        """Recorre las cartas desde el índice ``inicio`` sin copiar."""
+
+        return islice(self._cartas, inicio, None)
+
 
@@ -0,0 +1,292 @@
+"""Repartos en lote con NumPy y estadísticas vectorizadas del reparto inicial.
+
+Un reparto se codifica como 52 códigos de carta (``models.encode_card``) en el
+orden del mazo barajado: posiciones 0..27 son el tableau (la columna ``i``
+recibe ``i + 1`` cartas consecutivas y sólo la última queda boca arriba) y
+28..51 el mazo, empezando por la próxima carta a robar.
+
+``deal_batch`` reproduce bit a bit ``random.Random(seed).shuffle`` de
+``KlondikeGame._new_deck``: siembra MT19937 igual que CPython (``init_by_array``
+sobre las palabras de 32 bits de ``abs(seed)``) y aplica el muestreo por
+rechazo de ``_randbelow``, ambos vectorizados sobre todas las semillas.
+
+NumPy es opcional y se importa recién en la primera función vectorizada
+(``_require_numpy``): ``difficulty`` usa este módulo en cada partida nueva y
+el import de NumPy (~70 ms) no debe pagarse al arrancar el servidor. Sin
+NumPy, ``deal_codes`` sigue disponible y las funciones vectorizadas lanzan
+``RuntimeError``.
+"""
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List
+
+np: Any = None  # dependencia opcional (sólo analítica), ver ``_require_numpy``
+
+
+# Posiciones del tableau dentro del reparto
+TABLEAU_SIZE = 28
+COLUMN_OF = [c for c in range(7) for _ in range(c + 1)]
+ROW_OF = [r for c in range(7) for r in range(c + 1)]
+TOP_POSITIONS = [c * (c + 1) // 2 + c for c in range(7)]
+
+# Palabras aleatorias reservadas por semilla: el barajado consume ~70 en
+# promedio; si una semilla agota el búfer se recalcula con ``random``.
+_RAW_WORDS = 160
+
+
+def deal_codes(seed: int) -> List[int]:
+    """Reparto de una semilla en Python puro (referencia)."""
+
+    perm = list(range(52))
+    random.Random(seed).shuffle(perm)
+    return perm
+
+
+def _require_numpy() -> Any:
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - depende del entorno
+            raise RuntimeError("NumPy no está instalado: pip install numpy") from None
+        np = numpy
+    return np
+
+
+def _seed_key(seed: int) -> List[int]:
+    # ``random.seed(int)`` usa las palabras de 32 bits de abs(seed), LSB primero
+    n = abs(int(seed))
+    words = []
+    while n:
+        words.append(n & 0xFFFFFFFF)
+        n >>= 32
+    return words or [0]
+
+
+_MT_N = 624
+_MT_M = 397
+_MT_BASE: Any = None  # init_genrand(19650218), común a todas las semillas
+
+
+def _mt_base() -> "np.ndarray":
+    global _MT_BASE
+    if _MT_BASE is None:
+        mt = [19650218]
+        for i in range(1, _MT_N):
+            prev = mt[-1]
+            mt.append((1812433253 * (prev ^ (prev >> 30)) + i) & 0xFFFFFFFF)
+        _MT_BASE = np.array(mt, dtype=np.uint32)
+    return _MT_BASE
+
+
+def _mt_raw(keys: "np.ndarray", count: int) -> "np.ndarray":
+    """Primeras ``count`` salidas de 32 bits de MT19937 por fila de ``keys``.
+
+    Replica ``init_by_array`` de CPython vectorizado sobre semillas: el estado
+    se guarda transpuesto ``(624, n)`` para que cada ``mt[i]`` sea contiguo.
+    Todas las filas de ``keys`` tienen la misma cantidad de palabras.
+    """
+
+    if not 0 <= count <= _MT_N - _MT_M:
+        # más salidas necesitarían un segundo "twist" del estado
+        raise ValueError(f"count debe estar entre 0 y {_MT_N - _MT_M}")
+    n, klen = keys.shape
+    mt = np.repeat(_mt_base()[:, None], n, axis=1)
+    # sumandos key[j] + j por posición de la clave (operaciones in-place)
+    addend = [keys[:, j] + np.uint32(j) for j in range(klen)]
+    tmp = np.empty(n, dtype=np.uint32)
+    m1, m2, s30 = np.uint32(1664525), np.uint32(1566083941), np.uint32(30)
+    i, j = 1, 0
+    for _ in range(max(_MT_N, klen)):
+        np.right_shift(mt[i - 1], s30, out=tmp)
+        tmp ^= mt[i - 1]
+        tmp *= m1
+        row = mt[i]
+        row ^= tmp
+        row += addend[j]
+        i += 1
+        j += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+        if j >= klen:
+            j = 0
+    for _ in range(_MT_N - 1):
+        np.right_shift(mt[i - 1], s30, out=tmp)
+        tmp ^= mt[i - 1]
+        tmp *= m2
+        row = mt[i]
+        row ^= tmp
+        row -= np.uint32(i)
+        i += 1
+        if i >= _MT_N:
+            mt[0] = mt[_MT_N - 1]
+            i = 1
+    mt[0] = 0x80000000
+    # primer "twist": las salidas 0..226 sólo dependen del estado previo
+    y = (mt[:count] & np.uint32(0x80000000)) | (mt[1:count + 1] & np.uint32(0x7FFFFFFF))
+    y = mt[_MT_M:_MT_M + count] ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(0x9908B0DF))
+    # tempering
+    y ^= y >> np.uint32(11)
+    y ^= (y << np.uint32(7)) & np.uint32(0x9D2C5680)
+    y ^= (y << np.uint32(15)) & np.uint32(0xEFC60000)
+    y ^= y >> np.uint32(18)
+    return np.ascontiguousarray(y.T)
+
+
+def deal_batch(seeds: Iterable[int], chunk: int = 8192) -> "np.ndarray":
+    """Matriz ``(N, 52)`` ``uint8`` con el reparto de cada semilla.
+
+    Procesa las semillas en bloques de ``chunk`` para acotar memoria.
+    """
+
+    _require_numpy()
+    seeds = [int(s) for s in seeds]
+    out = np.empty((len(seeds), 52), dtype=np.uint8)
+    for start in range(0, len(seeds), chunk):
+        part = seeds[start:start + chunk]
+        out[start:start + len(part)] = _shuffle_batch(part)
+    return out
+
+
+def _shuffle_batch(seeds: List[int]) -> "np.ndarray":
+    n = len(seeds)
+    raw = np.empty((n, _RAW_WORDS), dtype=np.uint32)
+    # agrupar por cantidad de palabras de la clave (casi siempre 1)
+    keys = [_seed_key(s) for s in seeds]
+    for klen in {len(k) for k in keys}:
+        idx = [i for i, k in enumerate(keys) if len(k) == klen]
+        raw[idx] = _mt_raw(np.array([keys[i] for i in idx], dtype=np.uint32), _RAW_WORDS)
+
+    # índices planos: evitar indexado 2D "fancy" en el bucle caliente
+    flat = raw.ravel()
+    base = np.arange(n, dtype=np.intp) * _RAW_WORDS
+    ptr = np.zeros(n, dtype=np.intp)  # próxima palabra a consumir por fila
+    perm = np.tile(np.arange(52, dtype=np.uint8), (n, 1))
+    pflat = perm.ravel()
+    pbase = np.arange(n, dtype=np.intp) * 52
+    last = _RAW_WORDS - 1
+    overflow = np.zeros(n, dtype=bool)  # filas que agotaron el búfer
+    for i in range(51, 0, -1):
+        # j = _randbelow(i + 1): getrandbits(k) con rechazo mientras j > i
+        bound = i + 1
+        shift = np.uint32(32 - bound.bit_length())
+        overflow |= ptr > last
+        np.minimum(ptr, last, out=ptr)
+        r = flat[base + ptr] >> shift
+        idx = np.flatnonzero((r >= bound) & ~overflow)
+        while idx.size:
+            ptr[idx] += 1
+            over = ptr[idx] > last
+            if over.any():
+                overflow[idx[over]] = True
+                idx = idx[~over]
+            r[idx] = flat[base[idx] + ptr[idx]] >> shift
+            idx = idx[r[idx] >= bound]
+        ptr += 1
+        j = pbase + np.minimum(r, i)
+        tmp = perm[:, i].copy()
+        perm[:, i] = pflat[j]
+        pflat[j] = tmp
+    # filas que agotaron el búfer (muy improbable): recalcular sin NumPy
+    for i in np.flatnonzero(overflow):
+        perm[i] = deal_codes(seeds[i])
+    return perm
+
+
+# Ranks (0 = As) considerados "bajos" para profundidad y acceso en el mazo
+LOW_RANK_MAX = 2
+STOCK_SIZE = 52 - TABLEAU_SIZE
+_COVERING = [COLUMN_OF[p] - ROW_OF[p] for p in range(TABLEAU_SIZE)]
+_FACE_DOWN = [p not in TOP_POSITIONS for p in range(TABLEAU_SIZE)]
+
+
+def _stock_weights(draw_count: int) -> List[float]:
+    """Peso de cada posición del mazo en la primera pasada de robo.
+
+    Con robo de 3 sólo una de cada tres cartas queda accesible; las más
+    tempranas pesan más (``1 - pos / 24``).
+    """
+
+    return [
+        (1.0 - pos / STOCK_SIZE) if (pos + 1) % draw_count == 0 else 0.0
+        for pos in range(STOCK_SIZE)
+    ]
+
+
+def deal_features(codes: List[int], draw_count: int = 1) -> Dict[str, float]:
+    """Versión escalar (Python puro) de ``deal_stats`` para un solo reparto."""
+
+    buried_aces = buried_kings = low_depth = 0
+    for p in range(TABLEAU_SIZE):
+        r = codes[p] % 13
+        if r <= LOW_RANK_MAX:
+            low_depth += _COVERING[p]
+        if _FACE_DOWN[p]:
+            if r == 0:
+                buried_aces += 1
+            elif r == 12 and ROW_OF[p] > 0:
+                buried_kings += 1
+    tops = [codes[p] for p in TOP_POSITIONS]
+    moves = 0
+    for a in tops:
+        ra, red_a = a % 13, a < 26
+        if ra == 0:
+            moves += 1
+        for b in tops:
+            if b % 13 == ra + 1 and (b < 26) != red_a:
+                moves += 1
+    weights = _stock_weights(draw_count)
+    stock_reach = sum(
+        w for w, c in zip(weights, codes[TABLEAU_SIZE:]) if c % 13 <= LOW_RANK_MAX
+    )
+    return {
+        "buried_aces": buried_aces,
+        "buried_kings": buried_kings,
+        "low_depth": low_depth,
+        "initial_moves": moves,
+        "stock_reach": stock_reach,
+    }
+
+
+def deal_stats(deals: "np.ndarray", draw_count: int = 1) -> Dict[str, "np.ndarray"]:
+    """Estadísticas del reparto inicial por fila de ``deals``.
+
+    - ``buried_aces``: ases boca abajo en el tableau
+    - ``buried_kings``: reyes boca abajo que no están en la base de su columna
+      (habrá que moverlos para liberar lo que tapan)
+    - ``low_depth``: suma de cartas que tapan a cada carta de rango 1..3 en el
+      tableau (profundidad de las cartas bajas)
+    - ``initial_moves``: jugadas iniciales entre topes (t2f de ases y t2t)
+    - ``stock_reach``: cartas bajas accesibles en la primera pasada del mazo,
+      ponderadas por su posición (ver ``_stock_weights``)
+    """
+
+    _require_numpy()
+    deals = np.asarray(deals)
+    tab = deals[:, :TABLEAU_SIZE].astype(np.int16)
+    rank = tab % 13  # 0 = As, 12 = Rey
+    row = np.array(ROW_OF)
+    face_down = np.array(_FACE_DOWN)
+
+    buried_aces = ((rank == 0) & face_down).sum(axis=1)
+    buried_kings = ((rank == 12) & face_down & (row > 0)).sum(axis=1)
+    low_depth = np.where(rank <= LOW_RANK_MAX, np.array(_COVERING), 0).sum(axis=1)
+
+    tops = deals[:, TOP_POSITIONS].astype(np.int16)
+    t_rank = tops % 13
+    t_red = tops // 13 < 2
+    t2f = (t_rank == 0).sum(axis=1)
+    fits = (t_rank[:, None, :] == t_rank[:, :, None] + 1) & (t_red[:, None, :] != t_red[:, :, None])
+    t2t = fits.sum(axis=(1, 2))
+
+    stock_low = deals[:, TABLEAU_SIZE:] % 13 <= LOW_RANK_MAX
+    stock_reach = (stock_low * np.array(_stock_weights(draw_count))).sum(axis=1)
+    return {
+        "buried_aces": buried_aces,
+        "buried_kings": buried_kings,
+        "low_depth": low_depth,
+        "initial_moves": t2f + t2t,
+        "stock_reach": stock_reach,
+    }
@@ -0,0 +1,136 @@
+"""Estimador rápido de dificultad de un reparto (semilla).
+
+Combina rasgos del reparto inicial (``deals.deal_features``): ases tapados,
+reyes tapados, profundidad de cartas bajas, jugadas iniciales y acceso a
+cartas bajas en el mazo. El puntaje es ``1 - P(victoria)`` según un modelo
+lineal calibrado con simulaciones (``python -m solitaire.sim --calibrate``)
+y se clasifica en ``easy``/``medium``/``hard`` por terciles de la muestra de
+calibración.
+
+Cuesta ~40µs por reparto en Python puro (sin NumPy) y se cachea por
+``(seed, draw_count)``, así que puede usarse al crear partidas.
+"""
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .deals import deal_codes, deal_features
+
+
+FEATURES: Tuple[str, ...] = (
+    "buried_aces", "buried_kings", "low_depth", "initial_moves", "stock_reach",
+)
+LEVELS: Tuple[str, ...] = ("easy", "medium", "hard")
+
+# Coeficientes de P(victoria) por draw_count: (sesgo, *FEATURES).
+# Calibrados con la política "greedy" de ``solitaire.sim`` sobre 700 semillas
+# (``--calibrate --games 700 --seed 100000``).
+WEIGHTS: Dict[int, Tuple[float, ...]] = {
+    1: (0.6802, -0.02262, 0.01895, -0.0096, 0.00567, -0.05554),
+    3: (0.31039, 0.00074, 0.01273, -0.00602, 0.02685, -0.00838),
+}
+# Cortes de dificultad (easy < t1 <= medium < t2 <= hard) por draw_count
+THRESHOLDS: Dict[int, Tuple[float, float]] = {
+    1: (0.5765, 0.6322),
+    3: (0.6826, 0.7247),
+}
+
+
+def _score(feats: Dict[str, float], weights: Sequence[float]) -> float:
+    p = weights[0] + sum(w * feats[f] for w, f in zip(weights[1:], FEATURES))
+    return min(1.0, max(0.0, 1.0 - p))
+
+
+@lru_cache(maxsize=65536)
+def difficulty(seed: int, draw_count: int = 1) -> float:
+    """Dificultad estimada en [0, 1] (1 = muy probablemente perdida)."""
+
+    if draw_count not in WEIGHTS:
+        raise ValueError("draw_count debe ser 1 o 3")
+    return _score(deal_features(deal_codes(seed), draw_count), WEIGHTS[draw_count])
+
+
+def level(seed: int, draw_count: int = 1) -> str:
+    t1, t2 = THRESHOLDS[draw_count]
+    d = difficulty(seed, draw_count)
+    return LEVELS[0] if d < t1 else LEVELS[1] if d < t2 else LEVELS[2]
+
+
+def pick_seed(
+    wanted: str, draw_count: int = 1, rng: Optional[random.Random] = None, tries: int = 200
+) -> int:
+    """Semilla aleatoria del nivel ``wanted``.
+
+    Prueba hasta ``tries`` semillas; si ninguna coincide retorna la más
+    cercana al nivel pedido.
+    """
+
+    if wanted not in LEVELS:
+        raise ValueError(f"Dificultad inválida: {wanted}")
+    if draw_count not in THRESHOLDS:
+        raise ValueError("draw_count debe ser 1 o 3")
+    rng = rng or random.Random()
+    t1, t2 = THRESHOLDS[draw_count]
+    target = {"easy": t1 / 2, "medium": (t1 + t2) / 2, "hard": (t2 + 1) / 2}[wanted]
+    best, best_gap = 0, float("inf")
+    for _ in range(tries):
+        seed = rng.randrange(1, 1 << 30)
+        if level(seed, draw_count) == wanted:
+            return seed
+        gap = abs(difficulty(seed, draw_count) - target)
+        if gap < best_gap:
+            best, best_gap = seed, gap
+    return best
+
+
+# -------------------- Calibración --------------------
+
+
+def _solve(a: List[List[float]], b: List[float]) -> List[float]:
+    """Resuelve ``a x = b`` por eliminación gaussiana con pivoteo parcial."""
+
+    n = len(b)
+    m = [row[:] + [b[i]] for i, row in enumerate(a)]
+    for c in range(n):
+        p = max(range(c, n), key=lambda r: abs(m[r][c]))
+        m[c], m[p] = m[p], m[c]
+        if abs(m[c][c]) < 1e-12:
+            continue
+        for r in range(n):
+            if r != c:
+                f = m[r][c] / m[c][c]
+                m[r] = [x - f * y for x, y in zip(m[r], m[c])]
+    return [m[i][n] / m[i][i] if abs(m[i][i]) >= 1e-12 else 0.0 for i in range(n)]
+
+
+def fit(
+    samples: Iterable[Tuple[int, bool]], draw_count: int = 1, ridge: float = 1e-3
+) -> Tuple[Tuple[float, ...], Tuple[float, float]]:
+    """Ajusta ``WEIGHTS``/``THRESHOLDS`` a partir de ``(seed, won)``.
+
+    Mínimos cuadrados (con una pequeña regularización ``ridge``) de ``won``
+    sobre los rasgos; los cortes son los terciles de la dificultad resultante.
+    """
+
+    rows: List[List[float]] = []
+    ys: List[float] = []
+    for seed, won in samples:
+        feats = deal_features(deal_codes(seed), draw_count)
+        rows.append([1.0] + [float(feats[f]) for f in FEATURES])
+        ys.append(1.0 if won else 0.0)
+    k = len(FEATURES) + 1
+    xtx = [
+        [sum(r[i] * r[j] for r in rows) + (ridge if i == j and i else 0.0) for j in range(k)]
+        for i in range(k)
+    ]
+    xty = [sum(r[i] * y for r, y in zip(rows, ys)) for i in range(k)]
+    weights = tuple(round(w, 5) for w in _solve(xtx, xty))
+    scores = sorted(_score(dict(zip(FEATURES, r[1:])), weights) for r in rows)
+    n = len(scores)
+    if n:
+        thresholds = (round(scores[n // 3], 4), round(scores[(2 * n) // 3], 4))
+    else:
+        thresholds = THRESHOLDS[draw_count]
+    return weights, thresholds
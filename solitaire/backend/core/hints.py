@@ -1,81 +1,58 @@
 """Sugerencias de jugadas para Klondike sin mutar el estado.
 
 Expone dos funciones puras:
-  - hints(state, limit=20) -> list[MoveDict]
+  - hints(state, limit=20, depth=0, budget_ms=50) -> list[MoveDict]
   - hint(state) -> MoveDict | None
 
 Trabaja sobre el estado serializado JSON-friendly tal como lo devuelve
 ``serialize_state(game.to_state())``. No realiza I/O ni modifica ``state``.
+La legalidad sale de ``core.rules``: el estado se traduce una vez a códigos de
+carta y ``game_hints`` hace lo mismo directo desde el motor.
+
+Con ``depth > 0`` las jugadas se reordenan por búsqueda: desde cada candidata
+se expande un haz (``beam``) de ``depth`` jugadas sobre clones livianos del
+motor y se ordena por el mejor ``progress`` alcanzado (campo ``expected``).
+Un caché de transposición evita regenerar jugadas de tableros repetidos y la
+búsqueda se corta al agotar ``budget_ms``. ``rank_moves`` hace la misma
+búsqueda directo desde un motor (simulaciones).
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from . import medicion
+from .models import SUIT_INDEX, SUITS
+from .rules import Board, legal_moves
 
-Move = Dict[str, Any]
-
-
-RED = {"hearts", "diamonds"}
-BLACK = {"clubs", "spades"}
-
-
-def _color(suit: str) -> str:
-    return "red" if suit in RED else "black"
+if TYPE_CHECKING:  # evitar ciclo de importación en tiempo de ejecución
+    from .klondike import KlondikeGame
 
 
-def _foundation_top(foundations: Dict[str, List[Dict[str, Any]]], suit: str) -> Optional[Dict[str, Any]]:
-    pile = list(foundations.get(suit, []))
-    return pile[-1] if pile else None
-
-
-def _can_place_on_foundation(card: Dict[str, Any], ftop: Optional[Dict[str, Any]]) -> bool:
-    if not card:
-        return False
-    rank = int(card.get("rank", 0))
-    suit = str(card.get("suit", ""))
-    if ftop is None:
-        return rank == 1  # As inicia fundación
-    return suit == ftop.get("suit") and rank == int(ftop.get("rank", 0)) + 1
-
+Move = Dict[str, Any]
 
-def _tableau_top(col: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    return col[-1] if col else None
 
+# Código base por palo: ``code = base + rank`` (ver ``models.encode_card``)
+_SUIT_BASE: Dict[str, int] = {s.value: i * 13 - 1 for i, s in enumerate(SUITS)}
 
-def _can_place_on_tableau(head: Dict[str, Any], dest: List[Dict[str, Any]]) -> bool:
-    if not head:
-        return False
-    hr = int(head.get("rank", 0))
-    hs = str(head.get("suit", ""))
-    dtop = _tableau_top(dest)
-    if dtop is None:
-        return hr == 13  # Rey en columna vacía
-    dr = int(dtop.get("rank", 0))
-    ds = str(dtop.get("suit", ""))
-    return dr == hr + 1 and _color(ds) != _color(hs)
 
+def _code(card: Dict[str, Any]) -> int:
+    return _SUIT_BASE[str(card["suit"])] + int(card["rank"])
 
-def _first_face_up_index(col: List[Dict[str, Any]]) -> int:
-    for i, c in enumerate(col):
-        if bool(c.get("face_up", False)):
-            return i
-    return -1
 
+def _board_from_state(state: Dict[str, Any]) -> Board:
+    """Tablero en códigos para ``rules.legal_moves`` desde el estado serializado."""
 
-def _is_faceup_chain(col: List[Dict[str, Any]], start: int) -> bool:
-    if start < 0 or start >= len(col):
-        return False
-    # Todas boca arriba desde start hasta fin y cadena descendente alternando color
-    for i in range(start, len(col)):
-        if not bool(col[i].get("face_up", False)):
-            return False
-    for i in range(start, len(col) - 1):
-        a, b = col[i], col[i + 1]
-        ar, br = int(a.get("rank", 0)), int(b.get("rank", 0))
-        asu, bsu = str(a.get("suit", "")), str(b.get("suit", ""))
-        if not (ar == br + 1 and _color(asu) != _color(bsu)):
-            return False
-    return True
+    waste = list(state.get("waste") or [])
+    foundations = state.get("foundations") or {}
+    ftops = [_code(p[-1]) if (p := foundations.get(s.value)) else None for s in SUITS]
+    tableau = []
+    for col in state.get("tableau") or []:
+        first_up = len(col)
+        while first_up and bool(col[first_up - 1].get("face_up", False)):
+            first_up -= 1
+        tableau.append(([_code(c) for c in col], first_up))
+    return (len(state.get("stock") or []), len(waste), _code(waste[-1]) if waste else None, ftops, tableau)
 
 
 def _score_move(m: Move) -> int:
@@ -95,82 +72,69 @@ def _score_move(m: Move) -> int:
     return 0
 
 
-def hints(state: Dict[str, Any], limit: int = 20) -> List[Move]:
+def hints(state: Dict[str, Any], limit: int = 20, depth: int = 0, budget_ms: float = 50.0) -> List[Move]:
     """Genera hasta ``limit`` jugadas legales ordenadas por prioridad.
 
-    No muta ``state``. Trabaja con estructuras del estado serializado.
+    No muta ``state``. Trabaja con estructuras del estado serializado. Con
+    ``depth > 0`` el orden sale de la búsqueda con presupuesto ``budget_ms``.
     """
 
+    t0 = time.perf_counter()
+    out = _static_hints(state)
+    if depth > 0 and out:
+        if (state.get("stock") or state.get("waste")) and all(m["type"] not in ("draw", "recycle") for m in out):
+            # con búsqueda, robar también compite contra las demás jugadas
+            out.append({"type": "draw", "score": 10, "from_zone": "stock", "explain": "Robar del mazo"})
+        out = _rank_by_lookahead(state, out, depth, budget_ms)
+    if limit is not None and limit > 0:
+        out = out[:limit]
+    obs = medicion.observador
+    if obs is not None:
+        obs("hint", time.perf_counter() - t0)
+    return out
+
+
+def _static_hints(state: Dict[str, Any]) -> List[Move]:
+    """Todas las jugadas legales ordenadas por los pesos fijos de ``_score_move``."""
+
     try:
-        stock: List[Dict[str, Any]] = list(state.get("stock") or [])
-        waste: List[Dict[str, Any]] = list(state.get("waste") or [])
-        foundations: Dict[str, List[Dict[str, Any]]] = {
-            str(k): list(v) for k, v in (state.get("foundations") or {}).items()
-        }
-        tableau: List[List[Dict[str, Any]]] = [list(col) for col in (state.get("tableau") or [])]
+        board = _board_from_state(state)
     except Exception:
         return []
+    return _scored(board)
 
-    out: List[Move] = []
 
-    # Precalcular tope de fundación por palo
-    ftop: Dict[str, Optional[Dict[str, Any]]] = {s: _foundation_top(foundations, s) for s in ("hearts", "diamonds", "clubs", "spades")}
+def game_hints(g: "KlondikeGame") -> List[Move]:
+    """Como ``hints(state, limit=0)`` pero directo desde el motor (sin serializar)."""
 
-    # 1) waste -> foundation
-    if waste:
-        wtop = waste[-1]
-        if _can_place_on_foundation(wtop, ftop.get(str(wtop.get("suit")) )):
-            out.append({"type": "w2f", "score": 100, "explain": "Descarte a fundación"})
+    return _scored(g._board())
 
-    # 2) tableau -> foundation (tope)
-    for i, col in enumerate(tableau):
-        if not col:
-            continue
-        top = col[-1]
-        if not bool(top.get("face_up", False)):
-            continue
-        if _can_place_on_foundation(top, ftop.get(str(top.get("suit")) )):
-            out.append({"type": "t2f", "from_col": i, "score": 90, "explain": "Superior a fundación"})
-
-    # 3) waste -> tableau
-    if waste:
-        wtop = waste[-1]
-        for j, dest in enumerate(tableau):
-            if _can_place_on_tableau(wtop, dest):
-                out.append({"type": "w2t", "to_col": j, "score": 70, "explain": "Descarte a columna"})
-
-    # 4) tableau -> tableau (subpilas)
-    for i, col in enumerate(tableau):
-        if not col:
-            continue
-        first_up = _first_face_up_index(col)
-        if first_up < 0:
-            continue
-        for start in range(first_up, len(col)):
-            if not _is_faceup_chain(col, start):
-                continue
-            head = col[start]
-            for j, dest in enumerate(tableau):
-                if j == i:
-                    continue
-                if _can_place_on_tableau(head, dest):
-                    reveals = start == first_up and first_up > 0
-                    base = 80 if reveals else 40
-                    score = base + min(5, len(col) - start)  # leve premio por longitud
-                    out.append({
-                        "type": "t2t",
-                        "from_col": i,
-                        "start_index": start,
-                        "to_col": j,
-                        "score": score,
-                        "explain": "Mueve cadena{}".format(" y revela" if reveals else ""),
-                    })
+
+def _scored(board: Board) -> List[Move]:
+    stock_n, waste_n, waste_top, _, tableau = board
+    out: List[Move] = []
+    for m in legal_moves(board):
+        t = m["type"]
+        if t == "w2f":
+            m.update(score=100, explain="Descarte a fundación")
+        elif t == "t2f":
+            m.update(score=90, explain="Superior a fundación")
+        elif t == "w2t":
+            m.update(score=70, explain="Descarte a columna")
+        else:
+            codes, first_up = tableau[m["from_col"]]
+            start = m["start_index"]
+            reveals = start == first_up and first_up > 0
+            base = 80 if reveals else 40
+            m["score"] = base + min(5, len(codes) - start)  # leve premio por longitud
+            m["explain"] = "Mueve cadena{}".format(" y revela" if reveals else "")
+        out.append(m)
 
     if not out:
-        # 5) draw / recycle según corresponda
-        if len(stock) > 0:
+        # draw / recycle según corresponda
+        if stock_n > 0:
             out.append({"type": "draw", "score": 10, "explain": "Robar del mazo"})
-        elif len(waste) > 0:
+        elif waste_n > 0:
             out.append({"type": "recycle", "score": 5, "explain": "Reciclar descarte al mazo"})
 
     # Enriquecer metadatos para resaltar origen y destino en la UI
@@ -179,21 +143,13 @@ def hints(state: Dict[str, Any], limit: int = 20) -> List[Move]:
         t = m.get("type")
         if t == "w2f":
             m.setdefault("from_zone", "waste")
-            wtop = waste[-1] if waste else None
-            suit = str((wtop or {}).get("suit", ""))
-            if suit:
-                m.setdefault("to_foundation", suit)
+            if waste_top is not None:
+                m.setdefault("to_foundation", SUITS[SUIT_INDEX[waste_top]].value)
             m.setdefault("explain", "Del descarte a la fundación")
         elif t == "t2f":
             m.setdefault("explain", "Superior a la fundación")
-            try:
-                fc = int(m.get("from_col", -1))
-            except Exception:
-                fc = -1
-            if 0 <= fc < len(tableau) and tableau[fc]:
-                suit = str(tableau[fc][-1].get("suit", ""))
-                if suit:
-                    m.setdefault("to_foundation", suit)
+            codes = tableau[m["from_col"]][0]
+            m.setdefault("to_foundation", SUITS[SUIT_INDEX[codes[-1]]].value)
         elif t == "w2t":
             m.setdefault("from_zone", "waste")
             m.setdefault("explain", "Del descarte a una columna")
@@ -211,11 +167,131 @@ def hints(state: Dict[str, Any], limit: int = 20) -> List[Move]:
 
     # Ordenar por score descendente con desempates menores (tipo estable)
     out.sort(key=lambda m: (int(m.get("score", 0)), m.get("type", "")), reverse=True)
-    if limit is not None and limit > 0:
-        return out[:limit]
     return out
 
 
+# -------------------- Búsqueda (lookahead) --------------------
+
+
+def progress(g: "KlondikeGame") -> int:
+    """Valor heurístico de un tablero: cartas en fundación y cartas reveladas."""
+
+    return 5 * g._in_foundation - g._face_down
+
+
+def _game_from_state(state: Dict[str, Any]) -> "KlondikeGame":
+    from .klondike import KlondikeGame
+
+    full = {"mode": "standard", "draw_count": 1, "score": 0, "moves": 0, "seconds": 0} | state
+    g = KlondikeGame.fast(1, int(full["draw_count"]))
+    g.from_state(full)
+    return g
+
+
+def _playable(m: Move) -> Move:
+    # ``apply_move`` no conoce "recycle": robar con el mazo vacío recicla
+    return {"type": "draw"} if m.get("type") == "recycle" else m
+
+
+class _Search:
+    """Búsqueda en haz con caché de transposición y límite de tiempo."""
+
+    def __init__(self, depth: int, beam: int, deadline: float) -> None:
+        self.depth = depth
+        self.beam = beam
+        self.deadline = deadline
+        # tablero -> (progress, jugadas legales): compartido entre candidatas
+        self.cache: Dict[Tuple[Any, ...], Tuple[int, List[Move]]] = {}
+
+    def expired(self) -> bool:
+        return time.perf_counter() > self.deadline
+
+    def node(self, g: "KlondikeGame") -> Tuple[Tuple[Any, ...], int, List[Move]]:
+        key = g._capture()[:4]
+        hit = self.cache.get(key)
+        if hit is None:
+            moves = [_playable(m) for m in game_hints(g)]
+            if (g.stock._snapshot or g.waste._cartas) and all(m["type"] != "draw" for m in moves):
+                moves.append({"type": "draw"})
+            hit = self.cache[key] = (progress(g), moves)
+        return key, hit[0], hit[1]
+
+    def best(self, g: "KlondikeGame") -> int:
+        """Mejor ``progress`` alcanzable desde ``g`` en ``depth`` jugadas."""
+
+        key, best, _ = self.node(g)
+        seen = {key}
+        frontier = [g]
+        for _ in range(self.depth):
+            children: List[Tuple[int, "KlondikeGame"]] = []
+            for parent in frontier:
+                for m in self.node(parent)[2]:
+                    if self.expired():
+                        return best
+                    child = parent.clone()
+                    try:
+                        if not child.apply_move(m):
+                            continue
+                    except ValueError:
+                        continue
+                    ckey, val, _ = self.node(child)
+                    if ckey in seen:
+                        continue
+                    seen.add(ckey)
+                    children.append((val, child))
+            if not children:
+                break
+            children.sort(key=lambda t: t[0], reverse=True)
+            frontier = [c for _, c in children[: self.beam]]
+            best = max(best, children[0][0])
+        return best
+
+
+def rank_moves(
+    g: "KlondikeGame", cands: List[Move], depth: int = 2, budget_ms: float = 50.0, beam: int = 4
+) -> List[Move]:
+    """Ordena ``cands`` (jugadas de ``g``) por el mejor progreso alcanzable.
+
+    Búsqueda en haz de ``depth`` jugadas (``beam`` tableros por nivel) con
+    presupuesto ``budget_ms``; cada jugada queda anotada con ``expected``. No
+    modifica ``g``.
+    """
+
+    return _rank(g, cands, _Search(depth - 1, beam, time.perf_counter() + budget_ms / 1000.0))
+
+
+def _rank_by_lookahead(state: Dict[str, Any], cands: List[Move], depth: int, budget_ms: float, beam: int = 4) -> List[Move]:
+    t0 = time.perf_counter()
+    try:
+        root = _game_from_state(state)
+    except Exception:
+        return cands
+    return _rank(root, cands, _Search(depth - 1, beam, t0 + budget_ms / 1000.0))
+
+
+def _rank(root: "KlondikeGame", cands: List[Move], search: _Search) -> List[Move]:
+    # 1) un paso para todas las candidatas (barato); 2) profundizar en orden
+    # de prioridad estática mientras quede presupuesto
+    after: List[Optional["KlondikeGame"]] = []
+    for m in cands:
+        child = root.clone()
+        try:
+            ok = child.apply_move(_playable(m))
+        except ValueError:
+            ok = False
+        after.append(child if ok else None)
+        m["expected"] = search.node(child)[1] if ok else None
+    for m, child in zip(cands, after):
+        if child is None or search.expired():
+            continue
+        m["expected"] = search.best(child)
+    return sorted(
+        cands,
+        key=lambda m: (m["expected"] is not None, m["expected"] or 0, int(m.get("score", 0))),
+        reverse=True,
+    )
+
+
 def hint(state: Dict[str, Any]) -> Optional[Move]:
     """Primera sugerencia disponible o ``None`` si no hay jugadas."""
     lst = hints(state, limit=1)
@@ -5,16 +5,21 @@ deshacer/rehacer (historial), pistas y autocompletar.
 """
 from __future__ import annotations
 
+import functools
 import random
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from itertools import islice
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from ...tads.cola import ColaTAD
 from ...tads.deque_historial import HistorialMovimientos
 from ...tads.lista import ListaTAD
+from . import medicion
 from .abstracciones import PilaAbstracta
-from .models import Card, MoveType, Rank, Suit
+from .models import DECK, SUIT_INDEX, Card, MoveType, Rank, Suit, encode_card
+from .rules import Board, chain_start, foundation_accepts, legal_moves, tableau_accepts
 from .scoring import Scoring
-from .serializer import deserialize_state, serialize_state
+from .serializer import deserialize_state, serialize_state, to_json_bytes
 
 
 # ---------------------------------------------------------------------------
@@ -38,15 +43,44 @@ from .serializer import deserialize_state, serialize_state
 # - La victoria se define como las 4 fundaciones completas (13 cartas c/u).
 # ---------------------------------------------------------------------------
 
+# Claves de un movimiento que se conservan en ``move_log`` (se descartan
+# metadatos de UI como ``score`` o ``explain`` que traen las pistas).
+_MOVE_KEYS = ("type", "from_col", "start_index", "to_col")
+
+# Posiciones que explora como máximo el plan de autocompletar (robo de 3)
+AUTOCOMPLETE_NODES = 20_000
+
+# (entrada de ``move_log``, delta de puntaje, segundos) -> None
+Oyente = Callable[[Dict[str, Any], int, float], None]
+
+
+def _publica(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Notifica a ``oyente`` cada acción aceptada por ``fn`` (ver ``KlondikeGame``).
+
+    Una acción es aceptada si agregó una entrada a ``move_log``; sin oyente
+    el costo es una consulta de atributo.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(self: "KlondikeGame", *args: Any, **kwargs: Any) -> Any:
+        oyente = self.oyente
+        if oyente is None:
+            return fn(self, *args, **kwargs)
+        n0, score0, t0 = len(self.move_log), self.scoring.score, perf_counter()
+        result = fn(self, *args, **kwargs)
+        if len(self.move_log) > n0:
+            oyente(self.move_log[-1], self.scoring.score - score0, perf_counter() - t0)
+        return result
+
+    return wrapper
+
 
 class PilaFundacion(PilaAbstracta):
     """Pila de fundación: asciende por palo desde As a Rey."""
 
     def puede_recibir_carta(self, carta: Card) -> bool:  # type: ignore[override]
         tope = self.ver_tope()
-        if tope is None:
-            return carta.rank == Rank.AS
-        return carta.suit == tope.suit and carta.rank == Rank(tope.rank + 1)
+        return foundation_accepts(encode_card(carta), None if tope is None else encode_card(tope))
 
 
 class PilaTableau(PilaAbstracta):
@@ -54,12 +88,7 @@ class PilaTableau(PilaAbstracta):
 
     def puede_recibir_carta(self, carta: Card) -> bool:  # type: ignore[override]
         tope = self.ver_tope()
-        if tope is None:
-            return carta.rank == Rank.REY
-        return (
-            tope.rank == Rank(carta.rank + 1)
-            and tope.suit.color != carta.suit.color
-        )
+        return tableau_accepts(encode_card(carta), None if tope is None else encode_card(tope))
 
 
 class PilaDescarte(PilaAbstracta):
@@ -72,31 +101,35 @@ class PilaDescarte(PilaAbstracta):
 class PilaMazo(PilaAbstracta):
     """Pila de mazo (stock) sobre una ``ColaTAD``.
 
-    Mantiene un espejo de lista para serialización.
+    Mantiene un espejo de lista para serialización. La cola se materializa
+    desde ese espejo recién al primer ``desapilar``, de modo que construir o
+    clonar un mazo es una copia de lista y no un ``put`` por carta.
     """
 
     def __init__(self, cartas: Optional[Iterable[Card]] = None) -> None:
         super().__init__([])
-        self._cola: ColaTAD[Card] = ColaTAD()
-        self._snapshot: List[Card] = []
-        if cartas:
-            for c in cartas:
-                self.apilar(c)
+        self._cola: Optional[ColaTAD[Card]] = None
+        self._snapshot: List[Card] = list(cartas) if cartas else []
+
+    def _q(self) -> ColaTAD[Card]:
+        if self._cola is None:
+            self._cola = ColaTAD(self._snapshot)
+        return self._cola
 
     def puede_recibir_carta(self, carta: Card) -> bool:  # type: ignore[override]
         return True
 
     def apilar(self, carta: Card) -> None:  # type: ignore[override]
-        self._cola.encolar(carta)
+        if self._cola is not None:
+            self._cola.encolar(carta)
         self._snapshot.append(carta)
 
     def desapilar(self) -> Card:  # type: ignore[override]
-        if self._cola.esta_vacia():
+        if not self._snapshot:
             raise ValueError("Pila vacía")
-        c = self._cola.desencolar()
+        c = self._q().desencolar()
         # sincronizar snapshot removiendo primer elemento
-        if self._snapshot:
-            self._snapshot.pop(0)
+        self._snapshot.pop(0)
         return c
 
     def ver_tope(self) -> Optional[Card]:  # type: ignore[override]
@@ -106,6 +139,18 @@ class PilaMazo(PilaAbstracta):
     def cartas(self) -> List[Card]:  # type: ignore[override]
         return list(self._snapshot)
 
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._snapshot)
+
+    def vista(self) -> Sequence[Card]:
+        return self._snapshot
+
+    def desde(self, inicio: int) -> Iterator[Card]:
+        return islice(self._snapshot, inicio, None)
+
     def vaciar_en(self, destino: PilaAbstracta) -> None:
         for c in list(self._snapshot):
             _ = self.desapilar()
@@ -125,63 +170,203 @@ class KlondikeGame:
     - ``foundations``: dict palo -> ``PilaFundacion``
     - ``waste``: ``PilaDescarte``
     - ``stock``: ``PilaMazo`` (usa ``ColaTAD``)
+    - ``history_mode``: ``"serialized"`` (snapshots JSON, por defecto),
+      ``"compact"`` (tuplas de cartas inmutables, usado por la reproducción) u
+      ``"off"`` (sin historial ni registro: simulaciones y solvers)
+    - ``move_log``: registro de acciones aceptadas (movimientos, undo, redo y
+      autoplay) que permite reproducir la partida desde la semilla
+    - ``oyente``: callback opcional ``(entrada, delta de puntaje, segundos)``
+      llamado tras cada acción aceptada (p. ej. ``services.eventos``); las
+      copias (``clone``) no lo heredan
     """
 
-    def __init__(self, mode: str = "standard", draw_count: int = 1, seed: Optional[int] = None) -> None:
+    def __init__(
+        self,
+        mode: str = "standard",
+        draw_count: int = 1,
+        seed: Optional[int] = None,
+        history: str = "serialized",
+    ) -> None:
         if draw_count not in (1, 3):
             raise ValueError("draw_count debe ser 1 o 3")
+        if history not in ("serialized", "compact", "off"):
+            raise ValueError("history debe ser 'serialized', 'compact' u 'off'")
+        self._setup(mode, draw_count, seed or random.randrange(1 << 30), history)
+        self._init_game()
+
+    def _setup(self, mode: str, draw_count: int, seed: int, history: str) -> None:
         self.mode = mode
         self.draw_count = draw_count
-        self.seed = seed or random.randrange(1 << 30)
+        self.seed = seed
         self.scoring = Scoring("standard" if mode not in ("standard", "vegas") else mode)
-        self.history: HistorialMovimientos[Dict[str, Any]] = HistorialMovimientos()
+        self.history_mode = history
+        self.history: HistorialMovimientos[Any] = HistorialMovimientos()
+        self.move_log: List[Dict[str, Any]] = []
+        self.oyente: Optional[Oyente] = None
 
         self.tableau: List[PilaTableau] = [PilaTableau() for _ in range(7)]
         self.foundations: Dict[str, PilaFundacion] = {s.value: PilaFundacion() for s in Suit}
         self.waste = PilaDescarte()
         self.stock = PilaMazo()
+        # tableros vistos al reciclar el mazo desde la última jugada (ver ``is_stuck``)
+        self._cycle_keys: Set[Tuple[Any, ...]] = set()
+        self._stuck = False
+        # contadores mantenidos por cada movimiento (ver ``stats``)
+        self._in_foundation = 0
+        self._face_down = 0
+        self._reset_memo()
+
+    @classmethod
+    def fast(cls, seed: int, draw_count: int = 1, mode: str = "standard") -> "KlondikeGame":
+        """Construcción liviana para solvers y simulaciones.
+
+        Reparte igual que el constructor pero sin historial, sin registro de
+        movimientos y sin iniciar el temporizador (``seconds()`` queda en 0).
+        """
 
-        self._init_game()
+        if draw_count not in (1, 3):
+            raise ValueError("draw_count debe ser 1 o 3")
+        g = cls.__new__(cls)
+        g._setup(mode, draw_count, seed, "off")
+        g._deal()
+        return g
+
+    def clone(self) -> "KlondikeGame":
+        """Copia independiente del tablero y puntaje (sin historial ni registro).
+
+        Las cartas son inmutables, así que basta con copiar cada pila.
+        """
+
+        g = KlondikeGame.__new__(KlondikeGame)
+        g.mode = self.mode
+        g.draw_count = self.draw_count
+        g.seed = self.seed
+        sc = self.scoring
+        g.scoring = Scoring(sc.mode, sc.score, sc.moves, sc.start_ts)
+        g.history_mode = "off"
+        g.history = HistorialMovimientos()
+        g.move_log = []
+        g.oyente = None
+        g.tableau = [PilaTableau(col._cartas) for col in self.tableau]
+        g.foundations = {k: PilaFundacion(p._cartas) for k, p in self.foundations.items()}
+        g.waste = PilaDescarte(self.waste._cartas)
+        g.stock = PilaMazo(self.stock._snapshot)
+        g._cycle_keys = set(self._cycle_keys)
+        g._stuck = self._stuck
+        g._in_foundation = self._in_foundation
+        g._face_down = self._face_down
+        g._reset_memo()
+        return g
+
+    def fork(self, history: str = "serialized") -> "KlondikeGame":
+        """Partida jugable que arranca del tablero actual (p. ej. un reparto compartido).
+
+        Copia las pilas como ``clone`` e inicia historial y temporizador como
+        el constructor. Si el original está en el segundo 0 (``fast``), el
+        estado serializado y codificado memoizado se comparte en vez de
+        recalcularse y es también el primer snapshot de deshacer: muchas
+        sesiones del mismo reparto cuestan una copia de listas cada una.
+        """
+
+        if history not in ("serialized", "compact", "off"):
+            raise ValueError("history debe ser 'serialized', 'compact' u 'off'")
+        shared = self.serialized() if self.scoring.seconds() == 0 else None
+        g = self.clone()
+        g.history_mode = history
+        g.scoring.start_ts = 0.0
+        g.scoring.start()
+        if shared is not None and g.scoring.seconds() == 0:
+            g._memo, g._memo_json, g._memo_key = shared, self._memo_json, (g._version, 0)
+        g._snapshot_for_undo()
+        return g
 
     # -------------------- Inicialización --------------------
     def _new_deck(self) -> List[Card]:
-        deck = [Card(rank=r, suit=s, face_up=False) for s in Suit for r in Rank]
+        deck = list(DECK)
         rng = random.Random(self.seed)
         rng.shuffle(deck)
         return deck
 
-    def _init_game(self) -> None:
+    def _deal(self) -> None:
         deck = self._new_deck()
-        # repartir a tableau
+        # repartir a tableau: la columna i recibe i+1 cartas consecutivas
+        pos = 0
         for col_idx in range(7):
-            for _ in range(col_idx + 1):
-                c = deck.pop(0)
-                self.tableau[col_idx]._cartas.append(c)
+            cartas = deck[pos:pos + col_idx + 1]
+            pos += col_idx + 1
             # voltear la ultima
-            last = self.tableau[col_idx].ver_tope()
-            if last and not last.face_up:
-                self.tableau[col_idx]._cartas[-1] = last.flips()
+            cartas[-1] = cartas[-1].flips()
+            self.tableau[col_idx]._cartas = cartas
         # resto al mazo
-        for c in deck:
-            self.stock.apilar(c)
+        self.stock = PilaMazo(deck[pos:])
+        self._recount()
+
+    def _init_game(self) -> None:
+        self._deal()
         self.scoring.start()
         self._snapshot_for_undo()
 
     # -------------------- Serialización --------------------
     def to_state(self) -> Dict[str, Any]:
+        """Estado del motor con cartas ``Card``.
+
+        Las pilas son vistas de solo lectura (``PilaAbstracta.vista``): hay que
+        serializarlas o copiarlas antes de volver a mover.
+        """
+
         return {
             "mode": self.mode,
             "draw_count": self.draw_count,
-            "stock": self.stock.cartas(),
-            "waste": self.waste.cartas(),
-            "foundations": {k: v.cartas() for k, v in self.foundations.items()},
-            "tableau": [col.cartas() for col in self.tableau],
+            "stock": self.stock.vista(),
+            "waste": self.waste.vista(),
+            "foundations": {k: v.vista() for k, v in self.foundations.items()},
+            "tableau": [col.vista() for col in self.tableau],
             "score": self.scoring.score,
             "moves": self.scoring.moves,
             "seconds": self.scoring.seconds(),
             "won": self.is_won(),
+            "stuck": self.is_stuck(),
+            "stats": self.stats(),
         }
 
+    def _reset_memo(self) -> None:
+        # ``_version`` cambia con cada mutación; invalida ``serialized()``
+        self._version = 0
+        self._memo_key: Optional[Tuple[int, int]] = None
+        self._memo: Dict[str, Any] = {}
+        self._memo_json: Optional[bytes] = None
+
+    def _count_move(self) -> None:
+        self.scoring.add_move()
+        self._version += 1
+
+    def serialized(self) -> Dict[str, Any]:
+        """``serialize_state(self.to_state())`` memoizado.
+
+        Se recalcula sólo tras una mutación (movimiento, undo/redo, restauración)
+        o cuando cambia el segundo del temporizador, así que varias lecturas en
+        un mismo request (o sondeos GET) comparten un único dict. Es compartido:
+        no debe modificarse.
+        """
+
+        secs = self.scoring.seconds()
+        key = (self._version, secs)
+        if self._memo_key != key:
+            state = self.to_state()
+            state["seconds"] = secs
+            self._memo = serialize_state(state)
+            self._memo_json = None
+            self._memo_key = key
+        return self._memo
+
+    def serialized_json(self) -> bytes:
+        """``serialized()`` codificado como JSON (UTF-8), también memoizado."""
+
+        state = self.serialized()
+        if self._memo_json is None:
+            self._memo_json = to_json_bytes(state)
+        return self._memo_json
+
     def from_state(self, data: Dict[str, Any]) -> None:
         state = deserialize_state(serialize_state(data))  # normaliza
         self.mode = state["mode"]
@@ -193,11 +378,82 @@ class KlondikeGame:
         self.stock = PilaMazo(state["stock"])
         self.scoring.score = state["score"]
         self.scoring.moves = state["moves"]
+        self._cycle_keys, self._stuck = set(), False
+        self._recount()
+        self._version += 1
 
     def _snapshot_for_undo(self) -> None:
-        self.history.push_undo(serialize_state(self.to_state()))
+        if self.history_mode == "off":
+            return
+        obs = medicion.observador
+        t0 = perf_counter() if obs is not None else 0.0
+        self.history.push_undo(self._snapshot())
+        if obs is not None:
+            obs("undo_snapshot", perf_counter() - t0)
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        if self.history_mode != "off":
+            self.move_log.append(entry)
+
+    def _snapshot(self) -> Any:
+        """Snapshot del estado actual según ``history_mode``."""
+
+        if self.history_mode == "compact":
+            return self._capture()
+        return self.serialized()
+
+    def _restore(self, snap: Any) -> None:
+        if isinstance(snap, tuple):
+            self._restore_compact(snap)
+        else:
+            self.from_state(snap)
+
+    def _capture(self) -> Tuple[Any, ...]:
+        """Snapshot compacto: tuplas de ``Card`` (inmutables) sin serializar."""
+
+        return (
+            tuple(self.stock._snapshot),
+            tuple(self.waste._cartas),
+            tuple(tuple(p._cartas) for p in self.foundations.values()),
+            tuple(tuple(col._cartas) for col in self.tableau),
+            self.scoring.score,
+            self.scoring.moves,
+        )
+
+    def _restore_compact(self, snap: Tuple[Any, ...]) -> None:
+        stock, waste, foundations, tableau, score, moves = snap
+        self.stock = PilaMazo(stock)
+        self.waste._cartas = list(waste)
+        for pila, cartas in zip(self.foundations.values(), foundations):
+            pila._cartas = list(cartas)
+        for col, cartas in zip(self.tableau, tableau):
+            col._cartas = list(cartas)
+        self.scoring.score = score
+        self.scoring.moves = moves
+        self._cycle_keys, self._stuck = set(), False
+        self._recount()
+        self._version += 1
 
     # -------------------- Utilidades reglas --------------------
+    def _board(self) -> Board:
+        """Tablero en códigos para ``rules.legal_moves`` (sin serializar)."""
+
+        tableau = []
+        for col in self.tableau:
+            cartas = col._cartas
+            first_up = len(cartas)
+            while first_up and cartas[first_up - 1].face_up:
+                first_up -= 1
+            tableau.append(([encode_card(c) for c in cartas], first_up))
+        waste = self.waste._cartas
+        return (
+            len(self.stock._snapshot),
+            len(waste),
+            encode_card(waste[-1]) if waste else None,
+            [encode_card(p._cartas[-1]) if p._cartas else None for p in self.foundations.values()],
+            tableau,
+        )
+
     @staticmethod
     def _can_place_on_tableau(dest: PilaTableau, card: Card) -> bool:
         try:
@@ -216,6 +472,79 @@ class KlondikeGame:
         top = col.ver_tope()
         if top and not top.face_up:
             col._cartas[-1] = top.flips()
+            self._face_down -= 1
+
+    def _recount(self) -> None:
+        """Recalcula los contadores tras reconstruir las pilas."""
+
+        self._in_foundation = sum(len(p) for p in self.foundations.values())
+        self._face_down = sum(1 for col in self.tableau for c in col._cartas if not c.face_up)
+
+    def _cycle_has_moves(self, tops: Sequence[Card]) -> bool:
+        """True si hay una jugada que avance en una vuelta al mazo.
+
+        Durante una vuelta sólo de robos el tableau y las fundaciones no
+        cambian: basta mirar sus jugadas y cada carta que estuvo al tope del
+        descarte (``tops``). Los ``t2t`` sólo cuentan si avanzan (ver
+        ``_t2t_progresses``): pasear un rey de una columna vacía a otra no
+        destraba nada.
+        """
+
+        if self._progress_moves(self._board(), [encode_card(c) for c in tops]):
+            return True
+        for c in tops:
+            if self._can_place_on_foundation(self.foundations[c.suit.value], c):
+                return True
+            if any(self._can_place_on_tableau(col, c) for col in self.tableau):
+                return True
+        return False
+
+    def _progress_moves(self, board: Board, tops: Sequence[int]) -> List[Dict[str, Any]]:
+        """``legal_moves(board)`` sin los ``t2t`` que no avanzan."""
+
+        t2t = MoveType.TABLEAU_TO_TABLEAU.value
+        return [
+            m for m in legal_moves(board)
+            if m["type"] != t2t or self._t2t_progresses(m, board, tops)
+        ]
+
+    def _t2t_progresses(self, move: Dict[str, Any], board: Board, tops: Sequence[int]) -> bool:
+        """True si el ``t2t`` ``move`` avanza la partida.
+
+        Avanza si da vuelta una carta boca abajo, si vacía una columna para un
+        rey que espera (en mazo, descarte o sobre otras cartas del tableau) o si
+        deja al descubierto una carta que puede ir a su fundación o recibir
+        alguna de ``tops`` (cartas que pasan por el tope del descarte). Mover
+        una cadena que ya estaba sobre la mesa a otra columna sin nada de eso
+        sólo permuta el tablero.
+        """
+
+        _, _, _, ftops, tableau = board
+        codes, first_up = tableau[move["from_col"]]
+        start = move["start_index"]
+        if start == 0:
+            if codes[0] % 13 == 12:
+                return False  # un rey de columna vacía a columna vacía
+            return self._king_waiting(tableau)
+        if start == first_up:
+            return True
+        below = codes[start - 1]
+        return foundation_accepts(below, ftops[SUIT_INDEX[below]]) or any(
+            tableau_accepts(t, below) for t in tops
+        )
+
+    def _king_waiting(self, tableau: Sequence[Tuple[Sequence[int], int]]) -> bool:
+        """True si algún rey podría ocupar una columna vacía."""
+
+        if any(c.rank == Rank.REY for c in self.stock._snapshot) or any(
+            c.rank == Rank.REY for c in self.waste._cartas
+        ):
+            return True
+        for codes, first_up in tableau:
+            start = chain_start(codes, first_up)
+            if any(c % 13 == 12 for c in codes[max(start, 1):]):
+                return True
+        return False
 
     # -------------------- Movimientos --------------------
     def draw_from_stock(self) -> bool:
@@ -226,19 +555,28 @@ class KlondikeGame:
 
         if self.stock.ver_tope() is None:
             # reciclar: mover descarte al mazo en el mismo orden pero boca abajo
-            if not self.waste.cartas():
+            if not len(self.waste):
                 return False
-            tmp = list(reversed(self.waste.cartas()))
-            self.waste._cartas.clear()
-            for c in tmp:
+            # cartas que quedaron al tope del descarte durante la vuelta
+            vista = self.waste.vista()
+            tops = vista[self.draw_count - 1::self.draw_count] + vista[-1:]
+            for c in reversed(vista):
                 if c.face_up:
                     c = Card(c.rank, c.suit, False)
                 self.stock.apilar(c)
+            self.waste._cartas.clear()
             # Penalty for cycling through stock (reserve):
             # - Draw 1: -100 points per cycle
             # - Draw 3: -20 points per cycle
             self.scoring.add_points(-100 if self.draw_count == 1 else -20)
-            self.scoring.add_move()
+            self._count_move()
+            # Detección de partida trabada: si el tablero al reciclar ya se vio
+            # en otro reciclado sin jugadas en medio, las vueltas al mazo sólo
+            # repiten posiciones (el orden del mazo alterna entre vueltas). Sólo
+            # está trabada si además en toda la vuelta no hubo otra jugada legal.
+            key = self._capture()[:4]
+            self._stuck = key in self._cycle_keys and not self._cycle_has_moves(tops)
+            self._cycle_keys.add(key)
             return True
 
         moved = 0
@@ -252,33 +590,36 @@ class KlondikeGame:
             self.waste.apilar(c)
             moved += 1
         if moved:
-            self.scoring.add_move()
+            self._count_move()
         return moved > 0
 
     def move_tableau_to_tableau(self, from_col: int, start_index: int, to_col: int) -> bool:
         origen = self.tableau[from_col]
         destino = self.tableau[to_col]
-        if start_index < 0 or start_index >= len(origen._cartas):
+        cartas = origen.vista()
+        if start_index < 0 or start_index >= len(cartas):
             raise ValueError("Índice inicial fuera de rango")
-        subpila = origen._cartas[start_index:]
-        if not subpila or not subpila[0].face_up:
+        head = cartas[start_index]
+        if not head.face_up:
             raise ValueError("No se puede mover carta(s) boca abajo")
-        # validar cadena descendente y alternando colores
-        for i in range(len(subpila) - 1):
-            a, b = subpila[i], subpila[i + 1]
-            if not (a.rank == Rank(b.rank + 1) and a.suit.color != b.suit.color and b.face_up):
+        # validar cadena descendente y alternando colores, sin copiar la subpila
+        prev = encode_card(head)
+        for c in origen.desde(start_index + 1):
+            code = encode_card(c)
+            if not (c.face_up and tableau_accepts(code, prev)):
                 raise ValueError("La cadena debe descender alternando colores y estar descubierta")
-        if not self._can_place_on_tableau(destino, subpila[0]):
+            prev = code
+        if not self._can_place_on_tableau(destino, head):
             top = destino.ver_tope()
-            if top is None and subpila[0].rank != Rank.REY:
+            if top is None and head.rank != Rank.REY:
                 raise ValueError("Solo un Rey puede ocupar una columna vacía")
             raise ValueError("Debe alternar color y ser un rango menor por uno")
         # aplicar
-        destino._cartas.extend(subpila)
+        destino._cartas.extend(origen.desde(start_index))
         del origen._cartas[start_index:]
         self._flip_top_if_needed(origen)
         self.scoring.add_points(3)
-        self.scoring.add_move()
+        self._count_move()
         return True
 
     def move_tableau_to_foundation(self, from_col: int) -> bool:
@@ -296,10 +637,11 @@ class KlondikeGame:
             raise ValueError("Debe ser del mismo palo y un rango superior")
         dest.apilar(top)
         origen.desapilar()
+        self._in_foundation += 1
         self._flip_top_if_needed(origen)
         # Penalty: moving from tableau to foundation costs 15 points
         self.scoring.add_points(-15)
-        self.scoring.add_move()
+        self._count_move()
         return True
 
     def move_waste_to_tableau(self, to_col: int) -> bool:
@@ -315,7 +657,7 @@ class KlondikeGame:
         dest.apilar(top)
         self.waste.desapilar()
         self.scoring.add_points(5)
-        self.scoring.add_move()
+        self._count_move()
         return True
 
     def move_waste_to_foundation(self) -> bool:
@@ -330,11 +672,13 @@ class KlondikeGame:
             raise ValueError("Debe ser del mismo palo y un rango superior")
         dest.apilar(top)
         self.waste.desapilar()
+        self._in_foundation += 1
         self.scoring.add_points(10)
-        self.scoring.add_move()
+        self._count_move()
         return True
 
     # -------------------- Interfaz pública --------------------
+    @_publica
     def apply_move(self, move: Dict[str, Any]) -> bool:
         """Aplica un movimiento representado por un dict.
 
@@ -344,8 +688,21 @@ class KlondikeGame:
             - {"type": "t2f", "from_col": i}
             - {"type": "w2t", "to_col": i}
             - {"type": "w2f"}
+
+        Sólo se mide la duración (``medicion.observador``) en partidas con
+        historial: las copias de búsqueda y simulación no cuentan.
         """
 
+        obs = medicion.observador
+        if obs is None or self.history_mode == "off":
+            return self._apply_move(move)
+        t0 = perf_counter()
+        try:
+            return self._apply_move(move)
+        finally:
+            obs("apply_move", perf_counter() - t0)
+
+    def _apply_move(self, move: Dict[str, Any]) -> bool:
         mtype = move.get("type")
         self._snapshot_for_undo()
         ok = False
@@ -372,10 +729,21 @@ class KlondikeGame:
         if not ok:
             # revertir snapshot si no se pudo
             _ = self.history.pop_undo()
+        else:
+            if mtype != MoveType.DRAW.value:
+                self._cycle_keys.clear()
+                self._stuck = False
+            self._log({k: move[k] for k in _MOVE_KEYS if k in move})
         return ok
 
     def hint(self) -> Optional[Dict[str, Any]]:
-        """Devuelve un movimiento válido simple si existe."""
+        """Devuelve un movimiento válido simple si existe.
+
+        Retorna ``None`` si la partida está trabada (ver ``is_stuck``).
+        """
+
+        if self.is_stuck():
+            return None
 
         # 1) waste -> foundation
         top = self.waste.ver_tope()
@@ -391,24 +759,17 @@ class KlondikeGame:
             c = col.ver_tope()
             if c and c.face_up and self._can_place_on_foundation(self.foundations[c.suit.value], c):
                 return {"type": MoveType.TABLEAU_TO_FOUNDATION.value, "from_col": i}
-        # 4) tableau -> tableau (buscar cadena válida)
-        for i, col in enumerate(self.tableau):
-            for start in range(len(col._cartas)):
-                if start < len(col._cartas) and col._cartas[start].face_up:
-                    cand = col._cartas[start]
-                    for j, dest in enumerate(self.tableau):
-                        if i == j:
-                            continue
-                        if self._can_place_on_tableau(dest, cand):
-                            return {
-                                "type": MoveType.TABLEAU_TO_TABLEAU.value,
-                                "from_col": i,
-                                "start_index": start,
-                                "to_col": j,
-                            }
+        # 4) tableau -> tableau (primera cadena que avanza)
+        board = self._board()
+        for m in self._progress_moves(board, [] if board[2] is None else [board[2]]):
+            if m["type"] == MoveType.TABLEAU_TO_TABLEAU.value:
+                return m
         # 5) draw
-        return {"type": MoveType.DRAW.value}
+        if self.stock._snapshot or self.waste._cartas:
+            return {"type": MoveType.DRAW.value}
+        return None
 
+    @_publica
     def autoplay(self, limit: int = 200) -> int:
         """Mueve automáticamente cartas a la fundación hasta que no se pueda.
 
@@ -443,20 +804,131 @@ class KlondikeGame:
                         applied += 1
             if not moved:
                 break
+        if applied:
+            self._cycle_keys.clear()
+            self._stuck = False
+            self._log({"type": "autoplay", "limit": limit})
         return applied
 
+    def can_autocomplete(self) -> bool:
+        """True si todas las cartas del tableau están boca arriba y hay plan.
+
+        En ese punto el orden del mazo es conocido y la partida se termina
+        sin jugadas a ciegas; ``autocomplete`` nunca falla si esto es True.
+        """
+
+        return self._face_down == 0 and not self.is_won() and self._plan_autocomplete() is not None
+
+    def _plan_autocomplete(
+        self, max_nodes: int = AUTOCOMPLETE_NODES
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Secuencia ganadora calculada sobre un clon (``None`` si no hay).
+
+        Búsqueda en profundidad sobre ``checkpoint``/``restore`` que prueba
+        primero la línea voraz ``w2f`` > ``t2f`` > ``w2t`` > ``draw`` > ``t2t``.
+        Con robo de 1 esa línea siempre gana (la carta de menor rango que queda
+        está en un tope o pasa por el descarte). Con robo de 3 sólo una de cada
+        tres cartas llega al tope del descarte: bajar una carta al tableau o a
+        la fundación corre el resto del mazo y cambia cuáles quedan accesibles,
+        así que se prueba cada carta que pasa por el tope antes de seguir
+        robando. Una vuelta entera al mazo sin jugadas repite una posición ya
+        vista (punto fijo) y se retrocede a la última alternativa. Se abandona
+        tras ``max_nodes`` posiciones.
+        """
+
+        if self._face_down:
+            return None
+        c = self.clone()
+        w2f, t2f = MoveType.WASTE_TO_FOUNDATION.value, MoveType.TABLEAU_TO_FOUNDATION.value
+        t2t = MoveType.TABLEAU_TO_TABLEAU.value
+        draw = {"type": MoveType.DRAW.value}
+        plan: List[Dict[str, Any]] = []
+        seen: Set[int] = set()
+        # (largo del plan, jugada, punto de restauración previo a la jugada)
+        stack: List[Tuple[int, Optional[Dict[str, Any]], Tuple[Any, ...]]]
+        stack = [(0, None, c.checkpoint())]
+        while stack:
+            depth, move, cp = stack.pop()
+            c.restore(cp)
+            del plan[depth:]
+            if move is not None:
+                if not c._play_planned(move):
+                    continue
+                plan.append(move)
+            if c.is_won():
+                return plan
+            key = c.position_key()
+            if key in seen:
+                continue
+            if len(seen) >= max_nodes:
+                return None
+            seen.add(key)
+            board = c._board()
+            if c.draw_count == 1:
+                moves = [m for m in legal_moves(board) if m["type"] in (w2f, t2f)] + [draw]
+            else:
+                pending = [encode_card(x) for x in c.stock._snapshot + c.waste._cartas]
+                found = c._progress_moves(board, pending)
+                # a la fundación o al tableau primero; los t2t sólo si robar no alcanza
+                moves = [m for m in found if m["type"] != t2t] + [draw]
+                moves += [m for m in found if m["type"] == t2t]
+            here = c.checkpoint()
+            stack.extend((len(plan), m, here) for m in reversed(moves))
+        return None
+
+    def _play_planned(self, move: Dict[str, Any]) -> bool:
+        """Aplica una jugada del plan de autocompletar sin historial ni registro."""
+
+        t = move["type"]
+        if t == MoveType.DRAW.value:
+            return self.draw_from_stock()
+        if t == MoveType.WASTE_TO_FOUNDATION.value:
+            return self.move_waste_to_foundation()
+        if t == MoveType.WASTE_TO_TABLEAU.value:
+            return self.move_waste_to_tableau(move["to_col"])
+        if t == MoveType.TABLEAU_TO_TABLEAU.value:
+            return self.move_tableau_to_tableau(
+                move["from_col"], move["start_index"], move["to_col"]
+            )
+        return self.move_tableau_to_foundation(move["from_col"])
+
+    @_publica
+    def autocomplete(self) -> List[Dict[str, Any]]:
+        """Termina la partida si ``can_autocomplete``.
+
+        Aplica toda la secuencia en un solo lote (un único paso de undo y una
+        entrada ``{"type": "autocomplete"}`` en el registro) y la retorna para
+        animarla en el cliente. Retorna ``[]`` si no se pudo completar.
+        """
+
+        if self.is_won():
+            return []
+        plan = self._plan_autocomplete()
+        if not plan:
+            return []
+        self._snapshot_for_undo()
+        for mv in plan:
+            self._play_planned(mv)
+        self._cycle_keys.clear()
+        self._stuck = False
+        self._log({"type": "autocomplete"})
+        return plan
+
     # -------------------- Deshacer / Rehacer --------------------
+    @_publica
     def undo(self) -> bool:
         prev = self.history.pop_undo()
         if not prev:
             return False
         # guardar actual en redo
-        self.history.push_redo(serialize_state(self.to_state()))
-        self.from_state(prev)
+        self.history.push_redo(self._snapshot())
+        self._restore(prev)
         # Penalty for using undo: -5 points
         self.scoring.add_points(-5)
+        self._log({"type": "undo"})
         return True
 
+    @_publica
     def redo(self) -> bool:
         nxt = self.history.pop_redo()
         if not nxt:
@@ -464,14 +936,63 @@ class KlondikeGame:
         # push actual a undo
         # Al rehacer, NO debemos limpiar la pila de redo. Usamos el método que
         # preserva el historial de redo para permitir rehacer múltiples pasos.
-        self.history.push_undo_preserve_redo(serialize_state(self.to_state()))
-        self.from_state(nxt)
+        self.history.push_undo_preserve_redo(self._snapshot())
+        self._restore(nxt)
+        self._log({"type": "redo"})
         return True
 
+    # -------------------- Puntos de restauración --------------------
+    def checkpoint(self) -> Tuple[Any, ...]:
+        """Punto de restauración barato (pilas, puntaje y largo del registro).
+
+        No pasa por el historial de deshacer: pensado para solvers y
+        simulaciones que prueban una jugada y vuelven atrás con ``restore``.
+        """
+
+        return self._capture() + (len(self.move_log),)
+
+    def restore(self, checkpoint: Tuple[Any, ...]) -> None:
+        """Vuelve a un ``checkpoint`` y descarta lo registrado después."""
+
+        self._restore_compact(checkpoint[:6])
+        del self.move_log[checkpoint[6]:]
+
+    def position_key(self) -> int:
+        """Hash de la posición (sólo pilas) para detectar posiciones repetidas."""
+
+        return hash(self._capture()[:4])
+
+    # -------------------- Fin de partida --------------------
+    def is_stuck(self) -> bool:
+        """True si la partida no puede progresar.
+
+        Ocurre cuando un reciclado del mazo repite un tablero ya visto en otro
+        reciclado sin jugadas en medio (sólo se estuvo robando) y en esa vuelta
+        no había ninguna jugada que avance además de robar, o cuando mazo y
+        descarte están vacíos y no queda ninguna jugada que avance en el
+        tableau (ver ``_t2t_progresses``).
+        """
+
+        if self.is_won():
+            return False
+        if self._stuck:
+            return True
+        if self.stock._snapshot or self.waste._cartas:
+            return False
+        return not self._progress_moves(self._board(), ())
+
     # -------------------- Estado de victoria --------------------
     def is_won(self) -> bool:
         """Return True if all four foundations have 13 cards each."""
-        try:
-            return all(len(pila.cartas()) == 13 for pila in self.foundations.values())
-        except Exception:
-            return False
+
+        return self._in_foundation == 52
+
+    def stats(self) -> Dict[str, int]:
+        """Métricas de progreso en O(1) para clientes y analítica."""
+
+        return {
+            "foundation": self._in_foundation,
+            "face_down": self._face_down,
+            "stock": len(self.stock),
+            "waste": len(self.waste),
+        }
@@ -0,0 +1,24 @@
+"""Gancho de medición de tiempos del núcleo.
+
+El núcleo no depende de la capa de servicios: en vez de registrar métricas,
+las secciones medidas (``apply_move``, ``undo_snapshot``, ``serialize_state``
+y ``hint``) llaman a ``observador(nombre, segundos)`` si hay uno instalado.
+``metrics`` se suscribe al importarse; sin suscriptor (simulaciones,
+benchmarks del motor) ni siquiera se consulta el reloj.
+"""
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+# (nombre de la sección, segundos) -> None
+Observador = Callable[[str, float], None]
+
+observador: Optional[Observador] = None
+
+
+def suscribir(fn: Optional[Observador]) -> Optional[Observador]:
+    """Instala ``fn`` como observador (``None`` lo quita) y retorna el anterior."""
+
+    global observador
+    anterior, observador = observador, fn
+    return anterior
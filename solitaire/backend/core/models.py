@@ -60,6 +60,50 @@ class Card:
         return Card(Rank(d["rank"]), Suit(d["suit"]), bool(d.get("face_up", False)))
 
 
+# Codificación compacta de cartas: ``code = suit_idx * 13 + (rank - 1)`` en el
+# orden de ``Suit`` (hearts, diamonds, clubs, spades). Coincide con la posición
+# de cada carta en el mazo ordenado que ``KlondikeGame._new_deck`` baraja.
+SUITS: Tuple[Suit, ...] = tuple(Suit)
+_SUIT_BASE: Dict[Suit, int] = {s: i * 13 - 1 for i, s in enumerate(SUITS)}
+
+
+def encode_card(card: Card) -> int:
+    """Código 0..51 de una carta (ignora ``face_up``)."""
+
+    return _SUIT_BASE[card.suit] + card.rank
+
+
+def decode_card(code: int, face_up: bool = False) -> Card:
+    """Carta correspondiente a un código 0..51."""
+
+    return Card(Rank(code % 13 + 1), SUITS[code // 13], face_up)
+
+
+# Tablas por código, calculadas una vez al importar
+RANK0: Tuple[int, ...] = tuple(c % 13 for c in range(52))  # 0 = As, 12 = Rey
+SUIT_INDEX: Tuple[int, ...] = tuple(c // 13 for c in range(52))
+# Mazo ordenado boca abajo (``DECK[code]``); las cartas son inmutables, así
+# que cada reparto baraja una copia de esta tupla sin crear cartas nuevas
+DECK: Tuple[Card, ...] = tuple(decode_card(c) for c in range(52))
+IS_RED: Tuple[bool, ...] = tuple(SUITS[c // 13].color == "red" for c in range(52))
+
+# Destinos legales 52x52 como máscaras de bits: el bit ``t`` de
+# ``TABLEAU_ON[c]`` indica que ``c`` puede ir sobre ``t`` en el tableau
+# (rango siguiente y color opuesto); ``FOUNDATION_ON[c]`` lo mismo en la
+# fundación (mismo palo, rango anterior). El bit ``EMPTY`` representa la pila
+# vacía (sólo Reyes en el tableau, sólo Ases en la fundación).
+EMPTY = 52
+TABLEAU_ON: Tuple[int, ...] = tuple(
+    sum(1 << t for t in range(52) if RANK0[t] == RANK0[c] + 1 and IS_RED[t] != IS_RED[c])
+    | ((1 << EMPTY) if RANK0[c] == 12 else 0)
+    for c in range(52)
+)
+FOUNDATION_ON: Tuple[int, ...] = tuple(
+    (1 << EMPTY) if RANK0[c] == 0 else (1 << (c - 1))
+    for c in range(52)
+)
+
+
 class MoveType(str, Enum):
     DRAW = "draw"
     TABLEAU_TO_TABLEAU = "t2t"
@@ -0,0 +1,112 @@
+"""Reproducción de partidas desde la semilla y verificación anti-trampas.
+
+Una partida queda determinada por ``(seed, draw_count, mode)`` y su registro
+de acciones (``KlondikeGame.move_log``). ``replay`` vuelve a simular ese
+registro sobre un motor con historial compacto (tuplas de ``Card``, sin
+serializar a dicts) y ``verify`` compara el tablero resultante con un estado
+declarado por el cliente. El puntaje y los movimientos válidos son siempre los
+recalculados por ``Scoring`` durante la reproducción, nunca los declarados.
+
+No realiza I/O.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .klondike import KlondikeGame
+from .serializer import serialize_pile
+
+
+Move = Dict[str, Any]
+
+
+@dataclass
+class VerificationResult:
+    """Resultado de verificar un registro de movimientos.
+
+    - ``ok``: el registro es legal y (si se declaró) coincide con el estado
+    - ``reason``: motivo del rechazo (vacío si ``ok``)
+    - ``score``/``moves``: valores recalculados por la reproducción
+    - ``won``: si la reproducción termina en victoria
+    - ``state``: estado serializado reproducido (vacío si el registro es ilegal)
+    """
+
+    ok: bool
+    reason: str = ""
+    score: int = 0
+    moves: int = 0
+    won: bool = False
+    state: Dict[str, Any] = field(default_factory=dict)
+
+
+def replay(seed: int, draw_count: int, mode: str, log: Iterable[Move]) -> KlondikeGame:
+    """Reproduce ``log`` desde la semilla y retorna el motor resultante.
+
+    Lanza ``ValueError`` si alguna acción es ilegal o no produce cambios.
+    """
+
+    g = KlondikeGame(mode=mode, draw_count=draw_count, seed=seed, history="compact")
+    for i, mv in enumerate(log):
+        if not isinstance(mv, dict):
+            raise ValueError(f"Acción {i}: formato inválido")
+        t = mv.get("type")
+        try:
+            if t == "undo":
+                ok = g.undo()
+            elif t == "redo":
+                ok = g.redo()
+            elif t == "autoplay":
+                ok = g.autoplay(limit=int(mv.get("limit", 200))) > 0
+            elif t == "autocomplete":
+                ok = bool(g.autocomplete())
+            else:
+                ok = g.apply_move(mv)
+        except (ValueError, KeyError, TypeError, IndexError) as exc:
+            raise ValueError(f"Acción {i} ({t}) imposible: {exc}") from exc
+        if not ok:
+            raise ValueError(f"Acción {i} ({t}) imposible")
+    return g
+
+
+def _board(state: Dict[str, Any]) -> List[Any]:
+    """Piles del estado en forma comparable (ignora puntaje y tiempo)."""
+
+    return [
+        serialize_pile(state.get("stock") or []),
+        serialize_pile(state.get("waste") or []),
+        {k: serialize_pile(v) for k, v in (state.get("foundations") or {}).items()},
+        [serialize_pile(col) for col in (state.get("tableau") or [])],
+    ]
+
+
+def verify(
+    seed: int,
+    draw_count: int,
+    mode: str,
+    log: Iterable[Move],
+    claimed_state: Optional[Dict[str, Any]] = None,
+) -> VerificationResult:
+    """Verifica ``log`` y, opcionalmente, que termine en ``claimed_state``."""
+
+    try:
+        g = replay(seed, draw_count, mode, log)
+    except ValueError as exc:
+        return VerificationResult(ok=False, reason=str(exc))
+    state = g.serialized()
+    res = VerificationResult(
+        ok=True,
+        score=g.scoring.score,
+        moves=g.scoring.moves,
+        won=g.is_won(),
+        state=state,
+    )
+    if claimed_state is not None:
+        try:
+            same = _board(claimed_state) == _board(state)
+        except (AttributeError, TypeError):
+            same = False
+        if not same:
+            res.ok = False
+            res.reason = "El estado no coincide con la reproducción de la partida"
+    return res
@@ -0,0 +1,90 @@
+"""Núcleo de reglas de Klondike sobre la codificación compacta de cartas.
+
+Una carta es su código 0..51 (``models.encode_card``): ``code % 13`` es el
+rango empezando en 0 (As) y ``code // 13`` el índice del palo en ``SUITS``
+(los dos primeros palos son rojos). Las reglas son consultas a las tablas de
+destinos legales de ``models`` (``TABLEAU_ON``/``FOUNDATION_ON``), calculadas
+una vez al importar, sin construir enums ni dicts.
+
+La legalidad se define una sola vez aquí: ``KlondikeGame`` (pilas de
+``Card``), ``core.hints`` (estado serializado) y la búsqueda/simulación (motor
+en memoria) traducen sus pilas a códigos y usan estas funciones.
+
+Un tablero para ``legal_moves`` es la tupla ``Board``:
+``(cartas en mazo, cartas en descarte, tope del descarte, topes de fundación
+por palo, columnas)``, donde cada columna es ``(códigos, primera boca arriba)``
+(en Klondike las cartas boca abajo son siempre un prefijo de la columna).
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .models import EMPTY, FOUNDATION_ON, SUIT_INDEX, TABLEAU_ON
+
+
+Move = Dict[str, Any]
+Column = Tuple[Sequence[int], int]
+Board = Tuple[int, int, Optional[int], Sequence[Optional[int]], Sequence[Column]]
+
+
+def tableau_accepts(card: int, top: Optional[int]) -> bool:
+    """``card`` puede ir sobre ``top`` en el tableau (``None`` = vacía)."""
+
+    return TABLEAU_ON[card] >> (EMPTY if top is None else top) & 1 == 1
+
+
+def foundation_accepts(card: int, top: Optional[int]) -> bool:
+    """``card`` puede ir sobre ``top`` en su fundación (``None`` = vacía)."""
+
+    return FOUNDATION_ON[card] >> (EMPTY if top is None else top) & 1 == 1
+
+
+def chain_start(codes: Sequence[int], first_up: int) -> int:
+    """Primer índice desde el que ``codes`` es una cadena movible.
+
+    Las cadenas válidas descienden alternando color; se recorre desde el
+    tope hacia abajo sin pasar de ``first_up``. Retorna ``len(codes)`` si la
+    columna no tiene cartas boca arriba.
+    """
+
+    n = len(codes)
+    if first_up >= n:
+        return n
+    start = n - 1
+    while start > first_up and TABLEAU_ON[codes[start]] >> codes[start - 1] & 1:
+        start -= 1
+    return start
+
+
+def is_chain(codes: Sequence[int]) -> bool:
+    """True si ``codes`` desciende alternando color (todas boca arriba)."""
+
+    return chain_start(codes, 0) == 0 if codes else False
+
+
+def legal_moves(board: Board) -> List[Move]:
+    """Jugadas legales sin robo en el orden ``w2f``, ``t2f``, ``w2t``, ``t2t``."""
+
+    _, _, waste_top, ftops, tableau = board
+    # índice de bit del tope de cada pila (``EMPTY`` si está vacía)
+    tops = [codes[-1] if codes else EMPTY for codes, _ in tableau]
+    fbits = [EMPTY if t is None else t for t in ftops]
+    out: List[Move] = []
+    if waste_top is not None and FOUNDATION_ON[waste_top] >> fbits[SUIT_INDEX[waste_top]] & 1:
+        out.append({"type": "w2f"})
+    for i, (codes, first_up) in enumerate(tableau):
+        top = tops[i]
+        if top != EMPTY and first_up < len(codes) and FOUNDATION_ON[top] >> fbits[SUIT_INDEX[top]] & 1:
+            out.append({"type": "t2f", "from_col": i})
+    if waste_top is not None:
+        mask = TABLEAU_ON[waste_top]
+        for j, top in enumerate(tops):
+            if mask >> top & 1:
+                out.append({"type": "w2t", "to_col": j})
+    for i, (codes, first_up) in enumerate(tableau):
+        for start in range(chain_start(codes, first_up), len(codes)):
+            mask = TABLEAU_ON[codes[start]]
+            for j, top in enumerate(tops):
+                if j != i and mask >> top & 1:
+                    out.append({"type": "t2t", "from_col": i, "start_index": start, "to_col": j})
+    return out
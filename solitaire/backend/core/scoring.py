@@ -31,6 +31,10 @@ class Scoring:
         if self.start_ts == 0:
             self.start_ts = time.time()
 
+    def restart(self) -> None:
+        # para partidas repartidas de antemano: el tiempo corre desde la entrega
+        self.start_ts = time.time()
+
     def seconds(self) -> int:
         return int(time.time() - self.start_ts) if self.start_ts else 0
 
@@ -1,10 +1,18 @@
 ﻿"""SerializaciÃ³n del estado del juego a/desde estructuras JSON-friendly."""
 from __future__ import annotations
 
+import json
+from time import perf_counter
 from typing import Any, Dict, List
 
+from . import medicion
 from .models import Card, Suit, Rank
 
+try:  # codificador JSON rápido opcional
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None  # type: ignore[assignment]
+
 
 def serialize_pile(cards: List[Card]) -> List[dict]:
     """Serializa una pila que puede venir con ``Card`` o dicts ya serializados.
@@ -28,6 +36,8 @@ def deserialize_pile(data: List[dict]) -> List[Card]:
 def serialize_state(state: Dict[str, Any]) -> Dict[str, Any]:
     """Serialize the game state to a JSON-friendly dict."""
 
+    obs = medicion.observador
+    t0 = perf_counter() if obs is not None else 0.0
     out: Dict[str, Any] = {
         "mode": state["mode"],
         "draw_count": state["draw_count"],
@@ -39,7 +49,11 @@ def serialize_state(state: Dict[str, Any]) -> Dict[str, Any]:
         "moves": state["moves"],
         "seconds": state["seconds"],
         "won": bool(state.get("won", False)),
+        "stuck": bool(state.get("stuck", False)),
+        "stats": dict(state.get("stats") or {}),
     }
+    if obs is not None:
+        obs("serialize_state", perf_counter() - t0)
     return out
 
 
@@ -57,6 +71,19 @@ def deserialize_state(data: Dict[str, Any]) -> Dict[str, Any]:
         "moves": int(data.get("moves", 0)),
         "seconds": int(data.get("seconds", 0)),
         "won": bool(data.get("won", False)),
+        "stuck": bool(data.get("stuck", False)),
+        "stats": dict(data.get("stats") or {}),
     }
     return state
 
+
+def to_json_bytes(obj: Any) -> bytes:
+    """JSON compacto en UTF-8; usa ``orjson`` si está instalado.
+
+    La salida es equivalente a la de ``JSONResponse`` de FastAPI
+    (``ensure_ascii=False`` y sin espacios).
+    """
+
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
@@ -2,17 +2,17 @@
 
 Responsabilidades:
 - Representar una sesión de juego con su estado serializado y métricas.
-- Permitir crear una partida nueva desde un motor ``KlondikeGame``.
+- Permitir crear una partida nueva desde un motor ``KlondikeGame``
+  (``desde_juego`` reutiliza un motor ya construido).
 - Encapsular la semilla de barajado (sólo lectura) para reproducibilidad.
 - Sincronizar atributos (puntaje, movimientos, tiempo) desde el motor.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from ..core.klondike import KlondikeGame
-from ..core.serializer import serialize_state
 
 
 @dataclass
@@ -29,6 +29,8 @@ class Partida:
     - ``__semilla``: semilla privada de barajado (encapsulada)
     - ``draw_count``: 1 o 3
     - ``jugador``: nombre del jugador (opcional)
+    - ``registro``: acciones aplicadas (``KlondikeGame.move_log``) para
+      reproducir y verificar la partida desde la semilla
     """
 
     id: str
@@ -40,6 +42,7 @@ class Partida:
     draw_count: int = 1
     __semilla: int = field(default=0, repr=False, init=False)
     jugador: Optional[str] = None
+    registro: List[Dict[str, Any]] = field(default_factory=list)
 
     @property
     def semilla(self) -> int:
@@ -57,15 +60,21 @@ class Partida:
         jugador: Optional[str] = None,
     ) -> "Partida":
         juego = KlondikeGame(mode=modo, draw_count=draw_count, seed=seed)
-        estado = serialize_state(juego.to_state())
+        return cls.desde_juego(id, juego, jugador)
+
+    @classmethod
+    def desde_juego(cls, id: str, juego: KlondikeGame, jugador: Optional[str] = None) -> "Partida":
+        """Partida para un motor ya creado (sin volver a repartir)."""
+
+        estado = juego.serialized()
         p = cls(
             id=id,
-            modo=modo,
+            modo=juego.mode,
             puntaje=estado.get("score", 0),
             movimientos=estado.get("moves", 0),
             tiempo_segundos=estado.get("seconds", 0),
             estado_serializado=estado,
-            draw_count=draw_count,
+            draw_count=juego.draw_count,
             jugador=jugador,
         )
         # set private seed after init
@@ -75,8 +84,14 @@ class Partida:
     def actualizar_desde_juego(self, juego: KlondikeGame) -> None:
         """Sincroniza atributos desde el estado actual del juego."""
 
-        est = serialize_state(juego.to_state())
+        est = juego.serialized()
         self.estado_serializado = est
         self.puntaje = est["score"]
         self.movimientos = est["moves"]
         self.tiempo_segundos = est["seconds"]
+        # sólo las entradas nuevas: copiar el registro entero en cada jugada es O(n²)
+        log, n = juego.move_log, len(self.registro)
+        if len(log) < n:
+            self.registro = list(log)
+        else:
+            self.registro.extend(log[n:])
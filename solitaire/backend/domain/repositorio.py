@@ -2,19 +2,35 @@
 
 Características:
 - Estructura de almacenamiento: diccionario ``id -> partida`` en un JSON.
-- Operaciones atómicas a nivel de archivo (lectura y escritura completa).
+- El archivo se lee una sola vez (``cargar()``, o en la primera operación) y
+  se mantiene en memoria: las consultas no tocan el disco.
+- Cada cambio actualiza la memoria y reescribe el archivo completo
+  (write-through) bajo un lock, de modo que altas concurrentes en el mismo
+  proceso no se pisan. ``guardar()`` reescribe si quedó un cambio pendiente
+  (p. ej. tras un error de escritura); se llama al apagar la app.
+- El registro de movimientos de cada partida (``Partida.registro``) no va en
+  ese archivo sino en ``<nombre>-registros/<id>.jsonl``, una acción por
+  línea: al actualizar sólo se agregan las entradas nuevas, así que una
+  partida de n jugadas escribe O(n) bytes de registro en total y no O(n²).
+  La lista del registro se comparte con las ``Partida`` que entrega el
+  repositorio (``actualizar_desde_juego`` la extiende en el lugar); asignar
+  otra lista (p. ej. un ``PUT`` con otro log) reescribe el archivo.
 - Crea el archivo y directorios si no existen.
 
 Notas:
-- Este repositorio está pensado para un entorno académico/simple; no maneja
-  concurrencia entre procesos ni bloqueos de archivo.
+- Este repositorio está pensado para un entorno académico/simple: asume que
+  un solo proceso es dueño del archivo (no ve cambios externos) y no usa
+  bloqueos de archivo.
 """
 from __future__ import annotations
 
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from ..metrics import REPO_BYTES, REPO_SECONDS
 from .partida import Partida
 
 
@@ -23,52 +39,143 @@ class RepositorioPartidasJSON:
 
     def __init__(self, ruta_archivo: Path) -> None:
         self.ruta = ruta_archivo
-        self.ruta.parent.mkdir(parents=True, exist_ok=True)
-        if not self.ruta.exists():
-            self._guardar_todo({})
+        self._datos: Optional[Dict[str, dict]] = None
+        self._pendiente = False
+        # registro en memoria por id y cuántas de sus entradas ya están en disco
+        self._registros: Dict[str, List[Dict[str, Any]]] = {}
+        self._escritos: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def cargar(self) -> None:
+        """Lee el archivo a memoria (crea archivo y directorios si faltan)."""
+
+        with self._lock:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            if not self.ruta.exists():
+                self._guardar_todo({})
+            self._datos = self._leer_todo()
+
+    def guardar(self) -> None:
+        """Escribe el contenido en memoria si hay cambios sin persistir."""
+
+        with self._lock:
+            if self._pendiente and self._datos is not None:
+                self._persistir()
+
+    def _datos_en_memoria(self) -> Dict[str, dict]:
+        if self._datos is None:
+            self.cargar()
+        assert self._datos is not None
+        return self._datos
+
+    def _persistir(self) -> None:
+        assert self._datos is not None
+        self._pendiente = True
+        self._guardar_todo(self._datos)
+        self._pendiente = False
 
     def _leer_todo(self) -> Dict[str, dict]:
-        with self.ruta.open("r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = {}
+        t0 = time.perf_counter()
+        raw = self.ruta.read_bytes()
+        REPO_BYTES.labels("read").inc(len(raw))
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = {}
+        REPO_SECONDS.labels("read").observe(time.perf_counter() - t0)
         if not isinstance(data, dict):
             data = {}
         return data
 
     def _guardar_todo(self, data: Dict[str, dict]) -> None:
-        with self.ruta.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
+        t0 = time.perf_counter()
+        raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        self.ruta.write_bytes(raw)
+        REPO_BYTES.labels("write").inc(len(raw))
+        REPO_SECONDS.labels("write").observe(time.perf_counter() - t0)
+
+    # -------------------- Registro de movimientos --------------------
+    def _ruta_registro(self, id_: str) -> Path:
+        return self.ruta.parent / f"{self.ruta.stem}-registros" / f"{id_}.jsonl"
+
+    def _registro(self, id_: str, fila: dict) -> List[Dict[str, Any]]:
+        reg = self._registros.get(id_)
+        if reg is None:
+            try:
+                lines = self._ruta_registro(id_).read_bytes().splitlines()
+            except OSError:
+                # sin archivo: partida sin jugadas o formato anterior (en la fila)
+                reg, escritos = list(fila.get("registro") or []), 0
+            else:
+                reg = []
+                for line in lines:
+                    try:
+                        reg.append(json.loads(line))
+                    except ValueError:
+                        continue  # línea cortada por una caída
+                escritos = len(reg)
+            self._registros[id_], self._escritos[id_] = reg, escritos
+        return reg
+
+    def _guardar_registro(self, p: Partida) -> None:
+        reg, ruta = p.registro, self._ruta_registro(p.id)
+        if self._registros.get(p.id) is reg:
+            nuevas, modo = reg[self._escritos.get(p.id, 0):], "ab"
+        else:
+            nuevas, modo = reg, "wb"
+            self._registros[p.id] = reg
+        if nuevas:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            lineas = (json.dumps(e, ensure_ascii=False).encode("utf-8") + b"\n" for e in nuevas)
+            with ruta.open(modo) as f:
+                f.write(b"".join(lineas))
+        elif modo == "wb":
+            ruta.unlink(missing_ok=True)
+        self._escritos[p.id] = len(reg)
+
+    # -------------------- CRUD --------------------
     def crear(self, p: Partida) -> None:
-        data = self._leer_todo()
-        if p.id in data:
-            raise ValueError("Partida ya existe")
-        data[p.id] = self._to_dict(p)
-        self._guardar_todo(data)
+        with self._lock:
+            data = self._datos_en_memoria()
+            if p.id in data:
+                raise ValueError("Partida ya existe")
+            data[p.id] = self._to_dict(p)
+            self._persistir()
+            self._guardar_registro(p)
 
     def listar(self) -> List[Partida]:
-        data = self._leer_todo()
-        return [self._from_dict(v) for v in data.values()]
+        with self._lock:
+            return [self._con_registro(v) for v in self._datos_en_memoria().values()]
 
     def obtener(self, id_: str) -> Optional[Partida]:
-        data = self._leer_todo()
-        raw = data.get(id_)
-        return self._from_dict(raw) if raw else None
+        with self._lock:
+            raw = self._datos_en_memoria().get(id_)
+            return self._con_registro(raw) if raw else None
+
+    def _con_registro(self, raw: dict) -> Partida:
+        p = self._from_dict(raw)
+        assert p is not None
+        p.registro = self._registro(p.id, raw)
+        return p
 
     def actualizar(self, p: Partida) -> None:
-        data = self._leer_todo()
-        if p.id not in data:
-            raise ValueError("Partida inexistente")
-        data[p.id] = self._to_dict(p)
-        self._guardar_todo(data)
+        with self._lock:
+            data = self._datos_en_memoria()
+            if p.id not in data:
+                raise ValueError("Partida inexistente")
+            data[p.id] = self._to_dict(p)
+            self._persistir()
+            self._guardar_registro(p)
 
     def eliminar(self, id_: str) -> None:
-        data = self._leer_todo()
-        if id_ in data:
-            del data[id_]
-            self._guardar_todo(data)
+        with self._lock:
+            data = self._datos_en_memoria()
+            if id_ in data:
+                del data[id_]
+                self._persistir()
+            self._registros.pop(id_, None)
+            self._escritos.pop(id_, None)
+            self._ruta_registro(id_).unlink(missing_ok=True)
 
     @staticmethod
     def _to_dict(p: Partida) -> dict:
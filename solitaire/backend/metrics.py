@@ -0,0 +1,273 @@
+"""Registro de métricas en formato de exposición de Prometheus.
+
+- ``Counter`` y ``Histogram`` mínimos, con etiquetas opcionales
+  (``metric.labels("POST", "/api/game/move")`` retorna el hijo, cacheado).
+- Registrar una muestra es una búsqueda binaria en los límites de los buckets
+  y dos sumas (~0.2 µs); sin locks: bajo concurrencia extrema se puede perder
+  alguna muestra, aceptable para métricas y mucho más barato que bloquear.
+- ``MetricsMiddleware`` cuenta requests y su latencia por ruta (la plantilla
+  de la ruta, no la URL, para acotar la cardinalidad).
+- ``REGISTRY.render()`` produce el texto servido en ``/metrics``.
+
+Las métricas internas se declaran aquí. Repositorio y scoreboard las
+registran con ``perf_counter`` explícito alrededor de la sección medida; el
+núcleo del motor no importa este módulo sino que avisa a
+``core.medicion.observador``, al que este módulo se suscribe al importarse.
+"""
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .core import medicion
+
+# Latencias en segundos: de 50 µs a 2.5 s
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+def _fmt(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # el último es +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        if not self.labelnames:
+            self._default = self._child(())
+
+    @abstractmethod
+    def _new(self) -> Any:
+        """Hijo nuevo (valores de una combinación de etiquetas)."""
+
+    def _child(self, key: Tuple[str, ...]) -> Any:
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new()
+        return child
+
+    def _sin_etiquetas(self) -> Any:
+        try:
+            return self._default
+        except AttributeError:
+            raise ValueError(
+                f"{self.name}: tiene etiquetas {self.labelnames}; usar .labels(...)"
+            ) from None
+
+    def labels(self, *values: str) -> Any:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: se esperaban etiquetas {self.labelnames}")
+        return self._child(values)
+
+    @abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Líneas de exposición de cada hijo."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._sin_etiquetas().value += amount
+
+    def samples(self) -> Iterable[str]:
+        for key, child in sorted(self._children.items()):
+            yield f"{self.name}{_labels(self.labelnames, key)} {_fmt(child.value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new(self) -> _HistogramChild:
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        d = self._sin_etiquetas()
+        d.counts[bisect_left(d.bounds, value)] += 1
+        d.sum += value
+
+    def samples(self) -> Iterable[str]:
+        for key, child in sorted(self._children.items()):
+            acc = 0
+            for bound, n in zip((*self.bounds, float("inf")), child.counts):
+                acc += n
+                le = 'le="{}"'.format("+Inf" if bound == float("inf") else _fmt(bound))
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {acc}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(child.sum)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {acc}"
+
+
+class Registry:
+    """Conjunto de métricas con nombre único, en orden de registro."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "solitaire_http_requests_total", "Requests HTTP atendidos.", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "solitaire_http_request_seconds", "Latencia de requests HTTP.", ("method", "route")
+)
+APPLY_MOVE_SECONDS = REGISTRY.histogram(
+    "solitaire_apply_move_seconds", "Duración de KlondikeGame.apply_move (partidas con historial)."
+)
+SNAPSHOT_SECONDS = REGISTRY.histogram(
+    "solitaire_undo_snapshot_seconds", "Duración del snapshot para deshacer."
+)
+SERIALIZE_SECONDS = REGISTRY.histogram(
+    "solitaire_serialize_state_seconds", "Duración de serialize_state."
+)
+REPO_SECONDS = REGISTRY.histogram(
+    "solitaire_repo_io_seconds", "Lectura/escritura del archivo de partidas.", ("op",)
+)
+REPO_BYTES = REGISTRY.counter(
+    "solitaire_repo_io_bytes_total", "Bytes leídos/escritos del archivo de partidas.", ("op",)
+)
+HINT_SECONDS = REGISTRY.histogram("solitaire_hint_seconds", "Duración del cálculo de pistas.")
+SCOREBOARD_SORT_SECONDS = REGISTRY.histogram(
+    "solitaire_scoreboard_sort_seconds", "Duración de ScoreboardService.sorted_entries."
+)
+
+# Tiempos del núcleo (``core.medicion``): nombre de la sección -> histograma
+_CORE_SECONDS: Dict[str, Histogram] = {
+    "apply_move": APPLY_MOVE_SECONDS,
+    "undo_snapshot": SNAPSHOT_SECONDS,
+    "serialize_state": SERIALIZE_SECONDS,
+    "hint": HINT_SECONDS,
+}
+
+
+def _observar_core(nombre: str, segundos: float) -> None:
+    _CORE_SECONDS[nombre].observe(segundos)
+
+
+medicion.suscribir(_observar_core)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: requests y latencia por (método, plantilla de ruta)."""
+
+    def __init__(self, app: Callable[..., Any]) -> None:
+        self.app = app
+        self._routes: Dict[Any, str] = {}
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "<unmatched>"
+        path = self._routes.get(endpoint)
+        if path is None:
+            app = scope.get("app")
+            for r in getattr(app, "routes", ()):
+                target = getattr(r, "endpoint", None) or getattr(r, "app", None)
+                if target is not None:
+                    self._routes.setdefault(target, r.path)
+            path = self._routes.setdefault(endpoint, getattr(endpoint, "__name__", "<unknown>"))
+        return path
+
+    async def __call__(
+        self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status: List[Optional[int]] = [None]
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = self._route(scope)
+            HTTP_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - t0)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status[0] or 500)).inc()
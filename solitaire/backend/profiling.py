@@ -0,0 +1,176 @@
+"""Perfilado opcional por request y ``Server-Timing`` por fase.
+
+Se activa con la variable de entorno ``SOLITAIRE_PROFILE``:
+
+- ``off`` (por defecto): sin costo más allá de una consulta a un ``ContextVar``;
+- ``header``: sólo los requests con ``X-Profile: 1``;
+- ``all``: todos los requests.
+
+En cada request seleccionado:
+
+- las rutas síncronas (``RutaPerfilable``) corren bajo ``cProfile`` en el hilo
+  del pool donde se ejecutan, y el resultado se guarda como ``.prof`` (abrir
+  con ``python -m pstats`` o ``snakeviz``) en ``SOLITAIRE_PROFILE_DIR``
+  (por defecto ``data/profiles``), conservando los ``SOLITAIRE_PROFILE_KEEP``
+  más recientes (50);
+- la respuesta lleva ``Server-Timing`` con el tiempo de cada fase marcada con
+  ``fase()`` (``engine``, ``serialize``, ``persist``, ``encode``) y el total,
+  y ``X-Profile-File`` con el nombre del archivo generado.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import itertools
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from fastapi.routing import APIRoute
+
+
+MODES = ("off", "header", "all")
+DEFAULT_DIR = Path(__file__).resolve().parents[1] / "data" / "profiles"
+
+
+class _Sesion:
+    """Request perfilado en curso: perfilador y milisegundos por fase."""
+
+    __slots__ = ("profiler", "fases")
+
+    def __init__(self) -> None:
+        self.profiler: Optional[cProfile.Profile] = None
+        self.fases: Dict[str, float] = {}
+
+
+_ACTIVE: ContextVar[Optional[_Sesion]] = ContextVar("solitaire_profile", default=None)
+
+
+@contextmanager
+def fase(nombre: str) -> Iterator[None]:
+    """Acumula la duración del bloque en la fase ``nombre`` del request perfilado."""
+
+    sesion = _ACTIVE.get()
+    if sesion is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        sesion.fases[nombre] = sesion.fases.get(nombre, 0.0) + (time.perf_counter() - t0) * 1e3
+
+
+def perfilar(call: Callable[..., Any]) -> Callable[..., Any]:
+    """Envuelve un endpoint síncrono para correrlo bajo ``cProfile`` si corresponde."""
+
+    @functools.wraps(call)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        sesion = _ACTIVE.get()
+        if sesion is None or sesion.profiler is not None:
+            return call(*args, **kwargs)
+        sesion.profiler = prof = cProfile.Profile()
+        prof.enable()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            prof.disable()
+
+    wrapper._perfilado = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class RutaPerfilable(APIRoute):
+    """``APIRoute`` cuyo endpoint síncrono puede perfilarse en su hilo.
+
+    ``cProfile`` sólo observa el hilo en el que se habilita, y FastAPI corre
+    las rutas síncronas en un pool de hilos: por eso se envuelve la llamada
+    (``dependant.call``) y no el middleware.
+    """
+
+    def get_route_handler(self) -> Callable[..., Any]:
+        call = self.dependant.call
+        if call is not None and not inspect.iscoroutinefunction(call) and not getattr(call, "_perfilado", False):
+            self.dependant.call = perfilar(call)
+        return super().get_route_handler()
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI que abre una ``_Sesion`` para los requests seleccionados."""
+
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        mode: Optional[str] = None,
+        directory: Optional[Path] = None,
+        keep: Optional[int] = None,
+    ) -> None:
+        self.app = app
+        self.mode = (mode or os.environ.get("SOLITAIRE_PROFILE") or "off").lower()
+        if self.mode not in MODES:
+            raise ValueError(f"SOLITAIRE_PROFILE debe ser uno de {MODES}")
+        self.directory = Path(directory or os.environ.get("SOLITAIRE_PROFILE_DIR") or DEFAULT_DIR)
+        self.keep = int(keep if keep is not None else os.environ.get("SOLITAIRE_PROFILE_KEEP", 50))
+        self._seq = itertools.count()
+
+    def _selected(self, scope: Dict[str, Any]) -> bool:
+        if self.mode == "all":
+            return True
+        if self.mode == "header":
+            return any(k == b"x-profile" and v.strip() in (b"1", b"true") for k, v in scope.get("headers", ()))
+        return False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if scope["type"] != "http" or self.mode == "off" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+        sesion = _Sesion()
+        token = _ACTIVE.set(sesion)
+        t0 = time.perf_counter()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - t0) * 1e3
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(sesion.fases, total).encode("latin-1")))
+                name = self._dump(sesion, scope)
+                if name:
+                    headers.append((b"x-profile-file", name.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _ACTIVE.reset(token)
+
+    def _dump(self, sesion: _Sesion, scope: Dict[str, Any]) -> Optional[str]:
+        if sesion.profiler is None:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^\w]+", "_", scope.get("path", "")).strip("_") or "root"
+        name = f"{time.time_ns() // 1_000_000}-{next(self._seq):04d}-{scope['method']}-{slug}.prof"
+        sesion.profiler.dump_stats(str(self.directory / name))
+        self._rotate()
+        return name
+
+    def _rotate(self) -> None:
+        files: List[Path] = sorted(self.directory.glob("*.prof"))
+        for old in files[: max(0, len(files) - self.keep)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def server_timing(fases: Dict[str, float], total_ms: float) -> str:
+    """Valor de ``Server-Timing`` (milisegundos) para las fases y el total."""
+
+    parts = [f"{k};dur={v:.3f}" for k, v in fases.items()]
+    parts.append(f"total;dur={total_ms:.3f}")
+    return ", ".join(parts)
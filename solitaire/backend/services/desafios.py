@@ -0,0 +1,287 @@
+"""Desafío diario y torneos: un mismo reparto para todos los jugadores.
+
+- Un ``Desafio`` fija ``(semilla, draw, modo)``. El diario tiene id
+  ``daily-AAAA-MM-DD-d<draw>`` y su semilla se deriva de la fecha (igual en
+  cualquier proceso); un torneo (``crear``) usa una semilla pedida o al azar.
+  Los desafíos se guardan en ``challenges.json`` (reemplazo atómico; sólo se
+  escribe al crear uno).
+- El reparto inicial se construye una sola vez por desafío
+  (``KlondikeGame.fast``) y cada sesión es un ``fork``: copia las pilas y
+  comparte el estado inicial ya serializado y codificado. Un pico de
+  inicios simultáneos no vuelve a barajar ni a serializar.
+- Las sesiones viven en memoria (las ``max_sesiones`` usadas más
+  recientemente), con historial ``compact`` para acotar su tamaño, y no
+  pasan por ``saves.json``.
+- Al ganar, la partida se verifica reproduciendo su registro y el resultado
+  entra al ranking del desafío: mejor resultado por jugador, ordenado por
+  ``(-score, seconds, moves, ts)`` con ``bisect`` (inserción y posición en
+  O(log n) + desplazamiento de la lista). Cada resultado se agrega como una
+  línea a ``challenges/<id>.jsonl``, que se relee al cargar el desafío.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.klondike import KlondikeGame
+from ..core.replay import verify
+from ..core.serializer import to_json_bytes
+
+Clave = Tuple[int, int, int, float]
+
+
+@dataclass(frozen=True)
+class Resultado:
+    jugador: str
+    score: int
+    moves: int
+    seconds: int
+    ts: float
+
+    @property
+    def clave(self) -> Clave:
+        return (-self.score, self.seconds, self.moves, self.ts)
+
+
+@dataclass
+class Desafio:
+    """Reparto compartido de un desafío y su ranking."""
+
+    id: str
+    semilla: int
+    draw: int
+    modo: str = "standard"
+    fecha: Optional[str] = None
+    plantilla: Optional[KlondikeGame] = field(default=None, repr=False)
+    _claves: List[Clave] = field(default_factory=list, repr=False)
+    _filas: List[Resultado] = field(default_factory=list, repr=False)
+    _mejor: Dict[str, Resultado] = field(default_factory=dict, repr=False)
+
+    def registrar(self, r: Resultado) -> bool:
+        """Agrega ``r`` al ranking si mejora el del jugador (True si entró)."""
+
+        prev = self._mejor.get(r.jugador)
+        if prev is not None:
+            if prev.clave <= r.clave:
+                return False
+            i = bisect_left(self._claves, prev.clave)
+            del self._claves[i], self._filas[i]
+        i = bisect_left(self._claves, r.clave)
+        self._claves.insert(i, r.clave)
+        self._filas.insert(i, r)
+        self._mejor[r.jugador] = r
+        return True
+
+    def posicion(self, jugador: str) -> Optional[int]:
+        """Puesto (desde 1) del jugador en el ranking."""
+
+        r = self._mejor.get(jugador)
+        return None if r is None else bisect_left(self._claves, r.clave) + 1
+
+    def ranking(self, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        return [
+            {"rank": offset + i + 1, **asdict(r)}
+            for i, r in enumerate(self._filas[offset:offset + limit])
+        ]
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "draw": self.draw,
+            "mode": self.modo,
+            "date": self.fecha,
+            "players": len(self),
+        }
+
+
+@dataclass
+class SesionDesafio:
+    id: str
+    desafio: Desafio
+    jugador: str
+    juego: KlondikeGame
+    terminada: bool = False
+
+
+def semilla_diaria(fecha: date, draw: int) -> int:
+    """Semilla del desafío diario (determinística por fecha y draw)."""
+
+    digest = hashlib.sha256(f"daily:{fecha.isoformat()}:{draw}".encode("ascii")).digest()
+    return int.from_bytes(digest[:4], "big") % (1 << 30) or 1
+
+
+class ServicioDesafios:
+    """Desafíos (diarios y torneos), sus sesiones en memoria y rankings."""
+
+    def __init__(self, directorio: Path, max_sesiones: int = 10_000) -> None:
+        self.directorio = directorio
+        self.max_sesiones = max_sesiones
+        self._meta: Optional[Dict[str, Dict[str, Any]]] = None
+        self._desafios: Dict[str, Desafio] = {}
+        self._sesiones: "OrderedDict[str, SesionDesafio]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # -------------------- Desafíos --------------------
+    def diario(self, draw: int = 1, fecha: Optional[date] = None) -> Desafio:
+        if draw not in (1, 3):
+            raise ValueError("draw_count debe ser 1 o 3")
+        fecha = fecha or datetime.now(timezone.utc).date()
+        did = f"daily-{fecha.isoformat()}-d{draw}"
+        with self._lock:
+            if did in self._metadatos():
+                return self.obtener(did)
+            d = Desafio(did, semilla_diaria(fecha, draw), draw, fecha=fecha.isoformat())
+            return self._alta(d)
+
+    def crear(self, draw: int = 1, seed: Optional[int] = None, modo: str = "standard") -> Desafio:
+        """Torneo nuevo con la semilla pedida (o una al azar)."""
+
+        if draw not in (1, 3):
+            raise ValueError("draw_count debe ser 1 o 3")
+        if modo not in ("standard", "vegas"):
+            # el motor tomaría cualquier otro como "standard" sin avisar
+            raise ValueError("mode debe ser 'standard' o 'vegas'")
+        if seed is not None and seed < 1:
+            # la verificación reproduce con ``KlondikeGame(seed=...)``, que toma 0 como "al azar"
+            raise ValueError("seed debe ser un entero positivo")
+        did = f"t-{uuid.uuid4().hex[:12]}"
+        semilla = int(seed) if seed is not None else random.randrange(1, 1 << 30)
+        with self._lock:
+            return self._alta(Desafio(did, semilla, draw, modo))
+
+    def obtener(self, did: str) -> Desafio:
+        d = self._desafios.get(did)
+        if d is not None:
+            return d
+        with self._lock:
+            d = self._desafios.get(did)
+            if d is None:
+                meta = self._metadatos().get(did)
+                if meta is None:
+                    raise KeyError(did)
+                d = Desafio(
+                    did, meta["seed"], meta["draw"], meta.get("mode", "standard"), meta.get("date")
+                )
+                self._cargar_resultados(d)
+                self._desafios[did] = d
+        return d
+
+    def _alta(self, d: Desafio) -> Desafio:
+        meta = self._metadatos()
+        meta[d.id] = {
+            "seed": d.semilla,
+            "draw": d.draw,
+            "mode": d.modo,
+            "date": d.fecha,
+            "created": time.time(),
+        }
+        self._guardar_metadatos(meta)
+        self._desafios[d.id] = d
+        return d
+
+    def plantilla(self, d: Desafio) -> KlondikeGame:
+        """Reparto inicial del desafío, construido una vez y compartido."""
+
+        if d.plantilla is None:
+            with self._lock:
+                if d.plantilla is None:
+                    g = KlondikeGame.fast(d.semilla, d.draw, d.modo)
+                    g.serialized_json()
+                    d.plantilla = g
+        return d.plantilla
+
+    # -------------------- Sesiones --------------------
+    def iniciar(self, did: str, jugador: str) -> SesionDesafio:
+        d = self.obtener(did)
+        g = self.plantilla(d).fork(history="compact")
+        s = SesionDesafio(str(uuid.uuid4()), d, jugador, g)
+        with self._lock:
+            self._sesiones[s.id] = s
+            while len(self._sesiones) > self.max_sesiones:
+                self._sesiones.popitem(last=False)
+        return s
+
+    def sesion(self, sid: str) -> SesionDesafio:
+        with self._lock:
+            s = self._sesiones[sid]
+            self._sesiones.move_to_end(sid)
+        return s
+
+    def terminar_si_gano(self, s: SesionDesafio) -> bool:
+        """Si la sesión ganó, verifica el registro y la suma al ranking."""
+
+        g = s.juego
+        if s.terminada or not g.is_won():
+            return False
+        res = verify(g.seed, g.draw_count, g.mode, g.move_log)
+        if not (res.ok and res.won):
+            return False
+        s.terminada = True
+        r = Resultado(s.jugador, res.score, res.moves, g.scoring.seconds(), time.time())
+        with self._lock:
+            if s.desafio.registrar(r):
+                self._agregar_resultado(s.desafio, r)
+        return True
+
+    # -------------------- Persistencia --------------------
+    @property
+    def _ruta_meta(self) -> Path:
+        return self.directorio / "challenges.json"
+
+    def _ruta_resultados(self, did: str) -> Path:
+        return self.directorio / "challenges" / f"{did}.jsonl"
+
+    def _metadatos(self) -> Dict[str, Dict[str, Any]]:
+        if self._meta is None:
+            try:
+                data = json.loads(self._ruta_meta.read_bytes())
+            except (OSError, ValueError):
+                data = {}
+            self._meta = data if isinstance(data, dict) else {}
+        return self._meta
+
+    def _guardar_metadatos(self, meta: Dict[str, Dict[str, Any]]) -> None:
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".challenges.", dir=self.directorio)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(to_json_bytes(meta))
+            os.replace(tmp, self._ruta_meta)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _agregar_resultado(self, d: Desafio, r: Resultado) -> None:
+        ruta = self._ruta_resultados(d.id)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with ruta.open("ab") as f:
+            f.write(to_json_bytes(asdict(r)) + b"\n")
+
+    def _cargar_resultados(self, d: Desafio) -> None:
+        try:
+            lines = self._ruta_resultados(d.id).read_bytes().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                d.registrar(Resultado(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue
@@ -0,0 +1,151 @@
+"""Eventos de jugada estructurados hacia un log JSONL rotativo.
+
+El motor notifica cada acción aceptada a su ``oyente`` (``KlondikeGame``);
+``BusEventos.oyente(game_id)`` arma ese callback: construye un
+``EventoJugada`` y lo deja en una ``ColaAcotadaTAD`` sin bloquear. Si la cola
+está llena el evento se descarta y se cuenta en ``descartados``: una jugada
+nunca espera al log.
+
+Un hilo consumidor (daemon, iniciado con el primer evento) retira lotes de
+hasta ``lote`` eventos y los agrega como una línea JSON cada uno a ``ruta``.
+Cuando el archivo supera ``max_bytes`` se rota a ``ruta.1`` … ``ruta.N``
+(``respaldos``). ``cerrar()`` vacía la cola y detiene el hilo; mientras el
+hilo corre hay un único ``atexit`` que lo cierra al salir del intérprete y que
+``cerrar()`` quita (un bus cerrado a mano no queda referenciado por ``atexit``).
+
+Formato de cada línea: ``{"game_id", "seq", "move", "score_delta",
+"duration_us", "ts"}``; ``move`` es la entrada de ``move_log`` (reproducible
+con ``core.replay``).
+"""
+from __future__ import annotations
+
+import atexit
+import itertools
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ...tads.cola import ColaAcotadaTAD
+from ..core.serializer import to_json_bytes
+
+
+@dataclass(frozen=True)
+class EventoJugada:
+    game_id: str
+    seq: int
+    move: Dict[str, Any]
+    score_delta: int
+    duration_us: float
+    ts: float
+
+
+class BusEventos:
+    """Cola acotada de ``EventoJugada`` con un consumidor que escribe JSONL."""
+
+    def __init__(
+        self,
+        ruta: Path,
+        capacidad: int = 10_000,
+        lote: int = 256,
+        intervalo: float = 0.5,
+        max_bytes: int = 8 << 20,
+        respaldos: int = 5,
+    ) -> None:
+        self.ruta = ruta
+        self.lote = lote
+        self.intervalo = intervalo
+        self.max_bytes = max_bytes
+        self.respaldos = respaldos
+        self.publicados = 0
+        self.descartados = 0
+        self.escritos = 0
+        self._cola: ColaAcotadaTAD[EventoJugada] = ColaAcotadaTAD(capacidad)
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._atexit = False
+
+    # -------------------- Productor --------------------
+    def oyente(self, game_id: str) -> Callable[[Dict[str, Any], int, float], None]:
+        """Callback para ``KlondikeGame.oyente`` que publica con ``game_id``."""
+
+        seq = itertools.count(1)
+
+        def publicar(move: Dict[str, Any], score_delta: int, segundos: float) -> None:
+            self.publicar(EventoJugada(game_id, next(seq), move, score_delta, round(segundos * 1e6, 1), time.time()))
+
+        return publicar
+
+    def publicar(self, evento: EventoJugada) -> bool:
+        """Encola sin bloquear; False si se descartó por cola llena."""
+
+        if self._hilo is None:
+            self._iniciar()
+        if self._cola.intentar_encolar(evento):
+            self.publicados += 1
+            return True
+        self.descartados += 1
+        return False
+
+    # -------------------- Consumidor --------------------
+    def _iniciar(self) -> None:
+        with self._lock:
+            if self._hilo is not None:
+                return
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self._consumir, name="bus-eventos", daemon=True)
+            self._hilo.start()
+            if not self._atexit:
+                atexit.register(self._al_salir)
+                self._atexit = True
+
+    def _consumir(self) -> None:
+        while not self._parar.is_set():
+            lote = self._cola.desencolar_lote(self.lote, self.intervalo)
+            if lote:
+                self._escribir(lote)
+        # vaciar lo que quedó al cerrar
+        while True:
+            lote = self._cola.desencolar_lote(self.lote, 0)
+            if not lote:
+                break
+            self._escribir(lote)
+
+    def _escribir(self, lote: List[EventoJugada]) -> None:
+        data = b"".join(to_json_bytes(asdict(ev)) + b"\n" for ev in lote)
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self.ruta.open("ab") as f:
+            f.write(data)
+            size = f.tell()
+        self.escritos += len(lote)
+        if size >= self.max_bytes:
+            self._rotar()
+
+    def _rotar(self) -> None:
+        for i in range(self.respaldos - 1, 0, -1):
+            src = self.ruta.with_name(f"{self.ruta.name}.{i}")
+            if src.exists():
+                src.replace(self.ruta.with_name(f"{self.ruta.name}.{i + 1}"))
+        if self.respaldos > 0:
+            self.ruta.replace(self.ruta.with_name(f"{self.ruta.name}.1"))
+        else:
+            self.ruta.unlink()
+
+    def _al_salir(self) -> None:
+        self._atexit = False
+        self.cerrar()
+
+    def cerrar(self, timeout: float = 5.0) -> None:
+        """Escribe los eventos pendientes y detiene el consumidor."""
+
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+            if self._atexit:
+                atexit.unregister(self._al_salir)
+                self._atexit = False
+        if hilo is None:
+            return
+        self._parar.set()
+        hilo.join(timeout)
@@ -1,45 +1,152 @@
 """Servicio de perfiles de usuario (simple, basado en JSON).
 
 Gestiona preferencias básicas por usuario (p. ej., idioma, alto contraste,
-nombre validado) en un archivo JSON. Validaciones mínimas y sin concurrencia.
+nombre validado) en un archivo JSON ``usuario -> {clave: valor}``.
+
+Caché en memoria:
+
+- el archivo se lee una vez y las lecturas salen de un dict; cada
+  ``recarga`` segundos (1 s) una consulta compara el ``mtime`` del archivo y,
+  si otro proceso lo cambió, lo vuelve a leer conservando los cambios propios
+  aún no escritos;
+- ``set_preferencia`` modifica la memoria y programa una escritura: las que
+  llegan dentro de ``demora`` segundos (0.5 s) se agrupan en una sola;
+  ``demora=0`` escribe en el momento;
+- cada escritura va a un temporal en el mismo directorio y se publica con
+  ``os.replace`` (nunca queda un archivo a medio escribir);
+- ``guardar()`` escribe lo pendiente ya; ``cerrar()`` además cancela la
+  escritura programada (se registra en ``atexit`` con la primera).
+
+El JSON se escribe compacto (``serializer.to_json_bytes``, ``orjson`` si
+está instalado).
 """
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import re
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Optional, Set
+
+from ..core.serializer import to_json_bytes
+
+# letras, espacios y guiones, 2-32 chars
+_NOMBRE_RE = re.compile(r"[A-Za-zÀ-ÿ\- ]{2,32}")
 
 
 class ServicioPerfiles:
-    """Persistencia simple de preferencias de usuario."""
+    """Preferencias de usuario en memoria con escritura diferida al JSON."""
 
-    def __init__(self, ruta: Path) -> None:
+    def __init__(self, ruta: Path, demora: float = 0.5, recarga: float = 1.0) -> None:
         self.ruta = ruta
-        self.ruta.parent.mkdir(parents=True, exist_ok=True)
-        if not self.ruta.exists():
-            self._guardar({})
+        self.demora = demora
+        self.recarga = recarga
+        self.escrituras = 0
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pendientes: Set[str] = set()
+        self._mtime_ns = 0
+        self._proxima_revision = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._en_atexit = False
+
+    # -------------------- Lectura --------------------
+    def cargar(self) -> None:
+        """Lee el archivo a memoria (lo crea si falta)."""
 
-    def _leer(self) -> Dict:
+        with self._lock:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            if not self.ruta.exists():
+                if self._data is None:
+                    self._data = {}
+                self._escribir()
+            nuevo = self._leer()
+            if self._data is not None:
+                # cambios propios todavía no escritos ganan sobre el archivo
+                for usuario in self._pendientes:
+                    if usuario in self._data:
+                        nuevo[usuario] = self._data[usuario]
+            self._data = nuevo
+            self._proxima_revision = time.monotonic() + self.recarga
+
+    def _leer(self) -> Dict[str, Dict[str, Any]]:
         try:
-            return json.loads(self.ruta.read_text("utf-8"))
+            self._mtime_ns = self.ruta.stat().st_mtime_ns
+            data = json.loads(self.ruta.read_bytes())
         except Exception:
             return {}
+        return data if isinstance(data, dict) else {}
 
-    def _guardar(self, data: Dict) -> None:
-        self.ruta.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    def _datos(self) -> Dict[str, Dict[str, Any]]:
+        if self._data is None:
+            self.cargar()
+        elif time.monotonic() >= self._proxima_revision:
+            self._proxima_revision = time.monotonic() + self.recarga
+            try:
+                cambiado = self.ruta.stat().st_mtime_ns != self._mtime_ns
+            except OSError:
+                cambiado = False
+            if cambiado:
+                self.cargar()
+        assert self._data is not None
+        return self._data
 
+    def get_prefs(self, usuario: str) -> Dict:
+        with self._lock:
+            return dict(self._datos().get(usuario, {}))
+
+    # -------------------- Escritura --------------------
     def set_preferencia(self, usuario: str, clave: str, valor) -> None:
         if clave == "nombre":
-            # validar con regex: letras, espacios y guiones, 2-32 chars
-            if not re.fullmatch(r"[A-Za-zÀ-ÿ\- ]{2,32}", str(valor)):
+            if not _NOMBRE_RE.fullmatch(str(valor)):
                 raise ValueError("Nombre inválido")
-        data = self._leer()
-        prefs = data.get(usuario, {})
-        prefs[clave] = valor
-        data[usuario] = prefs
-        self._guardar(data)
+        with self._lock:
+            data = self._datos()
+            data[usuario] = {**data.get(usuario, {}), clave: valor}
+            self._pendientes.add(usuario)
+            if self.demora <= 0:
+                self._escribir()
+            elif self._timer is None:
+                if not self._en_atexit:
+                    atexit.register(self.cerrar)
+                    self._en_atexit = True
+                self._timer = threading.Timer(self.demora, self.guardar)
+                self._timer.daemon = True
+                self._timer.start()
 
-    def get_prefs(self, usuario: str) -> Dict:
-        data = self._leer()
-        return data.get(usuario, {})
+    def guardar(self) -> None:
+        """Escribe ya los cambios pendientes (si los hay)."""
+
+        with self._lock:
+            self._timer = None
+            if self._pendientes:
+                self._escribir()
+
+    def cerrar(self) -> None:
+        """Cancela la escritura programada y escribe lo pendiente."""
+
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self.guardar()
+
+    def _escribir(self) -> None:
+        raw = to_json_bytes(self._data or {})
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.ruta.name}.", dir=self.ruta.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, self.ruta)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self._mtime_ns = self.ruta.stat().st_mtime_ns
+        self._pendientes.clear()
+        self.escrituras += 1
@@ -0,0 +1,128 @@
+"""Partidas pre-repartidas para ``POST /api/game/new``.
+
+Crear un ``KlondikeGame`` baraja, reparte, serializa el estado inicial y lo
+guarda como primer snapshot de deshacer. ``PoolPartidas`` lo hace de
+antemano: mantiene hasta ``tamano`` partidas listas por cada combinación
+``(modo, draw)`` válida, con el estado ya serializado y codificado
+(``serialized_json``) y la dificultad del reparto calculada (caché de
+``difficulty.level``).
+
+- ``tomar(modo, draw)`` saca una partida en O(1) (``deque.popleft``), pone su
+  temporizador en cero y pide reponer; si la reserva está vacía construye
+  una en el momento (``fallos``).
+- Un hilo daemon (iniciado con la primera partida tomada) repone las
+  reservas; ``llenar()`` las completa de forma síncrona (arranque de la app)
+  y ``cerrar()`` detiene el hilo.
+
+Sólo se usan para repartos aleatorios: con semilla pedida (o dificultad) la
+ruta construye la partida directamente.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from ..core.difficulty import level as difficulty_level
+from ..core.klondike import KlondikeGame
+
+
+CLAVES: Tuple[Tuple[str, int], ...] = (
+    ("standard", 1), ("standard", 3), ("vegas", 1), ("vegas", 3),
+)
+
+
+class PoolPartidas:
+    """Reservas de ``KlondikeGame`` listos por ``(modo, draw)``."""
+
+    def __init__(self, tamano: int = 4) -> None:
+        self.tamano = tamano
+        self.aciertos = 0
+        self.fallos = 0
+        self._reservas: Dict[Tuple[str, int], Deque[KlondikeGame]] = {c: deque() for c in CLAVES}
+        # partidas en preparación por reserva (cuentan para el faltante)
+        self._preparando: Dict[Tuple[str, int], int] = {c: 0 for c in CLAVES}
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._faltan = threading.Event()
+        self._parar = threading.Event()
+
+    def disponibles(self, modo: str, draw: int) -> int:
+        reserva = self._reservas.get((modo, draw))
+        return len(reserva) if reserva is not None else 0
+
+    def tomar(self, modo: str, draw: int) -> KlondikeGame:
+        """Partida nueva con reparto aleatorio (de la reserva si hay)."""
+
+        reserva = self._reservas.get((modo, draw))
+        if reserva is None or self.tamano <= 0:
+            return KlondikeGame(mode=modo, draw_count=draw)
+        try:
+            g = reserva.popleft()
+        except IndexError:
+            self.fallos += 1
+            g = KlondikeGame(mode=modo, draw_count=draw)
+        else:
+            self.aciertos += 1
+            g.scoring.restart()
+        self._reponer()
+        return g
+
+    def llenar(self) -> None:
+        """Completa todas las reservas en el hilo actual.
+
+        El faltante se calcula bajo ``_lock`` contando las partidas que otro
+        hilo ya está preparando, así que el arranque y el hilo de reposición
+        llenando a la vez no pasan de ``tamano``. Repartir ocurre fuera del lock.
+        """
+
+        for clave, reserva in self._reservas.items():
+            while not self._parar.is_set():
+                with self._lock:
+                    if len(reserva) + self._preparando[clave] >= self.tamano:
+                        break
+                    self._preparando[clave] += 1
+                g: Optional[KlondikeGame] = None
+                try:
+                    g = self._preparar(*clave)
+                finally:
+                    with self._lock:
+                        self._preparando[clave] -= 1
+                        if g is not None:
+                            reserva.append(g)
+
+    @staticmethod
+    def _preparar(modo: str, draw: int) -> KlondikeGame:
+        g = KlondikeGame(mode=modo, draw_count=draw)
+        g.serialized_json()
+        difficulty_level(g.seed, draw)
+        return g
+
+    # -------------------- Reposición --------------------
+    def _reponer(self) -> None:
+        if self._hilo is None:
+            with self._lock:
+                if self._hilo is None:
+                    self._parar.clear()
+                    self._hilo = threading.Thread(
+                        target=self._trabajar, name="pool-partidas", daemon=True
+                    )
+                    self._hilo.start()
+        self._faltan.set()
+
+    def _trabajar(self) -> None:
+        while not self._parar.is_set():
+            self._faltan.wait()
+            self._faltan.clear()
+            self.llenar()
+
+    def cerrar(self, timeout: float = 5.0) -> None:
+        """Detiene el hilo de reposición."""
+
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is None:
+            return
+        self._parar.set()
+        self._faltan.set()
+        hilo.join(timeout)
@@ -6,12 +6,14 @@ con la clave de orden (-score, seconds, moves, timestamp).
 from __future__ import annotations
 
 import json
+import threading
 import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from ...tads.arbol import ArbolBST
+from ..metrics import SCOREBOARD_SORT_SECONDS
 
 # Detalles de implementación:
 # - Los datos se almacenan como lista de dicts en un JSON legible.
@@ -32,11 +34,35 @@ class ScoreEntry:
 
 
 class ScoreboardService:
+    """Entradas en memoria (cargadas una vez) y su orden cacheado.
+
+    ``cargar()`` lee el archivo y arma el orden; ``add`` agrega en memoria,
+    reescribe el archivo e invalida el orden, que se recalcula en la
+    siguiente consulta. Asume que sólo este proceso escribe el archivo.
+    """
+
     def __init__(self, path: Path) -> None:
         self.path = path
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self._save([])
+        self._data: Optional[List[Dict]] = None
+        self._sorted: Optional[List[Dict]] = None
+        self._lock = threading.RLock()
+
+    def cargar(self) -> None:
+        """Lee las entradas a memoria y precalcula el orden."""
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if not self.path.exists():
+                self._save([])
+            self._data = self._load()
+            self._sorted = None
+        self.sorted_entries()
+
+    def _entries(self) -> List[Dict]:
+        if self._data is None:
+            self.cargar()
+        assert self._data is not None
+        return self._data
 
     def _load(self) -> List[Dict]:
         try:
@@ -48,19 +74,41 @@ class ScoreboardService:
         self.path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
 
     def add(self, name: str, score: int, moves: int, seconds: int, draw: int) -> None:
-        data = self._load()
-        entry = ScoreEntry(name=name or "AnÃ³nimo", score=int(score), moves=int(moves), seconds=int(seconds), draw=int(draw), ts=time.time())
-        data.append(asdict(entry))
-        self._save(data)
+        entry = ScoreEntry(
+            name=name or "AnÃ³nimo",
+            score=int(score),
+            moves=int(moves),
+            seconds=int(seconds),
+            draw=int(draw),
+            ts=time.time(),
+        )
+        with self._lock:
+            data = self._entries()
+            data.append(asdict(entry))
+            self._sorted = None
+            self._save(data)
 
     def sorted_entries(self) -> List[Dict]:
         """Retorna entradas ordenadas por (-score, seconds, moves, ts)."""
-        data = self._load()
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = self._ordenar(self._entries())
+            return list(self._sorted)
+
+    def _ordenar(self, data: List[Dict]) -> List[Dict]:
+        t0 = time.perf_counter()
         tree: ArbolBST[Tuple[int, int, int, float], Dict] = ArbolBST()
         for row in data:
-            key = (-int(row.get("score", 0)), int(row.get("seconds", 0)), int(row.get("moves", 0)), float(row.get("ts", 0.0)))
+            key = (
+                -int(row.get("score", 0)),
+                int(row.get("seconds", 0)),
+                int(row.get("moves", 0)),
+                float(row.get("ts", 0.0)),
+            )
             tree.insert(key, row)
         # inorder da ascendente por clave; ya que usamos -score, es score descendente
-        return [v for _, v in tree.inorder()]
+        out = [v for _, v in tree.inorder()]
+        SCOREBOARD_SORT_SECONDS.observe(time.perf_counter() - t0)
+        return out
 
 
@@ -0,0 +1,86 @@
+"""Servicio de verificación de partidas fuera del hilo del request.
+
+Distribuye verificaciones (``core.replay.verify``) en un pool de procesos para
+no bloquear el servidor y aprovechar varios núcleos. Cada trabajo es un dict
+``{"seed", "draw_count", "mode", "log", "state"?}``; el resultado es un
+``VerificationResult``.
+
+- ``enviar`` encola un trabajo y retorna su ``Future`` (las victorias de
+  ``routes_game`` se anotan en el scoreboard desde su callback);
+- ``verificar_lote`` reparte muchos trabajos en bloques (``chunksize``), que
+  es lo que permite miles de verificaciones por segundo;
+- con ``max_workers=0`` todo corre en el hilo que llama (pruebas, máquinas de
+  un núcleo).
+
+El pool se crea con el primer trabajo (procesos ``spawn``: el servidor ya
+tiene hilos propios) y ``cerrar()`` espera los trabajos pendientes.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..core.replay import VerificationResult, verify
+
+
+def _verificar_trabajo(trabajo: Dict[str, Any]) -> VerificationResult:
+    # Función de módulo para que sea serializable (pickle) por el pool.
+    return verify(
+        int(trabajo["seed"]),
+        int(trabajo.get("draw_count", 1)),
+        str(trabajo.get("mode", "standard")),
+        trabajo.get("log") or [],
+        trabajo.get("state"),
+    )
+
+
+class ServicioVerificacion:
+    """Pool de verificación perezoso (se crea al primer trabajo)."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers = max_workers
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> Optional[Executor]:
+        if self.max_workers == 0:
+            return None
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    ctx = multiprocessing.get_context("spawn")
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=ctx)
+        return self._pool
+
+    def enviar(self, trabajo: Dict[str, Any]) -> "Future[VerificationResult]":
+        """Encola una verificación y retorna su ``Future``."""
+
+        pool = self._executor()
+        if pool is not None:
+            return pool.submit(_verificar_trabajo, trabajo)
+        fut: "Future[VerificationResult]" = Future()
+        try:
+            fut.set_result(_verificar_trabajo(trabajo))
+        except Exception as exc:
+            fut.set_exception(exc)
+        return fut
+
+    def verificar_lote(
+        self, trabajos: Iterable[Dict[str, Any]], chunksize: int = 64
+    ) -> List[VerificationResult]:
+        """Verifica muchos trabajos en paralelo preservando el orden."""
+
+        pool = self._executor()
+        if pool is None:
+            return [_verificar_trabajo(t) for t in trabajos]
+        return list(pool.map(_verificar_trabajo, trabajos, chunksize=chunksize))
+
+    def cerrar(self) -> None:
+        """Espera los trabajos pendientes y detiene el pool."""
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
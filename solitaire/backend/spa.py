@@ -0,0 +1,122 @@
+"""Servido del frontend estático con caché HTTP.
+
+- Cada archivo bajo ``frontend/`` tiene un hash de contenido (SHA-256 corto),
+  recalculado sólo si cambian su ``mtime`` o tamaño.
+- ``index.html`` se sirve con las referencias ``/static/...`` versionadas
+  (``?v=<hash>``), un ``ETag`` del HTML resultante y ``Cache-Control:
+  no-cache``: las recargas se revalidan con un 304 sin cuerpo.
+- ``CachedStaticFiles`` usa el hash como ``ETag``; si la URL trae la versión
+  vigente responde con caché de larga duración (``immutable``), si no con
+  ``no-cache`` para que el navegador revalide.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi.requests import Request
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Referencias a recursos del SPA dentro de index.html (con versión previa opcional)
+_ASSET_REF = re.compile(r"/static/([\w./-]+\.\w+)(?:\?v=[\w-]+)?")
+
+
+class ContentHashes:
+    """Hash de contenido por ruta relativa, invalidado por ``mtime``/tamaño."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._cache: Dict[str, Tuple[int, int, str]] = {}
+
+    def get(self, rel: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+        path = self.root / rel
+        try:
+            st = st or path.stat()
+        except OSError:
+            return None
+        hit = self._cache.get(rel)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        self._cache[rel] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+
+class CachedStaticFiles(StaticFiles):
+    """``StaticFiles`` con ``ETag`` por contenido y ``Cache-Control`` por versión."""
+
+    def __init__(self, *, directory: Path, hashes: ContentHashes) -> None:
+        super().__init__(directory=str(directory), html=False)
+        self.hashes = hashes
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        rel = self.get_path(scope).replace(os.sep, "/")
+        digest = self.hashes.get(rel, stat_result)
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        version = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("v", [None])[0]
+        if digest:
+            response.headers["etag"] = f'"{digest}"'
+        response.headers["cache-control"] = IMMUTABLE if digest and version == digest else REVALIDATE
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SPAIndex:
+    """``index.html`` con recursos versionados, re-renderizado sólo si cambia algo."""
+
+    def __init__(self, static_dir: Path, hashes: ContentHashes) -> None:
+        self.path = static_dir / "index.html"
+        self.hashes = hashes
+        self._key: Optional[Tuple[object, ...]] = None
+        self._mtime: Optional[int] = None
+        self._html = ""
+        self._refs: List[str] = []
+        self._body = b""
+        self._etag = ""
+
+    def _render(self) -> None:
+        mtime = self.path.stat().st_mtime_ns
+        if mtime != self._mtime:
+            # sólo se relee el archivo si cambió en disco
+            self._html = self.path.read_text(encoding="utf-8")
+            self._refs = sorted(set(_ASSET_REF.findall(self._html)))
+            self._mtime = mtime
+        versions = {rel: self.hashes.get(rel) for rel in self._refs}
+        key = (mtime, tuple(versions.items()))
+        if key == self._key:
+            return
+
+        def repl(m: "re.Match[str]") -> str:
+            v = versions.get(m.group(1))
+            return f"/static/{m.group(1)}?v={v}" if v else m.group(0)
+
+        self._body = _ASSET_REF.sub(repl, self._html).encode("utf-8")
+        self._etag = '"{}"'.format(hashlib.sha256(self._body).hexdigest()[:16])
+        self._key = key
+
+    def response(self, request: Request) -> Response:
+        self._render()
+        headers = {"etag": self._etag, "cache-control": REVALIDATE}
+        if self._etag in [t.strip(" W/") for t in request.headers.get("if-none-match", "").split(",")]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=self._body, media_type="text/html; charset=utf-8", headers=headers)
@@ -101,6 +101,7 @@ const api = {
 let state = null;
 // Mostrar mensaje de victoria solo una vez por partida
 let winNotified = false;
+let stuckNotified = false;
 let wastePeek = 1; // cuántas cartas del descarte se muestran (1 o hasta 3)
 
 const SUITS = ['hearts','diamonds','clubs','spades'];
@@ -172,6 +173,7 @@ async function newGame() {
     const res = await api.post('/api/game/new', payload);
     // reiniciar bandera de victoria para nueva partida
     winNotified = false;
+    stuckNotified = false;
     state = res.state; render();
   });
 }
@@ -225,7 +227,20 @@ async function hint() {
     }
   });
 }
-async function autoplay() { await action(async () => { const res = await api.post('/api/game/autoplay', { limit: 200 }); state = res.state; render(); }); }
+async function autoplay() {
+  await action(async () => {
+    // con todo el tableau visible, terminar la partida de una vez
+    const revealed = state.tableau.every(col => col.every(c => c.face_up));
+    if (revealed && !state.won) {
+      try {
+        const res = await api.post('/api/game/autocomplete', {});
+        state = res.state; render();
+        return;
+      } catch {}
+    }
+    const res = await api.post('/api/game/autoplay', { limit: 200 }); state = res.state; render();
+  });
+}
 
 function renderHUD() {
   $('#score').textContent = state.score;
@@ -267,6 +282,13 @@ function render() {
     try { toast('¡Victoria! Has completado las fundaciones.', 'success'); } catch {}
     winNotified = true;
   }
+  // Partida trabada: no quedan jugadas que cambien el tablero
+  if (state.stuck && !stuckNotified) {
+    try { toast('Sin jugadas posibles: la partida está trabada.', 'info'); } catch {}
+    stuckNotified = true;
+  } else if (!state.stuck) {
+    stuckNotified = false;
+  }
   // waste (mostrar 1 o peek de la anterior con offset)
   const waste = $('#waste'); waste.innerHTML = '';
   const wlen = state.waste.length;
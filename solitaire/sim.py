@@ -0,0 +1,245 @@
+"""Arnés de simulación headless para ``KlondikeGame``.
+
+Juega muchas partidas sin API ni persistencia usando políticas intercambiables
+y reporta tasa de victoria, movimientos promedio, distribución de puntajes y
+partidas por segundo. Se usa para ajustar las prioridades de ``core.hints`` y
+el puntaje.
+
+Políticas disponibles (``POLICIES``):
+- ``greedy``: primera jugada según el orden de ``core.hints``.
+- ``random``: jugada legal uniforme.
+- ``solver``: búsqueda en haz acotada (``core.hints.rank_moves``, ``SOLVER_DEPTH``
+  jugadas); elige la candidata desde la que se alcanza más progreso (cartas en
+  fundación, cartas reveladas).
+
+Los motores se crean con ``KlondikeGame.fast``: sin snapshots de undo, registro
+de movimientos ni temporizador, de modo que cada jugada no serializa el estado.
+Las jugadas de prueba se deshacen con la API pública del motor (``checkpoint``,
+``restore`` y ``position_key``). ``play`` juega sobre un motor dado: con
+historial (``history="compact"``) su ``move_log`` queda con la partida jugada.
+
+Uso: ``python -m solitaire.sim --policy greedy --games 1000 --workers 4``
+
+Con ``--calibrate`` ajusta el estimador de ``core/difficulty.py`` con los
+resultados y muestra los coeficientes y cortes para copiar en ese módulo.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .backend.core import difficulty
+from .backend.core.hints import game_hints, rank_moves
+from .backend.core.klondike import KlondikeGame
+
+
+Move = Dict[str, Any]
+Policy = Callable[[KlondikeGame, List[Move], random.Random], Move]
+
+# Búsqueda de ``solver``: profundidad fija; el presupuesto sólo corta casos extremos
+SOLVER_DEPTH = 2
+SOLVER_BUDGET_MS = 500.0
+
+
+@dataclass
+class GameResult:
+    seed: int
+    won: bool
+    moves: int
+    score: int
+
+
+@dataclass
+class SimReport:
+    policy: str
+    draw_count: int
+    games: int
+    wins: int
+    win_rate: float
+    avg_moves: float
+    score: Dict[str, float] = field(default_factory=dict)
+    games_per_sec: float = 0.0
+
+
+# -------------------- Políticas --------------------
+
+
+def greedy_policy(g: KlondikeGame, cands: List[Move], rng: random.Random) -> Move:
+    return cands[0]
+
+
+def random_policy(g: KlondikeGame, cands: List[Move], rng: random.Random) -> Move:
+    return rng.choice(cands)
+
+
+def solver_policy(g: KlondikeGame, cands: List[Move], rng: random.Random) -> Move:
+    return rank_moves(g, cands, depth=SOLVER_DEPTH, budget_ms=SOLVER_BUDGET_MS)[0]
+
+
+POLICIES: Dict[str, Policy] = {
+    "greedy": greedy_policy,
+    "random": random_policy,
+    "solver": solver_policy,
+}
+
+
+# -------------------- Ejecución --------------------
+
+
+def candidates(g: KlondikeGame) -> List[Move]:
+    """Jugadas de ``g`` en el orden de ``core.hints``, sin las que no progresan."""
+
+    out: List[Move] = []
+    for m in game_hints(g):
+        if m["type"] == "recycle":
+            # ``apply_move`` recicla al robar con el mazo vacío
+            m = {"type": "draw"}
+        elif m["type"] == "t2t" and m["start_index"] == 0 and not len(g.tableau[m["to_col"]]):
+            continue  # columna completa a columna vacía: no progresa
+        out.append(m)
+    if (len(g.stock) or len(g.waste)) and all(m["type"] != "draw" for m in out):
+        out.append({"type": "draw"})  # robar siempre es la última opción
+    return out
+
+
+def play(
+    g: KlondikeGame,
+    policy: str = "greedy",
+    rng: Optional[random.Random] = None,
+    max_moves: int = 1000,
+) -> KlondikeGame:
+    """Juega ``g`` con ``policy`` hasta ganar, trabarse o ``max_moves``.
+
+    Se descartan jugadas que llevan a una posición ya visitada (ciclos de
+    cadenas entre columnas o vueltas completas al mazo sin cambios); la
+    partida termina cuando no queda ninguna jugada que progrese.
+    """
+
+    choose = POLICIES[policy]
+    rng = rng or random.Random(g.seed)
+    seen = {g.position_key()}
+    while g.scoring.moves < max_moves and not g.is_won() and not g.is_stuck():
+        cands = candidates(g)
+        while cands:
+            m = choose(g, cands, rng)
+            cp = g.checkpoint()
+            try:
+                ok = g.apply_move(m)
+            except ValueError:
+                ok = False
+            if ok:
+                key = g.position_key()
+                if key not in seen:
+                    seen.add(key)
+                    break
+                g.restore(cp)
+            cands = [c for c in cands if c is not m]
+        else:
+            break
+    return g
+
+
+def play_game(seed: int, policy: str = "greedy", draw_count: int = 1, max_moves: int = 1000) -> GameResult:
+    """Juega una partida completa (motor ``fast``) y retorna su resultado."""
+
+    g = play(KlondikeGame.fast(seed, draw_count), policy, random.Random(seed), max_moves)
+    return GameResult(seed=seed, won=g.is_won(), moves=g.scoring.moves, score=g.scoring.score)
+
+
+def _play_args(args: tuple) -> GameResult:
+    return play_game(*args)
+
+
+def summarize(results: List[GameResult], policy: str, draw_count: int, elapsed: float) -> SimReport:
+    n = len(results)
+    wins = sum(1 for r in results if r.won)
+    scores = sorted(r.score for r in results)
+    dist: Dict[str, float] = {}
+    if scores:
+        dist = {"min": scores[0], "mean": statistics.fmean(scores), "max": scores[-1]}
+        if n > 1:
+            q = statistics.quantiles(scores, n=4)
+            dist.update({"p25": q[0], "p50": q[1], "p75": q[2]})
+    return SimReport(
+        policy=policy,
+        draw_count=draw_count,
+        games=n,
+        wins=wins,
+        win_rate=wins / n if n else 0.0,
+        avg_moves=statistics.fmean(r.moves for r in results) if n else 0.0,
+        score=dist,
+        games_per_sec=n / elapsed if elapsed > 0 else 0.0,
+    )
+
+
+def run_games(
+    policy: str = "greedy",
+    games: int = 100,
+    draw_count: int = 1,
+    seed: int = 1,
+    workers: Optional[int] = None,
+    max_moves: int = 1000,
+) -> List[GameResult]:
+    """Juega ``games`` partidas con semillas ``seed..seed+games-1``.
+
+    ``workers=0`` juega en el proceso actual; si no, usa un pool de procesos
+    (``None`` = cantidad de CPUs).
+    """
+
+    if policy not in POLICIES:
+        raise ValueError(f"Política desconocida: {policy}")
+    args = [(s, policy, draw_count, max_moves) for s in range(seed, seed + games)]
+    if workers == 0:
+        return [_play_args(a) for a in args]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_play_args, args, chunksize=max(1, games // 64)))
+
+
+def simulate(
+    policy: str = "greedy",
+    games: int = 100,
+    draw_count: int = 1,
+    seed: int = 1,
+    workers: Optional[int] = None,
+    max_moves: int = 1000,
+) -> SimReport:
+    """Como ``run_games`` pero retorna el reporte agregado."""
+
+    t0 = time.perf_counter()
+    results = run_games(policy, games, draw_count, seed, workers, max_moves)
+    return summarize(results, policy, draw_count, time.perf_counter() - t0)
+
+
+def calibrate_difficulty(results: List[GameResult], draw_count: int = 1) -> Dict[str, Any]:
+    """Ajusta el estimador de dificultad con resultados simulados."""
+
+    weights, thresholds = difficulty.fit(((r.seed, r.won) for r in results), draw_count)
+    return {"draw_count": draw_count, "weights": weights, "thresholds": thresholds}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Simulación headless de Klondike")
+    ap.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    ap.add_argument("--games", type=int, default=1000)
+    ap.add_argument("--draw", type=int, choices=(1, 3), default=1)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--max-moves", type=int, default=1000)
+    ap.add_argument("--calibrate", action="store_true", help="ajustar core/difficulty.py")
+    a = ap.parse_args(argv)
+    if a.calibrate:
+        results = run_games(a.policy, a.games, a.draw, a.seed, a.workers, a.max_moves)
+        print(json.dumps(calibrate_difficulty(results, a.draw), indent=2))
+        return
+    rep = simulate(a.policy, a.games, a.draw, a.seed, a.workers, a.max_moves)
+    print(json.dumps(asdict(rep), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 """ColaTAD: contenedor educativo sobre ``queue.SimpleQueue``.
 
-Se utiliza para modelar el mazo (stock) y posibles colas de eventos.
+Se utiliza para modelar el mazo (stock). ``ColaAcotadaTAD`` es la variante
+de capacidad fija para colas de eventos entre hilos: el productor nunca se
+bloquea (si está llena, el elemento se descarta) y el consumidor retira lotes.
 Expone una interfaz mínima (encolar/desencolar/emptiness) acorde al TP.
 """
 from __future__ import annotations
 
-from queue import SimpleQueue
-from typing import Generic, Iterable, Iterator, Optional, TypeVar
+from queue import Empty, Full, Queue, SimpleQueue
+from typing import Generic, Iterable, Iterator, List, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -56,3 +58,47 @@ class ColaTAD(Generic[T]):
 
         while not self.esta_vacia():
             yield self.desencolar()
+
+
+class ColaAcotadaTAD(Generic[T]):
+    """Cola FIFO de capacidad fija, no bloqueante para el productor.
+
+    Basada en ``queue.Queue`` (segura entre hilos).
+    """
+
+    def __init__(self, capacidad: int) -> None:
+        if capacidad <= 0:
+            raise ValueError("capacidad debe ser positiva")
+        self._q: Queue[T] = Queue(maxsize=capacidad)
+
+    def intentar_encolar(self, item: T) -> bool:
+        """Encola sin esperar; retorna False (y descarta) si está llena."""
+
+        try:
+            self._q.put_nowait(item)
+        except Full:
+            return False
+        return True
+
+    def desencolar_lote(self, maximo: int, espera: Optional[float] = None) -> List[T]:
+        """Hasta ``maximo`` elementos; espera ``espera`` segundos por el primero.
+
+        Retorna una lista vacía si no llegó nada a tiempo.
+        """
+
+        try:
+            lote = [self._q.get(timeout=espera)]
+        except Empty:
+            return []
+        while len(lote) < maximo:
+            try:
+                lote.append(self._q.get_nowait())
+            except Empty:
+                break
+        return lote
+
+    def esta_vacia(self) -> bool:
+        return self._q.empty()
+
+    def __len__(self) -> int:
+        return self._q.qsize()
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _sin_log_de_eventos(monkeypatch):
+    # las apps de prueba sin ``eventos_log`` explícito no escriben en solitaire/data/events
+    monkeypatch.setenv("SOLITAIRE_EVENTS_LOG", "off")
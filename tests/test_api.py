@@ -1,3 +1,6 @@
+import pstats
+import re
+
 from fastapi.testclient import TestClient
 
 from solitaire.backend.app import create_app
@@ -22,5 +25,141 @@ def test_api_lifecycle():
     # list saves
     r = client.get('/api/saves')
     assert r.status_code == 200
-    assert any(item["id"] == gid for item in r.json()["items"])
+    items = r.json()["items"]
+    assert any(item["id"] == gid for item in items)
+    assert all("registro" not in item for item in items)
+    assert client.get(f'/api/saves/{gid}').json()["registro"] == [{"type": "draw"}]
+
+
+
+def test_pre_encoded_responses_match_state_with_and_without_orjson(monkeypatch):
+    import json
+
+    from solitaire.backend.api.routes_game import holder
+    from solitaire.backend.core import serializer
+
+    client = TestClient(create_app())
+    r = client.post('/api/game/new', json={"mode": "standard", "draw": 1, "seed": 12})
+    body = r.json()
+    assert body["state"] == holder.game.serialized() and body["difficulty"] in ("easy", "medium", "hard")
+    assert client.get('/api/game/state').json() == body["state"]
+    state = holder.game.serialized()
+    fast = serializer.to_json_bytes(state)
+    monkeypatch.setattr(serializer, "orjson", None)
+    assert json.loads(serializer.to_json_bytes(state)) == json.loads(fast) == state
+
+
+def test_spa_index_reads_html_only_when_mtime_changes(tmp_path):
+    import os
+
+    from solitaire.backend.spa import ContentHashes, SPAIndex
+
+    (tmp_path / "main.js").write_text("x")
+    index = tmp_path / "index.html"
+    index.write_text('<script src="/static/main.js"></script>')
+    spa = SPAIndex(tmp_path, ContentHashes(tmp_path))
+    spa._render()
+    body, st = spa._body, index.stat()
+    index.write_text("<p>otro</p>")
+    os.utime(index, ns=(st.st_atime_ns, st.st_mtime_ns))
+    spa._render()
+    assert spa._body == body and b"main.js?v=" in body
+    os.utime(index, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    spa._render()
+    assert spa._body == b"<p>otro</p>"
+
+
+def test_spa_assets_are_versioned_cached_and_compressed():
+    client = TestClient(create_app())
+    r = client.get("/", headers={"accept-encoding": "gzip"})
+    assert r.status_code == 200 and r.headers["cache-control"] == "no-cache"
+    assert client.get("/", headers={"if-none-match": r.headers["etag"]}).status_code == 304
+    src = re.search(r'src="(/static/main\.js\?v=(\w+))"', r.text)
+    assert src
+
+    js = client.get(src.group(1), headers={"accept-encoding": "gzip"})
+    assert js.status_code == 200
+    assert js.headers["etag"] == f'"{src.group(2)}"'
+    assert "immutable" in js.headers["cache-control"]
+    assert js.headers["content-encoding"] == "gzip"
+    again = client.get(src.group(1), headers={"if-none-match": js.headers["etag"]})
+    assert again.status_code == 304 and not again.content
+
+    # sin la versión vigente el navegador debe revalidar
+    assert client.get("/static/main.js?v=old").headers["cache-control"] == "no-cache"
+    # respuestas pequeñas no se comprimen
+    assert "content-encoding" not in client.get("/health", headers={"accept-encoding": "gzip"}).headers
+
+
+def test_metrics_endpoint_exposes_route_and_engine_timers():
+    client = TestClient(create_app())
+    client.post("/api/game/new", json={"mode": "standard", "draw": 1, "seed": 5})
+    client.post("/api/game/move", json={"move": {"type": "draw"}})
+    client.post("/api/game/hint", json={})
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    lines = r.text.splitlines()
+    assert any(l.startswith('solitaire_http_requests_total{method="POST",route="/api/game/move",status="200"}') for l in lines)
+    for name in ("apply_move", "undo_snapshot", "serialize_state", "hint"):
+        count = next(l for l in lines if l.startswith(f"solitaire_{name}_seconds_count"))
+        assert int(count.split()[-1]) >= 1
+    assert any(l.startswith('solitaire_repo_io_bytes_total{op="write"}') for l in lines)
+    # buckets acumulados: +Inf coincide con _count
+    inf = next(l for l in lines if l.startswith('solitaire_hint_seconds_bucket{le="+Inf"}'))
+    count = next(l for l in lines if l.startswith("solitaire_hint_seconds_count"))
+    assert inf.split()[-1] == count.split()[-1]
+
+
+def test_labeled_metrics_reject_samples_without_labels():
+    import pytest
+
+    from solitaire.backend.metrics import HTTP_REQUESTS, HTTP_SECONDS
+
+    with pytest.raises(ValueError, match="labels"):
+        HTTP_REQUESTS.inc()
+    with pytest.raises(ValueError, match="labels"):
+        HTTP_SECONDS.observe(0.1)
+
+
+def test_profiling_header_adds_server_timing_and_rotates_profiles(monkeypatch, tmp_path):
+    monkeypatch.setenv("SOLITAIRE_PROFILE", "header")
+    monkeypatch.setenv("SOLITAIRE_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("SOLITAIRE_PROFILE_KEEP", "2")
+    client = TestClient(create_app())
+    client.post("/api/game/new", json={"mode": "standard", "draw": 1, "seed": 9})
+
+    plain = client.post("/api/game/move", json={"move": {"type": "draw"}})
+    assert plain.status_code == 200 and "server-timing" not in plain.headers
+
+    for _ in range(3):
+        r = client.post("/api/game/move", json={"move": {"type": "draw"}}, headers={"X-Profile": "1"})
+        assert r.status_code == 200
+    phases = {part.split(";")[0] for part in r.headers["server-timing"].split(", ")}
+    assert {"engine", "serialize", "persist", "encode", "total"} <= phases
+    files = sorted(p.name for p in tmp_path.glob("*.prof"))
+    assert len(files) == 2 and r.headers["x-profile-file"] == files[-1]
+
+    stats = pstats.Stats(str(tmp_path / files[-1]))
+    assert any(fn[2] == "apply_move" for fn in stats.stats)  # type: ignore[attr-defined]
+
+
+def test_lifespan_warms_shared_services_and_flushes_on_shutdown(tmp_path):
+    import json
+
+    from solitaire.backend.api.dependencias import Servicios
+    from solitaire.backend.metrics import REPO_BYTES
 
+    (tmp_path / "scoreboard.json").write_text(json.dumps([{"name": "a", "score": 5}, {"name": "b", "score": 9}]), "utf-8")
+    svc = Servicios(tmp_path, eventos_log=str(tmp_path / "moves.jsonl"))
+    with TestClient(create_app(svc)) as client:
+        repo = svc.repo
+        reads = REPO_BYTES.labels("read").value
+        gid = client.post("/api/game/new", json={"mode": "standard", "draw": 1, "seed": 3}).json()["id"]
+        client.post("/api/game/move", json={"move": {"type": "draw"}})
+        assert client.get(f"/api/saves/{gid}").json()["movimientos"] == 1
+        assert [e["name"] for e in client.get("/api/scoreboard").json()["items"]] == ["b", "a"]
+        # mismas instancias entre requests y sin releer el archivo
+        assert svc.repo is repo and REPO_BYTES.labels("read").value == reads
+    # al apagar: eventos escritos y partida persistida
+    assert len((tmp_path / "moves.jsonl").read_text("utf-8").splitlines()) == 1
+    assert gid in json.loads((tmp_path / "saves.json").read_text("utf-8"))
@@ -16,3 +16,46 @@ def test_crud_json_repo(tmp_path: Path):
     repo.eliminar("abc")
     assert repo.obtener("abc") is None
 
+
+
+def test_repo_serves_from_memory_and_serializes_concurrent_writes(tmp_path: Path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "saves.json"
+    repo = RepositorioPartidasJSON(path)
+    with ThreadPoolExecutor(8) as ex:
+        list(ex.map(lambda i: repo.crear(Partida.nueva(id=f"p{i}", seed=i)), range(40)))
+    assert len(repo.listar()) == 40
+    # el archivo refleja todas las altas y un repositorio nuevo lo relee
+    assert {p.id for p in RepositorioPartidasJSON(path).listar()} == {f"p{i}" for i in range(40)}
+    path.write_text("{}", encoding="utf-8")  # cambios externos no se ven
+    assert repo.obtener("p7") is not None
+
+
+def test_move_log_is_appended_not_rewritten(tmp_path: Path):
+    from solitaire.backend.core.klondike import KlondikeGame
+
+    path = tmp_path / "saves.json"
+    repo = RepositorioPartidasJSON(path)
+    g = KlondikeGame(seed=5)
+    p = Partida.desde_juego("g1", g)
+    repo.crear(p)
+    log = tmp_path / "saves-registros" / "g1.jsonl"
+    sizes = []
+    for _ in range(3):
+        g.apply_move({"type": "draw"})
+        p.actualizar_desde_juego(g)
+        repo.actualizar(p)
+        sizes.append(log.stat().st_size)
+    assert sizes[1] - sizes[0] == sizes[2] - sizes[1] == sizes[0]  # una línea por jugada
+    assert "registro" not in path.read_text("utf-8")
+    got = RepositorioPartidasJSON(path).obtener("g1")
+    assert got.registro == g.move_log == [{"type": "draw"}] * 3
+    # otro log (p. ej. un PUT verificado) reemplaza el archivo
+    got.registro = [{"type": "draw"}]
+    repo2 = RepositorioPartidasJSON(path)
+    repo2.actualizar(got)
+    assert repo2.obtener("g1").registro == [{"type": "draw"}]
+    assert RepositorioPartidasJSON(path).obtener("g1").registro == [{"type": "draw"}]
+    repo2.eliminar("g1")
+    assert not log.exists()
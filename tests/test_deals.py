@@ -0,0 +1,28 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from solitaire.backend.core.deals import _mt_raw, deal_batch, deal_stats
+from solitaire.backend.core.hints import hints
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.models import encode_card
+from solitaire.backend.core.serializer import serialize_state
+
+SEEDS = list(range(1, 200)) + [2**31, 2**32 + 5, 2**70 + 3, -42]
+
+
+def test_deal_batch_matches_engine_shuffle():
+    deals = deal_batch(SEEDS, chunk=64)
+    assert deals.shape == (len(SEEDS), 52) and deals.dtype == np.uint8
+    for row, seed in zip(deals, SEEDS):
+        assert list(row) == [encode_card(c) for c in KlondikeGame(seed=seed)._new_deck()]
+    with pytest.raises(ValueError):
+        _mt_raw(np.array([[1]], dtype=np.uint32), 228)
+
+
+def test_deal_stats_initial_moves_match_hints():
+    stats = deal_stats(deal_batch(SEEDS[:50]))
+    for k, seed in enumerate(SEEDS[:50]):
+        state = serialize_state(KlondikeGame(seed=seed).to_state())
+        moves = [m for m in hints(state, limit=0) if m["type"] in ("t2f", "t2t")]
+        assert stats["initial_moves"][k] == len(moves)
@@ -0,0 +1,78 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from solitaire.backend.api.dependencias import Servicios
+from solitaire.backend.app import create_app
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.services.desafios import Desafio, Resultado, ServicioDesafios, semilla_diaria
+from solitaire.sim import play
+
+
+def _greedy_win(seed):
+    """Jugadas de la política greedy de ``sim`` (seed 2 gana con draw 1)."""
+
+    g = play(KlondikeGame(seed=seed, history="compact"), "greedy", max_moves=10_000)
+    assert g.is_won()
+    return g.move_log
+
+
+def test_ranking_index_keeps_best_result_per_player():
+    d = Desafio("t", 1, 1)
+    assert d.registrar(Resultado("ana", 500, 120, 300, 1.0))
+    assert d.registrar(Resultado("beto", 700, 130, 400, 2.0))
+    assert d.registrar(Resultado("caro", 500, 110, 250, 3.0))
+    assert not d.registrar(Resultado("ana", 400, 100, 100, 4.0))  # peor: no entra
+    assert d.registrar(Resultado("ana", 800, 100, 500, 5.0))
+    assert [r["jugador"] for r in d.ranking()] == ["ana", "beto", "caro"]
+    assert [d.posicion(j) for j in ("ana", "beto", "caro", "nadie")] == [1, 2, 3, None]
+    assert d.ranking(limit=1, offset=2) == [
+        {"rank": 3, "jugador": "caro", "score": 500, "moves": 110, "seconds": 250, "ts": 3.0}
+    ]
+
+
+def test_daily_deal_is_shared_and_sessions_fork_the_cached_start(tmp_path):
+    svc = ServicioDesafios(tmp_path)
+    d = svc.diario(1, date(2026, 3, 1))
+    assert d.semilla == semilla_diaria(date(2026, 3, 1), 1) and svc.diario(1, date(2026, 3, 1)) is d
+    a, b = svc.iniciar(d.id, "ana"), svc.iniciar(d.id, "beto")
+    plantilla = svc.plantilla(d)
+    assert a.juego.serialized() is b.juego.serialized() is plantilla.serialized()
+    assert a.juego.apply_move({"type": "draw"}) and plantilla.serialized()["moves"] == 0
+    assert b.juego.serialized() == KlondikeGame(seed=d.semilla).serialized()
+    # otro proceso ve el mismo desafío desde challenges.json
+    assert ServicioDesafios(tmp_path).obtener(d.id).semilla == d.semilla
+
+
+def test_challenge_api_ranks_verified_wins_without_touching_saves(tmp_path):
+    svc = Servicios(tmp_path, eventos_log="off", pool_tamano=0)
+    client = TestClient(create_app(svc))
+    cid = client.post("/api/challenge", json={"draw": 1, "seed": 2}).json()["challenge"]["id"]
+    starts = [
+        client.post(f"/api/challenge/{cid}/start", json={"player_name": n}).json()
+        for n in ("ana", "beto")
+    ]
+    assert starts[0]["state"] == starts[1]["state"] and starts[0]["session"] != starts[1]["session"]
+    assert client.post(f"/api/challenge/{cid}/start", json={}).status_code == 400
+    assert client.post("/api/challenge/nope/start", json={"player_name": "x"}).status_code == 404
+    # con semilla 0 la reproducción usaría otro reparto y ninguna victoria se verificaría
+    assert client.post("/api/challenge", json={"seed": 0}).status_code == 400
+    # otro modo se jugaría como "standard" sin avisar
+    assert client.post("/api/challenge", json={"mode": "klondike"}).status_code == 400
+
+    sid = starts[0]["session"]
+    for m in _greedy_win(2):
+        body = client.post(f"/api/challenge/session/{sid}/move", json={"move": m}).json()
+    assert body["finished"] and body["rank"] == 1 and body["state"]["won"]
+    late = client.post(f"/api/challenge/session/{sid}/move", json={"move": {"type": "draw"}})
+    assert late.status_code == 400
+
+    ranking = client.get(f"/api/challenge/{cid}/ranking").json()
+    assert ranking["challenge"]["players"] == 1 and ranking["items"][0]["jugador"] == "ana"
+    assert not (tmp_path / "saves.json").exists()
+    # el ranking se reconstruye desde el JSONL del desafío
+    assert ServicioDesafios(tmp_path).obtener(cid).posicion("ana") == 1
+
+    daily = client.get("/api/challenge/daily", params={"draw": 3, "date": "2026-01-02"}).json()
+    assert daily["challenge"]["id"] == "daily-2026-01-02-d3" and daily["state"]["moves"] == 0
+    assert client.get("/api/challenge/daily", params={"date": "ayer"}).status_code == 400
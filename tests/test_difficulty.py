@@ -0,0 +1,28 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from solitaire.backend.app import create_app
+from solitaire.backend.core import difficulty as dif
+
+
+def test_pick_seed_matches_requested_level():
+    rng = random.Random(3)
+    for draw in (1, 3):
+        for wanted in dif.LEVELS:
+            seed = dif.pick_seed(wanted, draw, rng=rng)
+            assert dif.level(seed, draw) == wanted
+            assert 0.0 <= dif.difficulty(seed, draw) <= 1.0
+
+
+def test_fit_returns_weights_and_ordered_thresholds():
+    samples = [(s, s % 3 == 0) for s in range(1, 120)]
+    weights, (t1, t2) = dif.fit(samples, draw_count=1)
+    assert len(weights) == len(dif.FEATURES) + 1
+    assert t1 <= t2
+
+
+def test_new_game_with_difficulty():
+    client = TestClient(create_app())
+    r = client.post("/api/game/new", json={"mode": "standard", "draw": 1, "difficulty": "hard"})
+    assert r.status_code == 200 and r.json()["difficulty"] == "hard"
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.replay import verify
+from solitaire.backend.services.eventos import BusEventos, EventoJugada
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+
+def test_engine_actions_become_replayable_jsonl_events(tmp_path):
+    bus = BusEventos(tmp_path / "moves.jsonl", intervalo=0.01)
+    g = KlondikeGame(seed=21)
+    g.oyente = bus.oyente("p1")
+    for _ in range(6):
+        g.apply_move({"type": "draw"})
+    with pytest.raises(ValueError):  # las ilegales no generan evento
+        g.apply_move({"type": "t2f", "from_col": 0})
+    g.undo()
+    g.redo()
+    g.autoplay()
+    assert g.clone().oyente is None
+    bus.cerrar()
+
+    events = _lines(tmp_path / "moves.jsonl")
+    assert [e["move"] for e in events] == g.move_log
+    assert [e["seq"] for e in events] == list(range(1, len(events) + 1))
+    assert {e["game_id"] for e in events} == {"p1"}
+    assert sum(e["score_delta"] for e in events) == g.scoring.score
+    assert all(e["duration_us"] >= 0 for e in events)
+    res = verify(g.seed, g.draw_count, g.mode, [e["move"] for e in events])
+    assert res.ok and res.score == g.scoring.score
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, monkeypatch):
+    bus = BusEventos(tmp_path / "moves.jsonl", capacidad=2)
+    monkeypatch.setattr(bus, "_iniciar", lambda: None)  # sin consumidor
+    ev = EventoJugada("p", 1, {"type": "draw"}, 0, 1.0, 0.0)
+    assert [bus.publicar(ev) for _ in range(4)] == [True, True, False, False]
+    assert (bus.publicados, bus.descartados) == (2, 2)
+
+
+def test_log_rotates_by_size(tmp_path):
+    bus = BusEventos(tmp_path / "moves.jsonl", lote=5, max_bytes=200, respaldos=2, intervalo=0.01)
+    for i in range(30):
+        bus.publicar(EventoJugada("p", i, {"type": "draw"}, 0, 1.0, 0.0))
+    bus.cerrar()
+    names = {p.name for p in tmp_path.iterdir()}
+    assert {"moves.jsonl.1", "moves.jsonl.2"} <= names
+    assert "moves.jsonl.3" not in names
+
+
+def test_exit_hook_is_registered_once_and_removed_by_cerrar(tmp_path, monkeypatch):
+    import atexit
+
+    hooks = []
+    monkeypatch.setattr(atexit, "register", hooks.append)
+    monkeypatch.setattr(atexit, "unregister", hooks.remove)
+    bus = BusEventos(tmp_path / "moves.jsonl", intervalo=0.01)
+    for seq in (1, 2):
+        bus.publicar(EventoJugada("p1", seq, {"type": "draw"}, 0, 1.0, 0.0))
+    assert len(hooks) == 1
+    bus.cerrar()
+    assert hooks == []
+    bus.publicar(EventoJugada("p1", 3, {"type": "draw"}, 0, 1.0, 0.0))
+    assert len(hooks) == 1
+    hooks[0]()  # al salir del intérprete: cierra sin tocar el registro de atexit
+    assert len(_lines(tmp_path / "moves.jsonl")) == 3
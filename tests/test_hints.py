@@ -0,0 +1,32 @@
+import copy
+import time
+
+from solitaire.backend.core.hints import hints
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.serializer import serialize_state
+
+
+def _state(seed: int):
+    g = KlondikeGame(seed=seed)
+    for _ in range(10):
+        g.apply_move({"type": "draw"})
+    return serialize_state(g.to_state())
+
+
+def test_lookahead_ranks_same_moves_plus_draw():
+    state = _state(77)
+    before = copy.deepcopy(state)
+    static = hints(state, limit=0)
+    ranked = hints(state, limit=0, depth=3, budget_ms=200)
+    key = lambda m: (m["type"], m.get("from_col"), m.get("start_index"), m.get("to_col"))
+    assert {key(m) for m in ranked} == {key(m) for m in static} | {("draw", None, None, None)}
+    values = [m["expected"] for m in ranked]
+    assert values == sorted(values, reverse=True)
+    assert state == before  # no muta el estado
+
+
+def test_lookahead_respects_budget():
+    state = _state(123)
+    t0 = time.perf_counter()
+    assert hints(state, limit=3, depth=6, budget_ms=5)
+    assert time.perf_counter() - t0 < 0.5
@@ -0,0 +1,41 @@
+import json
+import os
+import time
+
+import pytest
+
+from solitaire.backend.services.perfiles import ServicioPerfiles
+
+
+def test_reads_come_from_memory_and_writes_are_batched(tmp_path, monkeypatch):
+    path = tmp_path / "perfiles.json"
+    svc = ServicioPerfiles(path, demora=60)
+    svc.set_preferencia("ana", "idioma", "es")
+    with pytest.raises(ValueError):
+        svc.set_preferencia("ana", "nombre", "x")
+    lecturas = []
+    orig = type(path).read_bytes
+    monkeypatch.setattr(type(path), "read_bytes", lambda self: lecturas.append(self) or orig(self))
+    for i in range(1000):
+        svc.set_preferencia(f"u{i}", "alto_contraste", i % 2 == 0)
+        assert svc.get_prefs(f"u{i}")["alto_contraste"] == (i % 2 == 0)
+    assert lecturas == [] and svc.escrituras == 1  # sólo la creación del archivo
+    svc.get_prefs("ana")["idioma"] = "en"  # la copia no altera la caché
+    svc.cerrar()
+    data = json.loads(path.read_text("utf-8"))
+    assert svc.escrituras == 2 and len(data) == 1001 and data["ana"] == {"idioma": "es"}
+    assert [p.name for p in tmp_path.iterdir()] == ["perfiles.json"]  # sin temporales
+
+
+def test_external_change_is_reloaded_keeping_pending_writes(tmp_path):
+    path = tmp_path / "perfiles.json"
+    path.write_text(json.dumps({"ana": {"idioma": "es"}, "beto": {"idioma": "es"}}), "utf-8")
+    svc = ServicioPerfiles(path, demora=60, recarga=0)
+    assert svc.get_prefs("ana") == {"idioma": "es"}
+    svc.set_preferencia("ana", "nombre", "Ana María")
+    path.write_text(json.dumps({"ana": {}, "beto": {"idioma": "en"}}), "utf-8")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert svc.get_prefs("beto") == {"idioma": "en"}
+    assert svc.get_prefs("ana") == {"idioma": "es", "nombre": "Ana María"}
+    svc.cerrar()
+    assert json.loads(path.read_text("utf-8"))["beto"] == {"idioma": "en"}
@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+
+from solitaire.backend.api.dependencias import Servicios
+from solitaire.backend.api.routes_game import holder
+from solitaire.backend.app import create_app
+from solitaire.backend.services.pool import PoolPartidas
+
+
+def test_pool_hands_out_pre_dealt_games_and_refills():
+    pool = PoolPartidas(tamano=3)
+    pool.llenar()
+    assert pool.disponibles("standard", 3) == 3
+    listo = pool._reservas[("vegas", 1)][0]
+    body = listo.serialized_json()
+    g = pool.tomar("vegas", 1)
+    assert g is listo and g.mode == "vegas" and pool.aciertos == 1
+    # temporizador desde la entrega y estado inicial ya codificado
+    assert g.scoring.seconds() == 0 and g.serialized_json() is body
+    seeds = {pool.tomar("standard", 1).seed for _ in range(3)}
+    assert len(seeds) == 3
+    # combinaciones fuera del pool se construyen en el momento
+    assert pool.tomar("custom", 1).mode == "custom" and pool.fallos == 0
+    pool.cerrar()
+    assert pool._hilo is None
+
+
+def test_concurrent_fills_do_not_overshoot_the_pool_size(monkeypatch):
+    import threading
+    import time
+
+    preparar = PoolPartidas._preparar
+
+    def lento(modo, draw):
+        time.sleep(0.01)  # los hilos se cruzan mientras reparten
+        return preparar(modo, draw)
+
+    monkeypatch.setattr(PoolPartidas, "_preparar", staticmethod(lento))
+    pool = PoolPartidas(tamano=2)
+    hilos = [threading.Thread(target=pool.llenar) for _ in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert [pool.disponibles(m, d) for m, d in pool._reservas] == [2, 2, 2, 2]
+
+
+def test_new_game_builds_the_engine_once_and_uses_the_pool(tmp_path):
+    svc = Servicios(tmp_path, eventos_log="off", pool_tamano=2)
+    with TestClient(create_app(svc)) as client:
+        r = client.post("/api/game/new", json={"mode": "standard", "draw": 3})
+        assert r.status_code == 200 and svc.pool.aciertos == 1
+        body = r.json()
+        saved = svc.repo.obtener(body["id"])
+        assert saved.semilla == holder.game.seed and saved.draw_count == 3
+        assert body["state"] == holder.game.serialized() == saved.estado_serializado
+        client.post("/api/game/new", json={"mode": "standard", "draw": 1, "seed": 42})
+        assert holder.game.seed == 42 and svc.pool.aciertos == 1
+    assert svc.pool._hilo is None
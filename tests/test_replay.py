@@ -0,0 +1,68 @@
+from fastapi.testclient import TestClient
+
+from solitaire.backend.app import create_app
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.replay import verify
+from solitaire.backend.core.serializer import serialize_state
+
+
+def _play(g: KlondikeGame, n: int = 40) -> None:
+    for i in range(n):
+        h = g.hint()
+        try:
+            g.apply_move(h)
+        except ValueError:
+            g.apply_move({"type": "draw"})
+        if i % 7 == 3:
+            g.undo()
+        if i % 14 == 3:
+            g.redo()
+    g.autoplay(limit=20)
+
+
+def test_replay_matches_live_game():
+    g = KlondikeGame(seed=321)
+    _play(g)
+    state = serialize_state(g.to_state())
+    res = verify(g.seed, g.draw_count, g.mode, g.move_log, state)
+    assert res.ok, res.reason
+    assert (res.score, res.moves) == (g.scoring.score, g.scoring.moves)
+
+
+def test_verify_rejects_tampered_state_and_illegal_log():
+    g = KlondikeGame(seed=321)
+    _play(g)
+    state = serialize_state(g.to_state())
+    state["foundations"]["hearts"] = [{"rank": r, "suit": "hearts", "face_up": True} for r in range(1, 14)]
+    assert not verify(g.seed, g.draw_count, g.mode, g.move_log, state).ok
+    assert not verify(g.seed, 1, "standard", [{"type": "w2f"}] * 3).ok
+
+
+def test_put_save_requires_verifiable_log():
+    client = TestClient(create_app())
+    pid = client.post("/api/saves", json={"mode": "standard", "draw": 1, "seed": 5}).json()["id"]
+    g = KlondikeGame(seed=5)
+    g.apply_move({"type": "draw"})
+    state = serialize_state(g.to_state()) | {"score": 9999}
+    r = client.put(f"/api/saves/{pid}", json={"state": state})
+    assert r.status_code == 400
+    r = client.put(f"/api/saves/{pid}", json={"state": state, "log": g.move_log})
+    assert r.status_code == 200
+    assert client.get(f"/api/saves/{pid}").json()["puntaje"] == g.scoring.score
+    client.delete(f"/api/saves/{pid}")
+
+
+def test_wins_are_verified_in_the_pool_and_reach_the_scoreboard(tmp_path):
+    from solitaire.backend.api.dependencias import Servicios
+    from solitaire.backend.api.routes_game import _registrar_victoria
+    from solitaire.backend.domain.partida import Partida
+    from solitaire.sim import play
+
+    s = Servicios(tmp_path, eventos_log="off", pool_tamano=0, verificadores=1)
+    g = play(KlondikeGame(seed=2, history="compact"), "greedy", max_moves=10_000)
+    _registrar_victoria(s, g, Partida.desde_juego("w", g), "ana")
+    trabajos = [{"seed": g.seed, "log": g.move_log}, {"seed": g.seed, "log": [{"type": "w2f"}]}]
+    lote = s.verificacion.verificar_lote(trabajos)
+    assert [r.won for r in lote] == [True, False] and not lote[1].ok
+    s.cerrar()  # espera las verificaciones en curso
+    assert [(e["name"], e["score"]) for e in s.scoreboard.sorted_entries()] == [("ana", g.scoring.score)]
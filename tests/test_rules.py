@@ -1,4 +1,8 @@
+import random
+
 from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.models import Card, Rank, Suit
+from solitaire.backend.core.rules import legal_moves
 
 
 def test_new_game_has_7_columns_and_stock():
@@ -30,3 +34,174 @@ def test_hint_returns_something():
     h = g.hint()
     assert h is not None
 
+
+def test_fast_deals_like_constructor_and_clone_is_independent():
+    g = KlondikeGame(seed=77)
+    f = KlondikeGame.fast(77)
+    assert [c.cartas() for c in f.tableau] == [c.cartas() for c in g.tableau]
+    assert f.stock.cartas() == g.stock.cartas()
+    assert f.scoring.start_ts == 0 and not f.history.can_undo()
+    c = f.clone()
+    assert c.apply_move({"type": "draw"})
+    assert len(c.waste.cartas()) == 1 and not f.waste.cartas()
+    assert f.stock.cartas() == g.stock.cartas()
+
+
+def _blocked_game() -> KlondikeGame:
+    # topes rojos altos; ases y negros que encajarían en ellos, boca abajo
+    red, black = (Suit.CORAZONES, Suit.DIAMANTES), (Suit.TREBOLES, Suit.PICAS)
+    tops = [Card(r, s, True) for r in (Rank.REY, Rank.REINA, Rank.JOTA) for s in red]
+    tops.append(Card(Rank.DIEZ, Suit.CORAZONES, True))
+    hidden = [Card(Rank.AS, s, False) for s in Suit]
+    hidden += [Card(r, s, False) for r in (Rank.REINA, Rank.JOTA, Rank.DIEZ, Rank.NUEVE) for s in black]
+    used = {(c.rank, c.suit) for c in tops + hidden}
+    stock = [Card(r, s, False) for s in Suit for r in Rank if (r, s) not in used]
+    g = KlondikeGame.fast(1)
+    g.from_state(g.to_state() | {
+        "stock": stock,
+        "waste": [],
+        "tableau": [hidden[i::7] + [top] for i, top in enumerate(tops)],
+    })
+    return g
+
+
+def _lone_kings_game() -> KlondikeGame:
+    # reyes rojos solos en las columnas 0 y 1, columna 6 vacía; ases y negros
+    # que encajarían (reyes incluidos) boca abajo bajo damas y jotas rojas
+    red, black = (Suit.CORAZONES, Suit.DIAMANTES), (Suit.TREBOLES, Suit.PICAS)
+    tops = [Card(r, s, True) for r in (Rank.REY, Rank.REINA, Rank.JOTA) for s in red]
+    hidden = [Card(Rank.AS, s, False) for s in Suit]
+    hidden += [Card(r, s, False) for r in (Rank.REY, Rank.REINA, Rank.JOTA, Rank.DIEZ) for s in black]
+    used = {(c.rank, c.suit) for c in tops + hidden}
+    stock = [Card(r, s, False) for s in Suit for r in Rank if (r, s) not in used]
+    g = KlondikeGame.fast(1)
+    g.from_state(g.to_state() | {
+        "stock": stock,
+        "waste": [],
+        "tableau": [[tops[0]], [tops[1]]]
+        + [hidden[i::4] + [top] for i, top in enumerate(tops[2:])]
+        + [[]],
+    })
+    return g
+
+
+def test_stuck_after_two_identical_stock_cycles():
+    g = _blocked_game()
+    recycles = 0
+    while not g.is_stuck() and recycles < 5:
+        if not g.stock.cartas():
+            recycles += 1
+        g.draw_from_stock()
+    assert g.is_stuck() and recycles == 3
+    assert g.to_state()["stuck"] and g.hint() is None
+    g._restore_compact(g._capture())
+    assert not g.is_stuck()
+
+
+def test_moving_a_lone_king_between_empty_columns_is_not_progress():
+    g = _lone_kings_game()
+    shuffle = {"type": "t2t", "from_col": 0, "start_index": 0, "to_col": 6}
+    assert shuffle in legal_moves(g._board())
+    for _ in range(3000):
+        g.draw_from_stock()
+    assert g.is_stuck() and g.hint() is None
+
+
+def test_repeated_stock_cycles_are_not_stuck_while_other_moves_exist():
+    g = KlondikeGame(seed=1)
+    for _ in range(75):
+        g.apply_move({"type": "draw"})
+    move = {"type": "t2t", "from_col": 1, "start_index": 1, "to_col": 5}
+    assert move in legal_moves(g._board())
+    assert not g.is_stuck() and not g.to_state()["stuck"]
+    assert g.hint() == move
+
+
+def test_autocomplete_finishes_revealed_game_in_one_batch():
+    g = KlondikeGame(seed=3, history="compact")
+    assert not g.can_autocomplete() and g.autocomplete() == []
+    # mazo con K..8 y tableau con 7..A boca arriba (cuatro cartas por columna)
+    cards = [Card(Rank(r), s, False) for r in range(13, 0, -1) for s in Suit]
+    state = g.to_state() | {
+        "stock": cards[:24],
+        "waste": [],
+        "tableau": [[Card(c.rank, c.suit, True) for c in cards[24 + 4 * i: 28 + 4 * i]] for i in range(7)],
+    }
+    g.from_state(state)
+    assert g.can_autocomplete()
+    plan = g.autocomplete()
+    assert plan and g.is_won() and g.move_log[-1] == {"type": "autocomplete"}
+    assert g.undo() and not g.is_won()
+
+
+def _revealed_draw3(rng: random.Random) -> KlondikeGame:
+    # fundaciones a una altura al azar; el resto en cadenas boca arriba o en el mazo
+    heights = {s: rng.randint(0, 4) for s in Suit}
+    found = {s.value: [Card(Rank(r), s, True) for r in range(1, heights[s] + 1)] for s in Suit}
+    rest = [Card(r, s, True) for s in Suit for r in Rank if r > heights[s]]
+    rng.shuffle(rest)
+    cols = []
+    for _ in range(7):
+        col = [rest.pop()]
+        while rng.random() > 0.15:
+            fits = [c for c in rest if c.rank + 1 == col[-1].rank and c.suit.color != col[-1].suit.color]
+            if not fits:
+                break
+            col.append(fits[rng.randrange(len(fits))])
+            rest.remove(col[-1])
+        cols.append(col)
+    g = KlondikeGame(seed=1, draw_count=3, history="compact")
+    g.from_state(g.to_state() | {
+        "stock": [Card(c.rank, c.suit, False) for c in rest],
+        "waste": [],
+        "tableau": cols,
+        "foundations": found,
+    })
+    return g
+
+
+def test_autocomplete_wins_every_revealed_draw3_position():
+    rng = random.Random(33)
+    for _ in range(50):
+        g = _revealed_draw3(rng)
+        assert g.can_autocomplete()
+        plan = g.autocomplete()
+        assert plan and g.is_won()
+
+
+def test_pile_views_do_not_copy():
+    g = KlondikeGame(seed=11)
+    col = g.tableau[6]
+    assert col.vista() is col._cartas and len(col) == 7
+    assert list(col.desde(5)) == col.cartas()[5:]
+    assert len(g.stock) == 24 and list(g.stock) == g.stock.cartas()
+    assert g.to_state()["tableau"][6] is col.vista()
+
+
+def test_stats_counters_follow_moves_and_undo():
+    g = KlondikeGame(seed=99, history="compact")
+    assert g.stats() == {"foundation": 0, "face_down": 21, "stock": 24, "waste": 0}
+    for _ in range(200):
+        g.autoplay()
+        h = g.hint()
+        if h is None:
+            break
+        g.apply_move(h)
+        if g.scoring.moves % 5 == 0:
+            g.undo()
+        fresh = g.clone()
+        fresh._recount()
+        assert g.stats() == fresh.stats()
+    assert g.is_won() == (g.stats()["foundation"] == 52)
+
+
+def test_serialized_state_is_memoized_per_version():
+    import json
+
+    g = KlondikeGame(seed=8)
+    first = g.serialized()
+    assert g.serialized() is first
+    assert json.loads(g.serialized_json()) == first
+    assert g.apply_move({"type": "draw"})
+    assert g.serialized() is not first and len(g.serialized()["waste"]) == 1
+    assert g.undo() and g.serialized()["waste"] == []
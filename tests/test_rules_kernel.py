@@ -0,0 +1,61 @@
+import random
+
+from solitaire.backend.core import rules
+from solitaire.backend.core.hints import _static_hints, game_hints
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.models import Rank, decode_card
+from solitaire.backend.core.serializer import serialize_state
+
+
+# Reglas previas al núcleo (sobre Card y sobre dicts), como referencia
+def _card_tableau(card, top):
+    if top is None:
+        return card.rank == Rank.REY
+    return top.rank == card.rank + 1 and top.suit.color != card.suit.color
+
+
+def _card_foundation(card, top):
+    if top is None:
+        return card.rank == Rank.AS
+    return card.suit == top.suit and card.rank == top.rank + 1
+
+
+def _dict_tableau(head, dtop):
+    red = {"hearts", "diamonds"}
+    if dtop is None:
+        return head["rank"] == 13
+    return dtop["rank"] == head["rank"] + 1 and (dtop["suit"] in red) != (head["suit"] in red)
+
+
+def _dict_foundation(card, ftop):
+    if ftop is None:
+        return card["rank"] == 1
+    return card["suit"] == ftop["suit"] and card["rank"] == ftop["rank"] + 1
+
+
+def test_kernel_matches_card_and_dict_rules_for_every_pair():
+    for a in range(52):
+        ca = decode_card(a, True)
+        for b in [None, *range(52)]:
+            cb = None if b is None else decode_card(b, True)
+            db = None if cb is None else cb.to_dict()
+            t = rules.tableau_accepts(a, b)
+            f = rules.foundation_accepts(a, b)
+            assert t == _card_tableau(ca, cb) == _dict_tableau(ca.to_dict(), db)
+            assert f == _card_foundation(ca, cb) == _dict_foundation(ca.to_dict(), db)
+
+
+def test_engine_and_hint_paths_agree_over_random_traces():
+    for seed in range(30):
+        rng = random.Random(seed)
+        g = KlondikeGame.fast(seed, 1 + 2 * (seed % 2))
+        for _ in range(120):
+            moves = game_hints(g)
+            assert moves == _static_hints(serialize_state(g.to_state()))
+            for m in moves:
+                if m["type"] in ("t2t", "t2f", "w2t", "w2f"):
+                    assert g.clone().apply_move(m)
+            m = rng.choice(moves + [{"type": "draw"}])
+            if m["type"] == "recycle":
+                m = {"type": "draw"}
+            g.apply_move(m)
@@ -0,0 +1,28 @@
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.serializer import serialize_state
+from solitaire.sim import POLICIES, candidates, simulate
+
+
+def test_history_off_skips_snapshots_and_log():
+    g = KlondikeGame(seed=7, history="off")
+    assert g.apply_move({"type": "draw"})
+    assert not g.history.can_undo() and g.move_log == []
+    assert not g.undo()
+
+
+def test_simulate_inline_reports_all_policies():
+    for policy in POLICIES:
+        rep = simulate(policy, games=3, seed=11, workers=0, max_moves=150)
+        assert rep.games == 3 and 0.0 <= rep.win_rate <= 1.0
+        assert rep.avg_moves > 0 and {"min", "mean", "max"} <= set(rep.score)
+
+
+def test_checkpoint_restore_rewinds_board_score_and_log():
+    g = KlondikeGame(seed=7, history="compact")
+    g.apply_move({"type": "draw"})
+    cp, key, state = g.checkpoint(), g.position_key(), serialize_state(g.to_state())
+    for m in candidates(g)[:3]:
+        g.apply_move(m)
+    g.restore(cp)
+    assert g.position_key() == key and g.move_log == [{"type": "draw"}]
+    assert serialize_state(g.to_state()) == state
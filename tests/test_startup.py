@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+from solitaire.backend.app import LAZY_MODULES
+from solitaire.backend.core.klondike import KlondikeGame
+from solitaire.backend.core.models import DECK, decode_card
+from solitaire.backend.core.serializer import serialize_state
+
+
+def test_app_import_defers_heavy_modules():
+    # proceso nuevo: en éste las otras pruebas ya importaron esos módulos
+    code = "import sys, solitaire.backend.app; print([m for m in %r if m in sys.modules])"
+    cmd = [sys.executable, "-c", code % (LAZY_MODULES,)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_core_does_not_import_the_metrics_layer():
+    code = (
+        "import sys, solitaire.backend.core.klondike, solitaire.backend.core.hints; "
+        "print('solitaire.backend.metrics' in sys.modules)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_deck_template_is_immutable_and_shuffles_stay_deterministic():
+    template = tuple(decode_card(c) for c in range(52))
+    assert isinstance(DECK, tuple) and DECK == template
+    a = KlondikeGame(seed=7)
+    b = KlondikeGame(seed=7)
+    assert serialize_state(a.to_state()) == serialize_state(b.to_state())
+    assert DECK == template  # repartir (y voltear) no altera la plantilla
@@ -1,6 +1,6 @@
 import pytest
 
-from solitaire.tads.cola import ColaTAD
+from solitaire.tads.cola import ColaAcotadaTAD, ColaTAD
 from solitaire.tads.lista import ListaTAD
 from solitaire.tads.deque_historial import HistorialMovimientos
 
@@ -16,6 +16,18 @@ def test_cola_tad_fifo():
         q.desencolar()
 
 
+def test_cola_acotada_descarta_sin_bloquear_y_entrega_lotes():
+    q = ColaAcotadaTAD(3)
+    assert all(q.intentar_encolar(i) for i in range(3))
+    assert not q.intentar_encolar(99)
+    assert len(q) == 3
+    assert q.desencolar_lote(2, 0) == [0, 1]
+    assert q.desencolar_lote(10, 0) == [2]
+    assert q.desencolar_lote(10, 0.01) == []
+    with pytest.raises(ValueError):
+        ColaAcotadaTAD(0)
+
+
 def test_lista_tad_ops():
     lst = ListaTAD([1, 2, 3])
     lst.insertar(1, 99)